@@ -0,0 +1,44 @@
+"""
+Measure with :mod:`tracemalloc` the memory taken by many boxscores decoded with :func:`nhlapi.props.json_decode` and
+wrapped, against the compact modes of :func:`nhlapi.props.compact_decode`.
+
+Run from the project root: ``PYTHONPATH=. python benchmarks/bench_compact.py``
+"""
+import json
+import time
+import tracemalloc
+
+from nhlapi.props import compact_decode, json_decode, wrap
+
+import corpus
+
+
+def measure(bodies, decode):
+    tracemalloc.start()
+    start = time.perf_counter()
+    docs = [wrap(decode(body)) for body in bodies]
+    elapsed = time.perf_counter() - start
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del docs
+    return memory, elapsed
+
+
+def main():
+    bodies = [json.dumps(corpus.boxscore(seed)).encode("utf-8") for seed in range(500)]
+    runs = [
+        ("plain", json_decode),
+        ("interned", compact_decode),
+        ("tables", lambda body: compact_decode(body, tables=True)),
+    ]
+    baseline = None
+    print("{} boxscores".format(len(bodies)))
+    for name, decode in runs:
+        memory, elapsed = measure(bodies, decode)
+        baseline = baseline or memory
+        ratio = baseline / memory
+        print("{:9} {:8.1f} MiB  {:5.2f}x  {:8.1f} ms".format(name, memory / 2 ** 20, ratio, elapsed * 1000))
+
+
+if __name__ == "__main__":
+    main()
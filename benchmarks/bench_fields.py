@@ -0,0 +1,49 @@
+"""
+Measure what the `fields` parameter saves on a month of schedule when only the game ids are needed: the size of the
+payload and the time to decode it when the server applies the projection, and the memory kept when the projection is
+applied on the client with :func:`nhlapi.props.prune`.
+
+The server side projection is simulated by pruning the payload before serializing it, so network latency is not part
+of the numbers, only the transfer size is.
+
+Run from the project root: ``PYTHONPATH=. python benchmarks/bench_fields.py``
+"""
+import json
+import timeit
+import tracemalloc
+
+from nhlapi.props import json_decode, prune
+
+import corpus
+
+FIELDS = ["dates", "games", "gamePk"]
+
+
+def retained(func):
+    tracemalloc.start()
+    result = func()  # noqa
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return memory
+
+
+def main():
+    payload = corpus.schedule(days=30)
+    full = json.dumps(payload).encode("utf-8")
+    projected = json.dumps(prune(payload, FIELDS)).encode("utf-8")
+
+    full_time = min(timeit.repeat(lambda: json_decode(full), number=10, repeat=5)) / 10
+    projected_time = min(timeit.repeat(lambda: json_decode(projected), number=10, repeat=5)) / 10
+    prune_time = min(timeit.repeat(lambda: prune(json_decode(full), FIELDS), number=10, repeat=5)) / 10
+
+    ratio = len(full) / len(projected)
+    full_memory = retained(lambda: json_decode(full))
+    pruned_memory = retained(lambda: prune(json_decode(full), FIELDS))
+    print("payload   full {:10,} B  projected {:10,} B  ({:.1f}x smaller)".format(len(full), len(projected), ratio))
+    print("decode    full {:10.2f} ms projected {:10.2f} ms".format(full_time * 1000, projected_time * 1000))
+    print("client prune   {:10.2f} ms".format(prune_time * 1000))
+    print("retained  full {:10,} B  pruned    {:10,} B".format(full_memory, pruned_memory))
+
+
+if __name__ == "__main__":
+    main()
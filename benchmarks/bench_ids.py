@@ -0,0 +1,45 @@
+"""
+Compare parsing many game id strings one at a time with :meth:`nhlapi.utils.GameId.fromstr` against
+:func:`nhlapi.utils.parse_game_ids`, and using game ids as dictionary keys against their strings.
+
+Run from the project root: ``PYTHONPATH=. python benchmarks/bench_ids.py``
+"""
+import timeit
+
+from nhlapi.utils import GameId, GameKind, Season, parse_game_ids
+
+
+def main():
+    ids = [game_id for year in range(2000, 2020) for game_id in Season(year).game_ids(GameKind.REGULAR, 1271)]
+    strings = [game_id.to_url_param() for game_id in ids]
+    print("{} game ids".format(len(strings)))
+
+    runs = [
+        ("fromstr", lambda: [GameId.fromstr(s) for s in strings]),
+        ("batch", lambda: parse_game_ids(strings)),
+        ("batch+fromint", lambda: list(map(GameId.fromint, parse_game_ids(strings)))),
+    ]
+    try:
+        import numpy  # noqa
+
+        runs.append(("numpy", lambda: parse_game_ids(strings, numpy=True)))
+    except ImportError:
+        pass
+    baseline = None
+    for name, func in runs:
+        seconds = min(timeit.repeat(func, number=1, repeat=5))
+        baseline = baseline or seconds
+        print("{:14} {:8.2f} ms  {:6.2f}x".format(name, seconds * 1000, baseline / seconds))
+
+    by_id = dict.fromkeys(ids, 0)
+    by_str = dict.fromkeys(strings, 0)
+    for name, func in [
+        ("str keys", lambda: [by_str[game_id.to_url_param()] for game_id in ids]),
+        ("id keys", lambda: [by_id[game_id] for game_id in ids]),
+    ]:
+        seconds = min(timeit.repeat(func, number=1, repeat=5))
+        print("{:14} {:8.2f} ms".format(name, seconds * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Measure what the metrics of the clients cost per request: timing the phases of a request, building its
+:class:`nhlapi.metrics.RequestMetrics` and recording it in a :class:`nhlapi.metrics.MetricsRecorder`.
+
+Run from the project root: ``PYTHONPATH=. python benchmarks/bench_metrics.py``
+"""
+import timeit
+
+from nhlapi.clients import _Timing
+from nhlapi.metrics import MetricsRecorder, endpoint_template
+
+URLS = ["https://statsapi.web.nhl.com/api/v1/game/{}/boxscore".format(2018020001 + i) for i in range(1000)]
+BODY = b'{"teams": {"away": {"team": {"id": 8}}, "home": {"team": {"id": 10}}}}'
+
+
+def main():
+    recorder = MetricsRecorder()
+
+    def request(url, sink):
+        timing = _Timing()
+        timing.mark_sent()
+        timing.mark_headers()
+        timing.mark_body()
+        timing.report(sink, url, 200, BODY)
+
+    runs = [
+        ("timing only", lambda: [request(url, None) for url in URLS]),
+        ("template", lambda: [endpoint_template(url) for url in URLS]),
+        ("recorded", lambda: [request(url, recorder) for url in URLS]),
+    ]
+    for name, func in runs:
+        seconds = min(timeit.repeat(func, number=1, repeat=5))
+        print("{:12} {:8.2f} us/request".format(name, seconds * 1e6 / len(URLS)))
+
+    seconds = min(timeit.repeat(recorder.exposition, number=1, repeat=5))
+    print("{:12} {:8.2f} ms".format("exposition", seconds * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Compare the memory taken by many boxscores kept as wrapped documents against the same boxscores built into
+:class:`nhlapi.models.Boxscore`, and the time to sum the time on ice of every skater.
+
+Run from the project root: ``PYTHONPATH=. python benchmarks/bench_models.py``
+"""
+import gc
+import json
+import time
+import tracemalloc
+
+from nhlapi.models import Boxscore
+from nhlapi.props import get, json_decode, values, wrap
+from nhlapi.utils import TimeOnIce
+
+import corpus
+
+
+def build(bodies, decode):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    docs = [decode(body) for body in bodies]
+    elapsed = time.perf_counter() - start
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return docs, memory, elapsed
+
+
+def toi_wrapped(docs):
+    total = 0
+    for doc in docs:
+        for side in (doc.teams.home, doc.teams.away):
+            for player in values(side.players):
+                stats = get(player.stats, "skaterStats")
+                if stats is not None:
+                    total += TimeOnIce.fromstr(stats.timeOnIce).seconds
+    return total
+
+
+def toi_models(docs):
+    total = 0
+    for doc in docs:
+        for side in (doc.home, doc.away):
+            for player in side.players:
+                if player.skater_stats is not None:
+                    total += player.skater_stats.time_on_ice.seconds
+    return total
+
+
+def main():
+    bodies = [json.dumps(corpus.boxscore(seed)).encode("utf-8") for seed in range(500)]
+    print("{} boxscores".format(len(bodies)))
+    runs = [
+        ("wrapped", lambda body: wrap(json_decode(body)), toi_wrapped),
+        ("models", lambda body: Boxscore.from_json(json_decode(body)), toi_models),
+    ]
+    for name, decode, toi in runs:
+        docs, memory, elapsed = build(bodies, decode)
+        start = time.perf_counter()
+        toi(docs)
+        access = time.perf_counter() - start
+        print(
+            "{:8} {:8.1f} MiB  build {:8.1f} ms  sum toi {:8.1f} ms".format(
+                name, memory / 2 ** 20, elapsed * 1000, access * 1000
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Compare collecting the shots of many games by walking the wrapped live feeds against normalizing them into a
+:class:`nhlapi.plays.PlayTable`.
+
+Run from the project root: ``PYTHONPATH=. python benchmarks/bench_plays.py``
+"""
+import timeit
+
+from nhlapi.plays import PlayTable
+from nhlapi.props import wrap
+from nhlapi.utils import TimeOnIce
+
+import corpus
+
+
+def walk(feeds):
+    shots = []
+    for feed in feeds:
+        feed = wrap(feed)
+        for play in feed.liveData.plays.allPlays:
+            if play.result.eventTypeId in ("SHOT", "GOAL"):
+                seconds = TimeOnIce.fromstr(play.about.periodTime).seconds
+                shots.append((feed.gamePk, play.about.period, seconds, play.coordinates.x, play.coordinates.y))
+    return shots
+
+
+def table(feeds):
+    table = PlayTable()
+    table.extend(feeds)
+    return table
+
+
+def main():
+    feeds = [corpus.live_feed(seed) for seed in range(200)]
+    print("{} games, {} plays".format(len(feeds), sum(len(feed["liveData"]["plays"]["allPlays"]) for feed in feeds)))
+    runs = [("walk", lambda: walk(feeds)), ("table", lambda: table(feeds))]
+    try:
+        import numpy  # noqa
+
+        runs.append(("table+numpy", lambda: table(feeds).to_numpy()))
+    except ImportError:
+        pass
+    baseline = None
+    for name, func in runs:
+        seconds = min(timeit.repeat(func, number=1, repeat=5))
+        baseline = baseline or seconds
+        print("{:12} {:8.2f} ms  {:6.2f}x".format(name, seconds * 1000, baseline / seconds))
+
+    # Once normalized, filtering is a pass over small integer columns.
+    full = table(feeds)
+    labels = full.labels("event")
+    wanted = {labels.index("SHOT"), labels.index("GOAL")}
+    seconds = min(timeit.repeat(lambda: [i for i, code in enumerate(full["event"]) if code in wanted], number=1))
+    print("{:12} {:8.2f} ms".format("filter", seconds * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Compare the plain and cached wrappers of :mod:`nhlapi.props` when the same boxscores are traversed repeatedly, and
+compiled paths against wrapper traversal when extracting one field from many records.
+
+Run from the project root: ``PYTHONPATH=. python benchmarks/bench_props.py``
+"""
+import timeit
+import tracemalloc
+
+from nhlapi.props import compile_path, values, wrap
+
+import corpus
+
+
+def traverse(box):
+    total = 0
+    for _ in range(10):
+        for side in ("home", "away"):
+            for player in values(box.teams[side].players):
+                if player.position.code != "G":
+                    total += player.stats.skaterStats.goals
+    return total
+
+
+def measure(payloads, cached):
+    boxes = [wrap(payload, cached=cached) for payload in payloads]
+    seconds = min(timeit.repeat(lambda: [traverse(box) for box in boxes], number=1, repeat=5))
+    tracemalloc.start()
+    boxes = [wrap(payload, cached=cached) for payload in payloads]
+    for box in boxes:
+        traverse(box)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, memory
+
+
+def goals_wrapped(box):
+    return [
+        player.stats.skaterStats.goals
+        for side in ("home", "away")
+        for player in values(box.teams[side].players)
+        if "skaterStats" in player.stats
+    ]
+
+
+def measure_paths(payloads):
+    boxes = [wrap(payload) for payload in payloads]
+    path = compile_path("teams.*.players.*.stats.skaterStats.goals", default=None)
+    wrapped = min(timeit.repeat(lambda: [goals_wrapped(box) for box in boxes], number=1, repeat=5))
+    compiled = min(timeit.repeat(lambda: [path(box) for box in boxes], number=1, repeat=5))
+    return wrapped, compiled
+
+
+def main():
+    payloads = [corpus.boxscore(seed) for seed in range(100)]
+    plain_time, plain_mem = measure(payloads, cached=False)
+    cached_time, cached_mem = measure(payloads, cached=True)
+    print("plain   {:8.2f} ms  {:8.1f} KiB retained".format(plain_time * 1000, plain_mem / 1024))
+    print("cached  {:8.2f} ms  {:8.1f} KiB retained".format(cached_time * 1000, cached_mem / 1024))
+    print("speedup {:8.2f}x".format(plain_time / cached_time))
+
+    wrapped_time, compiled_time = measure_paths(payloads)
+    print("wrapped  {:8.2f} ms".format(wrapped_time * 1000))
+    print("compiled {:8.2f} ms".format(compiled_time * 1000))
+    print("speedup  {:8.2f}x".format(wrapped_time / compiled_time))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Record the boxscores of a season in a replay archive, then measure how fast :class:`nhlapi.replay.ReplayClient` serves
+them against :class:`nhlapi.store.DiskStore` holding the same responses.
+
+Run from the project root: ``PYTHONPATH=. python benchmarks/bench_replay.py``
+"""
+import json
+import os
+import tempfile
+import timeit
+
+from nhlapi.clients import RawResponse
+from nhlapi.endpoints import NHLAPI
+from nhlapi.props import wrap
+from nhlapi.replay import RecordingClient, ReplayClient
+from nhlapi.store import DiskStore
+from nhlapi.utils import GameKind, Season
+
+import corpus
+
+GAMES = 1271
+
+
+class CorpusClient:
+    def __init__(self):
+        self._bodies = [json.dumps(corpus.boxscore(seed)).encode("utf-8") for seed in range(20)]
+        self._next = 0
+
+    def get_raw(self, url, params=None):
+        body = self._bodies[self._next % len(self._bodies)]
+        self._next += 1
+        return RawResponse(body, wrap(json.loads(body.decode("utf-8"))))
+
+    def get(self, url, params=None):
+        return self.get_raw(url, params).data
+
+
+def main():
+    game_ids = Season(2017).game_ids(GameKind.REGULAR, GAMES)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "season.nhlrec")
+        recorder = RecordingClient(CorpusClient(), path)
+        api = NHLAPI(recorder)
+        for game_id in game_ids:
+            api.boxscore(game_id)
+        recorder.close()
+        print("{} boxscores, {:,} B archive".format(GAMES, os.path.getsize(path)))
+
+        replay = ReplayClient(path)
+        lazy = ReplayClient(path, lazy=True)
+        store = DiskStore(os.path.join(tmp, "store.sqlite3"), ttl=None)
+        keys = replay.keys()
+        for key in keys:
+            body, value = replay.get_raw(key)
+            store.store(key, value, body)
+
+        baseline = None
+        for name, func in [
+            ("DiskStore", lambda: [store.lookup(key) for key in keys]),
+            ("replay", lambda: [replay.get(key) for key in keys]),
+            ("replay lazy", lambda: [lazy.get(key) for key in keys]),
+        ]:
+            seconds = min(timeit.repeat(func, number=1, repeat=5))
+            baseline = baseline or seconds
+            print("{:12} {:8.2f} us/request  {:6.2f}x".format(name, seconds / GAMES * 1e6, baseline / seconds))
+        replay.close()
+        lazy.close()
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Compare parsing and summing time on ice one string at a time with :class:`nhlapi.utils.TimeOnIce` against the batch
+functions of :mod:`nhlapi.utils`.
+
+Run from the project root: ``PYTHONPATH=. python benchmarks/bench_toi.py``
+"""
+import timeit
+
+from nhlapi.props import compile_path
+from nhlapi.utils import TimeOnIce, parse_toi, toi_by_key, toi_total
+
+import corpus
+
+
+def scalar(ids, times):
+    total = TimeOnIce(0)
+    by_player = {}
+    for player_id, s in zip(ids, times):
+        toi = TimeOnIce.fromstr(s)
+        total = total + toi
+        by_player[player_id] = by_player.get(player_id, TimeOnIce(0)) + toi
+    return total, by_player
+
+
+def batch(ids, times, numpy=False):
+    seconds = parse_toi(times, numpy=numpy)
+    if numpy:
+        import numpy as np
+
+        ids = np.asarray(ids)
+    return toi_total(seconds), toi_by_key(ids, seconds)
+
+
+def main():
+    players = compile_path("teams.*.players.*")
+    records = [player for seed in range(1300) for player in players(corpus.boxscore(seed))]
+    records = [record for record in records if "skaterStats" in record["stats"]]
+    ids = [record["person"]["id"] for record in records]
+    times = [record["stats"]["skaterStats"]["timeOnIce"] for record in records]
+    print("{} time on ice strings".format(len(times)))
+
+    runs = [("scalar", lambda: scalar(ids, times)), ("batch", lambda: batch(ids, times))]
+    try:
+        import numpy  # noqa
+
+        runs.append(("numpy", lambda: batch(ids, times, numpy=True)))
+    except ImportError:
+        pass
+    baseline = None
+    for name, func in runs:
+        seconds = min(timeit.repeat(func, number=1, repeat=5))
+        baseline = baseline or seconds
+        print("{:8} {:8.2f} ms  {:6.2f}x".format(name, seconds * 1000, baseline / seconds))
+
+
+if __name__ == "__main__":
+    main()
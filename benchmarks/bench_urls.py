@@ -0,0 +1,44 @@
+"""
+Micro-benchmarks of building request URLs: :func:`nhlapi.utils.to_url_param` for each kind of parameter,
+:meth:`nhlapi.endpoints.NHLAPI.get` and a few endpoints, with a client that does nothing.
+
+Run from the project root: ``PYTHONPATH=. python benchmarks/bench_urls.py``
+"""
+import timeit
+from datetime import date
+
+from nhlapi.endpoints import NHLAPI
+from nhlapi.utils import GameId, GameKind, Season, to_url_param
+
+
+class NullClient:
+    def get(self, url, params=None):
+        return url
+
+
+def main():
+    api = NHLAPI(NullClient())
+    game_id = GameId(Season(2017), 1000)
+    cases = [
+        ("to_url_param str", lambda: to_url_param("team.roster")),
+        ("to_url_param int", lambda: to_url_param(8)),
+        ("to_url_param date", lambda: to_url_param(date(2018, 10, 3))),
+        ("to_url_param list", lambda: to_url_param(["team.roster", "team.stats"])),
+        ("to_url_param Season", lambda: to_url_param(Season(2017))),
+        ("to_url_param GameId", lambda: to_url_param(game_id)),
+        ("to_url_param GameKind", lambda: to_url_param(GameKind.REGULAR)),
+        ("get path args", lambda: api.get("/api/v1/game/{0}/boxscore", game_id)),
+        ("get query params", lambda: api.get("/api/v1/teams", teamId=[1, 2], expand="team.roster")),
+        ("teams", lambda: api.teams(8, expand=["team.roster", "team.stats"])),
+        ("boxscore", lambda: api.boxscore(game_id)),
+        ("schedule", lambda: api.schedule(start_date=date(2018, 10, 3), end_date=date(2018, 10, 10))),
+        ("standings", lambda: api.standings(season=Season(2017))),
+    ]
+    number = 20000
+    for name, func in cases:
+        seconds = min(timeit.repeat(func, number=number, repeat=5))
+        print("{:24} {:8.3f} us/call".format(name, seconds / number * 1e6))
+
+
+if __name__ == "__main__":
+    main()
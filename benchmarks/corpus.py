@@ -0,0 +1,299 @@
+"""
+Payloads shaped like the responses of the NHL API, generated deterministically so that the benchmarks run offline.
+They are synthetic: the keys and the nesting follow the API, the values do not come from recorded responses.
+"""
+import random
+from datetime import date, timedelta
+
+POSITIONS = [("C", "Center", "Forward"), ("L", "Left Wing", "Forward"), ("R", "Right Wing", "Forward")]
+DEFENSE = ("D", "Defenseman", "Defenseman")
+GOALIE = ("G", "Goalie", "Goalie")
+TEAM_NAMES = [
+    "New Jersey Devils",
+    "New York Islanders",
+    "New York Rangers",
+    "Philadelphia Flyers",
+    "Pittsburgh Penguins",
+    "Boston Bruins",
+    "Buffalo Sabres",
+    "Montréal Canadiens",
+    "Ottawa Senators",
+    "Toronto Maple Leafs",
+    "Carolina Hurricanes",
+    "Florida Panthers",
+    "Tampa Bay Lightning",
+    "Washington Capitals",
+    "Chicago Blackhawks",
+    "Detroit Red Wings",
+    "Nashville Predators",
+    "St. Louis Blues",
+    "Calgary Flames",
+    "Colorado Avalanche",
+    "Edmonton Oilers",
+    "Vancouver Canucks",
+    "Anaheim Ducks",
+    "Dallas Stars",
+    "Los Angeles Kings",
+    "San Jose Sharks",
+    "Columbus Blue Jackets",
+    "Minnesota Wild",
+    "Winnipeg Jets",
+    "Arizona Coyotes",
+    "Vegas Golden Knights",
+]
+
+
+def _toi(rng, low, high):
+    secs = rng.randint(low, high)
+    return "{}:{:02}".format(secs // 60, secs % 60)
+
+
+def _team(team_id):
+    name = TEAM_NAMES[(team_id - 1) % len(TEAM_NAMES)]
+    return {
+        "id": team_id,
+        "name": name,
+        "link": "/api/v1/teams/{}".format(team_id),
+        "abbreviation": name[:3].upper(),
+        "triCode": name[:3].upper(),
+    }
+
+
+def _player(rng, team_id, index):
+    player_id = 8470000 + team_id * 100 + index
+    position = GOALIE if index == 0 else DEFENSE if index < 7 else POSITIONS[index % 3]
+    person = {"id": player_id, "fullName": "Player {}".format(player_id), "link": "/api/v1/people/{}".format(player_id)}
+    if position is GOALIE:
+        stats = {
+            "goalieStats": {
+                "timeOnIce": _toi(rng, 3000, 3900),
+                "assists": 0,
+                "goals": 0,
+                "pim": 0,
+                "shots": rng.randint(20, 45),
+                "saves": rng.randint(18, 42),
+                "powerPlaySaves": rng.randint(0, 8),
+                "decision": rng.choice(["W", "L"]),
+            }
+        }
+    else:
+        stats = {
+            "skaterStats": {
+                "timeOnIce": _toi(rng, 300, 1700),
+                "assists": rng.randint(0, 2),
+                "goals": rng.randint(0, 1),
+                "shots": rng.randint(0, 6),
+                "hits": rng.randint(0, 5),
+                "powerPlayGoals": 0,
+                "penaltyMinutes": rng.choice([0, 0, 0, 2]),
+                "faceOffWins": rng.randint(0, 10),
+                "faceoffTaken": rng.randint(0, 20),
+                "takeaways": rng.randint(0, 3),
+                "giveaways": rng.randint(0, 3),
+                "blocked": rng.randint(0, 4),
+                "plusMinus": rng.randint(-2, 2),
+                "evenTimeOnIce": _toi(rng, 300, 1400),
+                "powerPlayTimeOnIce": _toi(rng, 0, 240),
+                "shortHandedTimeOnIce": _toi(rng, 0, 180),
+            }
+        }
+    return (
+        "ID{}".format(player_id),
+        {
+            "person": person,
+            "jerseyNumber": str(rng.randint(1, 98)),
+            "position": {"code": position[0], "name": position[1], "type": position[2], "abbreviation": position[0]},
+            "stats": stats,
+        },
+    )
+
+
+def boxscore(seed=0, players=20):
+    """
+    A boxscore with `players` players on each team.
+    """
+    rng = random.Random(seed)
+    home_id, away_id = rng.sample(range(1, 32), 2)
+    teams = {}
+    for side, team_id in (("home", home_id), ("away", away_id)):
+        roster = dict(_player(rng, team_id, index) for index in range(players))
+        teams[side] = {
+            "team": _team(team_id),
+            "teamStats": {"teamSkaterStats": {"goals": rng.randint(0, 6), "pim": rng.randint(0, 20), "shots": 30}},
+            "players": roster,
+            "goalies": [player["person"]["id"] for player in roster.values() if player["position"]["code"] == "G"],
+            "skaters": [player["person"]["id"] for player in roster.values() if player["position"]["code"] != "G"],
+            "onIce": [],
+            "onIcePlus": [],
+            "scratches": [],
+            "penaltyBox": [],
+            "coaches": [{"person": {"fullName": "Coach {}".format(team_id)}, "position": {"code": "HC"}}],
+        }
+    return {"copyright": "NHL and the NHL Shield are registered trademarks.", "teams": teams, "officials": []}
+
+
+def schedule(days=30, games_per_day=8, start=date(2018, 10, 3)):
+    """
+    A schedule spanning `days` days of the 2018-2019 season.
+    """
+    rng = random.Random(days)
+    dates = []
+    number = 1
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        games = []
+        for _ in range(games_per_day):
+            home_id, away_id = rng.sample(range(1, 32), 2)
+            game_pk = 2018020000 + number
+            number += 1
+            games.append(
+                {
+                    "gamePk": game_pk,
+                    "link": "/api/v1/game/{}/feed/live".format(game_pk),
+                    "gameType": "R",
+                    "season": "20182019",
+                    "gameDate": "{}T23:00:00Z".format(day.isoformat()),
+                    "status": {
+                        "abstractGameState": "Final",
+                        "codedGameState": "7",
+                        "detailedState": "Final",
+                        "statusCode": "7",
+                        "startTimeTBD": False,
+                    },
+                    "teams": {
+                        side: {
+                            "leagueRecord": {"wins": rng.randint(0, 40), "losses": rng.randint(0, 40)},
+                            "score": rng.randint(0, 6),
+                            "team": _team(team_id),
+                        }
+                        for side, team_id in (("away", away_id), ("home", home_id))
+                    },
+                    "venue": {"name": "Arena {}".format(home_id), "link": "/api/v1/venues/null"},
+                    "content": {"link": "/api/v1/game/{}/content".format(game_pk)},
+                }
+            )
+        dates.append({"date": day.isoformat(), "totalItems": len(games), "totalGames": len(games), "games": games})
+    return {"copyright": "NHL", "totalItems": days * games_per_day, "totalGames": days * games_per_day, "dates": dates}
+
+
+def standings():
+    """
+    League standings with every team.
+    """
+    rng = random.Random(1)
+    records = []
+    for team_id in range(1, len(TEAM_NAMES) + 1):
+        wins, losses, ot = rng.randint(20, 55), rng.randint(15, 45), rng.randint(2, 15)
+        records.append(
+            {
+                "team": _team(team_id),
+                "leagueRecord": {"wins": wins, "losses": losses, "ot": ot, "type": "league"},
+                "goalsAgainst": rng.randint(180, 300),
+                "goalsScored": rng.randint(180, 300),
+                "points": wins * 2 + ot,
+                "divisionRank": str(rng.randint(1, 8)),
+                "leagueRank": str(team_id),
+                "row": wins - rng.randint(0, 5),
+                "gamesPlayed": wins + losses + ot,
+                "streak": {"streakType": "wins", "streakNumber": rng.randint(1, 5), "streakCode": "W1"},
+                "lastUpdated": "2019-04-07T04:02:13Z",
+            }
+        )
+    record = {"standingsType": "regularSeason", "league": {"id": 133}, "teamRecords": records}
+    return {"copyright": "NHL", "records": [record]}
+
+
+def teams(roster=True):
+    """
+    Every team, expanded with its roster when `roster` is `True`.
+    """
+    rng = random.Random(2)
+    result = []
+    for team_id in range(1, len(TEAM_NAMES) + 1):
+        team = dict(_team(team_id))
+        team.update(
+            {
+                "venue": {"name": "Arena {}".format(team_id), "link": "/api/v1/venues/null", "city": "City"},
+                "teamName": TEAM_NAMES[team_id - 1].split()[-1],
+                "locationName": " ".join(TEAM_NAMES[team_id - 1].split()[:-1]),
+                "firstYearOfPlay": str(1900 + team_id * 3),
+                "division": {"id": 15 + team_id % 4, "name": "Division", "link": "/api/v1/divisions/15"},
+                "conference": {"id": 5 + team_id % 2, "name": "Conference", "link": "/api/v1/conferences/5"},
+                "franchise": {"franchiseId": team_id, "teamName": "Franchise", "link": "/api/v1/franchises/1"},
+                "shortName": TEAM_NAMES[team_id - 1][:10],
+                "officialSiteUrl": "http://www.nhl.com/",
+                "franchiseId": team_id,
+                "active": True,
+            }
+        )
+        if roster:
+            team["roster"] = {
+                "roster": [
+                    {"person": player["person"], "jerseyNumber": player["jerseyNumber"], "position": player["position"]}
+                    for _, player in (_player(rng, team_id, index) for index in range(23))
+                ],
+                "link": "/api/v1/teams/{}/roster".format(team_id),
+            }
+        result.append(team)
+    return {"copyright": "NHL", "teams": result}
+
+
+EVENTS = [
+    ("SHOT", "Wrist Shot", ["Shooter", "Goalie"]),
+    ("MISSED_SHOT", "Snap Shot", ["Shooter"]),
+    ("BLOCKED_SHOT", None, ["Blocker", "Shooter"]),
+    ("HIT", None, ["Hitter", "Hittee"]),
+    ("FACEOFF", None, ["Winner", "Loser"]),
+    ("GIVEAWAY", None, ["PlayerID"]),
+    ("GOAL", "Slap Shot", ["Scorer", "Assist", "Assist", "Goalie"]),
+]
+
+
+def live_feed(seed=0, plays=320):
+    """
+    A live feed of a final game with `plays` plays.
+    """
+    rng = random.Random(seed)
+    home_id, away_id = rng.sample(range(1, 32), 2)
+    all_plays = []
+    goals = {"away": 0, "home": 0}
+    for index in range(plays):
+        period = 1 + index * 3 // plays
+        elapsed = (index * 3 * 1200 // plays) % 1200
+        event, secondary, roles = rng.choice(EVENTS)
+        side, team_id = rng.choice([("away", away_id), ("home", home_id)])
+        result = {"event": event.title(), "eventTypeId": event, "description": "Play {}".format(index)}
+        if secondary:
+            result["secondaryType"] = secondary
+        if event == "GOAL":
+            goals[side] += 1
+            result["strength"] = {"code": "EVEN", "name": "Even"}
+        all_plays.append(
+            {
+                "players": [
+                    {"player": {"id": 8470000 + team_id * 100 + rng.randint(0, 22)}, "playerType": role}
+                    for role in roles
+                ],
+                "result": result,
+                "about": {
+                    "eventIdx": index,
+                    "eventId": index * 3,
+                    "period": period,
+                    "periodType": "REGULAR",
+                    "ordinalNum": "{}st".format(period),
+                    "periodTime": "{:02}:{:02}".format(elapsed // 60, elapsed % 60),
+                    "periodTimeRemaining": "{:02}:{:02}".format((1200 - elapsed) // 60, (1200 - elapsed) % 60),
+                    "dateTime": "2018-10-04T00:00:00Z",
+                    "goals": dict(goals),
+                },
+                "coordinates": {"x": float(rng.randint(-99, 99)), "y": float(rng.randint(-42, 42))},
+                "team": _team(team_id),
+            }
+        )
+    return {
+        "copyright": "NHL",
+        "gamePk": 2018020001 + seed,
+        "metaData": {"wait": 10, "timeStamp": "20181004_020000"},
+        "gameData": {"status": {"abstractGameState": "Final"}},
+        "liveData": {"plays": {"allPlays": all_plays}},
+    }
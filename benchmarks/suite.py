@@ -0,0 +1,286 @@
+"""
+Benchmark suite covering decoding, wrapping and traversing the responses, :func:`nhlapi.props.json_dump`, building
+URLs in :meth:`nhlapi.endpoints.NHLAPI.get` and the throughput of the clients against a local server. Everything runs
+offline on the payloads of :mod:`corpus`.
+
+The payloads are synthetic, not recorded responses of the API: they have the keys and the nesting of the real ones,
+but their values are generated and the optional fields come and go by simple rules. The times measure the library on
+documents of that shape and are meant to be compared between runs, not taken as the times of real responses.
+
+Each case reports the best time per operation out of a few repeats. The results can be saved as JSON and compared with
+the results of another run, to tell whether a change made things slower::
+
+    PYTHONPATH=. python benchmarks/suite.py --output before.json
+    # change things
+    PYTHONPATH=. python benchmarks/suite.py --compare before.json --output after.json
+
+With `--compare`, the exit status is 1 if a case got slower than `--threshold` times its previous time. Use `--filter`
+to run only the cases whose name contains a string, and `--quick` for fewer repeats.
+
+Run from the project root: ``PYTHONPATH=. python benchmarks/suite.py``
+"""
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+import sys
+import threading
+import time
+import timeit
+from datetime import date
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+from nhlapi.endpoints import NHLAPI
+from nhlapi.props import json_decode, json_dump, keys, wrap
+from nhlapi.utils import GameId, Season
+
+import corpus
+
+FORMAT = 1
+
+
+def payloads():
+    return {
+        "boxscore": corpus.boxscore(),
+        "schedule": corpus.schedule(),
+        "standings": corpus.standings(),
+        "teams": corpus.teams(roster=True),
+    }
+
+
+def walk(obj):
+    # Touch every value of a wrapped document, by attribute where the key allows it like users of the library do.
+    count = 0
+    if hasattr(obj, "_nhlapi_inner_"):
+        if isinstance(obj._nhlapi_inner_, dict):
+            for key in keys(obj):
+                count += walk(getattr(obj, key) if key.isidentifier() else obj[key])
+        else:
+            for item in obj:
+                count += walk(item)
+        return count
+    return 1
+
+
+class NullClient:
+    def get(self, url, params=None):
+        return url
+
+
+def props_cases(docs):
+    cases = []
+    for name, payload in docs.items():
+        body = json.dumps(payload).encode("utf-8")
+        decoded = json_decode(body)
+        wrapped = wrap(decoded)
+        cases += [
+            ("decode.{}".format(name), lambda body=body: json_decode(body)),
+            ("wrap_walk.{}".format(name), lambda decoded=decoded: walk(wrap(decoded))),
+            ("wrap_walk_cached.{}".format(name), lambda decoded=decoded: walk(wrap(decoded, cached=True))),
+            ("json_dump.{}".format(name), lambda wrapped=wrapped: json_dump(wrapped)),
+        ]
+    return cases
+
+
+def url_cases():
+    api = NHLAPI(NullClient())
+    game_id = GameId(Season(2017), 1000)
+    return [
+        ("url.get_path_args", lambda: api.get("/api/v1/game/{0}/boxscore", game_id)),
+        ("url.get_query_params", lambda: api.get("/api/v1/teams", teamId=[1, 2], expand="team.roster")),
+        ("url.teams", lambda: api.teams(8, expand=["team.roster", "team.stats"])),
+        ("url.boxscore", lambda: api.boxscore(game_id)),
+        ("url.schedule", lambda: api.schedule(start_date=date(2018, 10, 3), end_date=date(2018, 10, 10))),
+        ("url.standings", lambda: api.standings(season=Season(2017))),
+    ]
+
+
+class Handler(BaseHTTPRequestHandler):
+    # Keep the connections open like the API does, the clients reuse them. Without Nagle's algorithm the headers and
+    # the body are not held back waiting for a delayed ACK.
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        body = self.server.bodies.get(self.path.split("?")[0].rsplit("/", 1)[-1])
+        if body is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+def start_server(docs):
+    httpd = Server(("127.0.0.1", 0), Handler)
+    httpd.bodies = {name: json.dumps(payload).encode("utf-8") for name, payload in docs.items()}
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd
+
+
+def client_cases(httpd, requests_per_run):
+    """
+    :returns: the cases and a function closing the clients
+    """
+    base = "http://127.0.0.1:{}/".format(httpd.server_port)
+    urls = [base + name for name in sorted(httpd.bodies)] * (requests_per_run // len(httpd.bodies))
+    cases = []
+    closers = []
+    try:
+        from nhlapi.clients import SyncClient
+
+        sync = SyncClient()
+        cases.append(("client.sync", lambda: [sync.get(url) for url in urls]))
+    except ImportError:
+        print("requests is not installed, skipping client.sync", file=sys.stderr)
+    try:
+        from nhlapi.clients import AsyncClient, fetch_many
+
+        loop = asyncio.new_event_loop()
+        calls = [(url, None) for url in urls]
+
+        def fetch(client):
+            return loop.run_until_complete(fetch_many(client, calls, concurrency=16))
+
+        for name, lazy in [("client.async", False), ("client.async_lazy", True)]:
+            client = AsyncClient(loop=loop, coalesce=False, lazy=lazy)
+            cases.append((name, lambda client=client: fetch(client)))
+            closers.append(client.close)
+
+        def close():
+            for closer in closers:
+                loop.run_until_complete(closer())
+            loop.close()
+
+    except ImportError:
+        print("aiohttp is not installed, skipping client.async", file=sys.stderr)
+
+        def close():
+            pass
+
+    return cases, len(urls), close
+
+
+def measure(func, repeat, budget=0.2):
+    # Pick the number of calls per repeat so that a repeat lasts about `budget` seconds.
+    number = 1
+    while True:
+        seconds = timeit.timeit(func, number=number)
+        if seconds >= budget / 2 or number >= 1 << 20:
+            break
+        number *= 2 if seconds * 10 > budget else 10
+    best = min([seconds] + timeit.repeat(func, number=number, repeat=repeat - 1))
+    return best / number, number
+
+
+def git_commit():
+    try:
+        output = subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.decode().strip()
+
+
+def compare(results, previous, threshold):
+    """
+    Print the change of each case against a previous run.
+
+    :returns: names of the cases slower than `threshold` times their previous time
+    """
+    slower = []
+    for name, result in results.items():
+        before = previous.get(name)
+        if before is None:
+            print("{:32} {:>12}".format(name, "new"))
+            continue
+        ratio = result["seconds"] / before["seconds"]
+        flag = ""
+        if ratio > threshold:
+            flag = "  SLOWER"
+            slower.append(name)
+        elif ratio < 1 / threshold:
+            flag = "  faster"
+        print("{:32} {:>12} -> {:>12}  {:6.2f}x{}".format(name, fmt(before), fmt(result), ratio, flag))
+    return slower
+
+
+def fmt(result):
+    seconds = result["seconds"]
+    if seconds >= 1e-3:
+        return "{:.2f} ms".format(seconds * 1e3)
+    return "{:.2f} us".format(seconds * 1e6)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the benchmark suite.")
+    parser.add_argument("--output", "-o", help="save the results to this JSON file")
+    parser.add_argument("--compare", "-c", help="compare with the results saved in this JSON file")
+    parser.add_argument("--threshold", type=float, default=1.1, help="slowdown ratio reported as a regression")
+    parser.add_argument("--filter", "-k", default="", help="only run the cases whose name contains this")
+    parser.add_argument("--quick", action="store_true", help="repeat each case fewer times")
+    args = parser.parse_args(argv)
+    repeat = 3 if args.quick else 7
+
+    docs = payloads()
+    httpd = start_server(docs)
+    cases = props_cases(docs) + url_cases()
+    clients, requests_per_run, close = client_cases(httpd, 200)
+    cases += clients
+
+    results = {}
+    try:
+        for name, func in cases:
+            if args.filter not in name:
+                continue
+            seconds, number = measure(func, repeat)
+            result = {"seconds": seconds, "number": number, "repeat": repeat}
+            if name.startswith("client."):
+                result["requests_per_second"] = requests_per_run / seconds
+            results[name] = result
+            extra = "  {:8.0f} req/s".format(result["requests_per_second"]) if "requests_per_second" in result else ""
+            print("{:32} {:>12}{}".format(name, fmt(result), extra))
+    finally:
+        close()
+        httpd.shutdown()
+        httpd.server_close()
+
+    status = 0
+    if args.compare:
+        with open(args.compare) as fp:
+            previous = json.load(fp)
+        print("\ncompared with {} ({})".format(args.compare, previous.get("commit")))
+        slower = compare(results, previous["results"], args.threshold)
+        if slower:
+            print("\n{} case(s) slower than {}x: {}".format(len(slower), args.threshold, ", ".join(slower)))
+            status = 1
+
+    if args.output:
+        report = {
+            "format": FORMAT,
+            "commit": git_commit(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "results": results,
+        }
+        with open(args.output, "w") as fp:
+            json.dump(report, fp, indent=2, sort_keys=True)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
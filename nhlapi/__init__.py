@@ -1,6 +1,11 @@
 from nhlapi.endpoints import NHLAPI  # noqa
 from nhlapi.props import wrap, get, keys, values, items, json_dump  # noqa
 from nhlapi.utils import Season, GameId, GameKind, Year, TimeOnIce  # noqa
+from nhlapi.cache import ResponseCache, CachedClient  # noqa
+from nhlapi.store import DiskStore  # noqa
+from nhlapi.replay import RecordingClient, ReplayClient  # noqa
+from nhlapi.ratelimit import AdaptiveLimit, RateLimiter, Priority  # noqa
+from nhlapi.metrics import MetricsRecorder  # noqa
 
 try:
     from nhlapi.clients import SyncClient  # noqa
@@ -0,0 +1,207 @@
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from .clients import is_async_client
+
+
+def make_key(url, params=None):
+    """
+    Build the cache key of a request. The key is the normalized URL with the query string parameters sorted, so that
+    the same request always gives the same key no matter how the parameters were ordered or where they were given.
+
+    :param str url: absolute URL of the request
+    :param dict params: query string parameters
+    :rtype: str
+    """
+    parts = urlsplit(url)
+    path = parts.path.rstrip("/") or "/"
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if params:
+        query.extend((key, str(val)) for key, val in params.items())
+    query.sort()
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))
+
+
+def endpoint_family(key):
+    """
+    Get the endpoint family of a cache key. The family is made of the path segments that are not ids, for instance
+    `/api/v1/game/2017020001/boxscore` is in the `game/boxscore` family and `/api/v1/divisions/1` is in the `divisions`
+    family.
+
+    :param str key: cache key given by :func:`make_key`
+    :rtype: str
+    """
+    path = urlsplit(key).path
+    if path.startswith("/api/v1/"):
+        path = path[len("/api/v1/") :]
+    return "/".join(seg for seg in path.split("/") if seg and not seg.isdigit())
+
+
+def family_ttl(ttls, key, default):
+    """
+    Look up the time to live of a cache key in a mapping of endpoint families, the most specific family first. So
+    `{"standings": 300}` applies to `standings/byLeague` unless `standings/byLeague` is also in the mapping.
+
+    :param dict ttls: time to live in seconds for each endpoint family
+    :param str key: cache key given by :func:`make_key`
+    :param default: time to live used when no family matches
+    :rtype: float or None
+    """
+    family = endpoint_family(key)
+    while family:
+        if family in ttls:
+            return ttls[family]
+        family = family.rpartition("/")[0]
+    return default
+
+
+class ResponseCache:
+    """
+    An in-memory cache of decoded responses. Entries expire after a time to live that can be set for each endpoint
+    family and the least recently used entries are evicted when the cache is full.
+
+    The `ttls` mapping is looked up with :func:`family_ttl`.
+
+    :param int maxsize: maximum number of entries kept in memory
+    :param ttl: default time to live in seconds, `None` means entries never expire
+    :param dict ttls: time to live in seconds for each endpoint family, see :func:`endpoint_family`
+    :param clock: function returning the current time in seconds
+    :type ttl: float or None
+    """
+
+    def __init__(self, maxsize=1024, ttl=60, ttls=None, clock=time.monotonic):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._ttls = dict(ttls or {})
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def ttl_for(self, key):
+        """
+        Get the time to live of the given cache key.
+
+        :param str key: cache key given by :func:`make_key`
+        :rtype: float or None
+        """
+        return family_ttl(self._ttls, key, self._ttl)
+
+    def lookup(self, key):
+        """
+        Get the value stored for the given key.
+
+        :param str key: cache key given by :func:`make_key`
+        :raises: :class:`KeyError` if the key is missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires is None or expires > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+        raise KeyError(key)
+
+    def store(self, key, value, body=None):
+        """
+        Store the value for the given key, evicting the least recently used entry if the cache is full.
+
+        :param str key: cache key given by :func:`make_key`
+        :param value: decoded response
+        :param bytes body: raw response, not used by this cache
+        """
+        ttl = self.ttl_for(key)
+        if ttl is not None and ttl <= 0:
+            return
+        expires = None if ttl is None else self._clock() + ttl
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key):
+        """
+        Remove the given key from the cache if it's present.
+
+        :param str key: cache key given by :func:`make_key`
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """
+        Remove every entry from the cache. The counters are kept.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+class CachedClient:
+    """
+    Wrap a client to read through a cache. It works the same way with :class:`nhlapi.clients.SyncClient` and
+    :class:`nhlapi.clients.AsyncClient`, so it can be given to :class:`nhlapi.endpoints.NHLAPI` in place of the
+    client::
+
+        cache = ResponseCache(ttls={"divisions": 6 * 3600, "standings": 300})
+        api = NHLAPI(CachedClient(SyncClient(), cache))
+
+    Any object with the `lookup` and `store` methods of :class:`ResponseCache` can be used as the cache. When the client
+    has a `get_raw` method, like :class:`nhlapi.clients.SyncClient`, the raw body of the response is given to `store`
+    so that it does not need to be serialized again.
+
+    :param client: the client to wrap
+    :param cache: the cache, a new :class:`ResponseCache` is created if it's `None`
+    """
+
+    def __init__(self, client, cache=None):
+        self._client = client
+        self.cache = cache if cache is not None else ResponseCache()
+        self._get_raw = getattr(client, "get_raw", None)
+        if is_async_client(client):
+            self.get = self._get_async
+        else:
+            self.get = self._get_sync
+
+    def _get_sync(self, url, params=None):
+        key = make_key(url, params)
+        try:
+            return self.cache.lookup(key)
+        except KeyError:
+            pass
+        if self._get_raw is not None:
+            body, value = self._get_raw(url, params)
+        else:
+            body, value = None, self._client.get(url, params)
+        self.cache.store(key, value, body)
+        return value
+
+    async def _get_async(self, url, params=None):
+        key = make_key(url, params)
+        try:
+            return self.cache.lookup(key)
+        except KeyError:
+            pass
+        if self._get_raw is not None:
+            body, value = await self._get_raw(url, params)
+        else:
+            body, value = None, await self._client.get(url, params)
+        self.cache.store(key, value, body)
+        return value
@@ -1,18 +1,357 @@
-from .props import wrap
+import asyncio
+import inspect
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .metrics import RequestMetrics, endpoint_template
+from .props import json_decode, wrap, wrap_lazy
+from .ratelimit import Priority
+
+
+def is_async_client(client):
+    """
+    Returns `True` if the given client's `get` method is a coroutine function, like :class:`AsyncClient`.
+    Client wrappers use this to know if they should await the client.
+
+    :rtype: bool
+    """
+    return inspect.iscoroutinefunction(client.get)
+
+
+def fetch_many(client, calls, *, concurrency=8, ordered=True, transform=None):
+    """
+    Fetch many URLs concurrently with the given client. At most `concurrency` requests are in flight at once, using a
+    thread pool for synchronous clients and a semaphore for asynchronous clients.
+
+    An error does not abort the batch, the exception is returned in place of the result of the failed call.
+
+    With a synchronous client, this function returns a list of results in the same order as `calls` when `ordered` is
+    `True`, or else an iterator of `(index, result)` pairs in the order they complete. With an asynchronous client, it
+    returns a coroutine that gives the list of results when `ordered` is `True`, or else an iterator of awaitables
+    that give `(index, result)` pairs in the order they complete::
+
+        for fut in fetch_many(client, calls, ordered=False):
+            index, result = await fut
+
+    :param client: the client, see :func:`is_async_client`
+    :param calls: the requests as `(url, params)` pairs
+    :param int concurrency: maximum number of requests in flight
+    :param bool ordered: return the results in order or as they complete
+    :param transform: function applied to each result that is not an error
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    calls = list(calls)
+    transform = transform or _identity
+    if is_async_client(client):
+        return _fetch_many_async(client, calls, concurrency, ordered, transform)
+    if ordered:
+        return [result for _, result in _fetch_many_sync(client, calls, concurrency, ordered, transform)]
+    return _fetch_many_sync(client, calls, concurrency, ordered, transform)
+
+
+def _identity(val):
+    return val
+
+
+def _get_capture(client, transform, index, url, params):
+    try:
+        return index, transform(client.get(url, params))
+    except Exception as exc:
+        return index, exc
+
+
+def _fetch_many_sync(client, calls, concurrency, ordered, transform):
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [
+            executor.submit(_get_capture, client, transform, index, url, params)
+            for index, (url, params) in enumerate(calls)
+        ]
+        for fut in futures if ordered else as_completed(futures):
+            yield fut.result()
+
+
+def _fetch_many_async(client, calls, concurrency, ordered, transform):
+    sem = asyncio.Semaphore(concurrency)
+
+    async def get_capture(index, url, params):
+        async with sem:
+            try:
+                return index, transform(await client.get(url, params))
+            except Exception as exc:
+                return index, exc
+
+    coros = [get_capture(index, url, params) for index, (url, params) in enumerate(calls)]
+    if not ordered:
+        return asyncio.as_completed(coros)
+
+    async def gather():
+        return [result for _, result in await asyncio.gather(*coros)]
+
+    return gather()
+
+
+def _request_key(url, params):
+    if not params:
+        return url
+    return url, tuple(sorted(params.items()))
+
+
+class ClientStats:
+    """
+    Counters kept by the clients.
+
+    :ivar int requests: number of HTTP requests sent
+    :ivar int not_modified: number of `304 Not Modified` responses
+    :ivar int bytes_saved: number of body bytes that were not downloaded thanks to `304 Not Modified` responses
+    :ivar int decodes_saved: number of JSON documents that were not decoded thanks to `304 Not Modified` responses
+    :ivar int coalesced: number of calls that shared the request of an identical call already in flight
+    :ivar int throttled: number of `429 Too Many Requests` responses
+    """
+
+    __slots__ = ["requests", "not_modified", "bytes_saved", "decodes_saved", "coalesced", "throttled"]
+
+    def __init__(self):
+        self.requests = 0
+        self.not_modified = 0
+        self.bytes_saved = 0
+        self.decodes_saved = 0
+        self.coalesced = 0
+        self.throttled = 0
+
+    def __repr__(self):
+        return "ClientStats({})".format(", ".join("{}={}".format(name, getattr(self, name)) for name in self.__slots__))
+
+
+RawResponse = namedtuple("RawResponse", ["body", "data"])
+RawResponse.__doc__ = """
+Response returned by the `get_raw` method of the clients.
+
+:ivar bytes body: the raw body of the response
+:ivar data: the decoded body, wrapped with :func:`nhlapi.props.wrap`
+"""
+
+_Validated = namedtuple("_Validated", ["etag", "last_modified", "response"])
+
+
+class _Validators:
+    """
+    Remembers the `ETag` and `Last-Modified` validators and the :class:`RawResponse` of the last responses.
+    """
+
+    def __init__(self, maxsize):
+        self._maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def headers(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, None
+            self._entries.move_to_end(key)
+        headers = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return entry, headers
+
+    def remember(self, key, resp_headers, response):
+        etag = resp_headers.get("ETag")
+        last_modified = resp_headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+        with self._lock:
+            self._entries[key] = _Validated(etag, last_modified, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+
+class _Timing:
+    """
+    Timestamps of the phases of a request, reported to the metrics sink of the clients.
+    """
+
+    __slots__ = ["queued", "sent", "first_byte", "done", "decode", "wrap"]
+
+    def __init__(self):
+        self.queued = self.sent = self.first_byte = self.done = time.perf_counter()
+        self.decode = self.wrap = 0.0
+
+    def mark_sent(self):
+        self.sent = self.first_byte = self.done = time.perf_counter()
+
+    def mark_headers(self):
+        self.first_byte = self.done = time.perf_counter()
+
+    def mark_body(self):
+        self.done = time.perf_counter()
+
+    def wrap_body(self, body, decoder, lazy):
+        start = time.perf_counter()
+        if lazy:
+            data = wrap_lazy(body, decoder)
+            self.wrap = time.perf_counter() - start
+            return data
+        try:
+            decoded = decoder(body)
+        except Exception:
+            self.decode = time.perf_counter() - start
+            raise
+        middle = time.perf_counter()
+        data = wrap(decoded)
+        self.decode, self.wrap = middle - start, time.perf_counter() - middle
+        return data
+
+    def report(self, sink, url, status, body=b"", error=None):
+        if sink is None:
+            return
+        sink.record(
+            RequestMetrics(
+                endpoint_template(url),
+                url,
+                status,
+                len(body),
+                self.sent - self.queued,
+                self.first_byte - self.sent,
+                self.done - self.first_byte,
+                self.decode,
+                self.wrap,
+                time.perf_counter() - self.queued,
+                None if error is None else type(error).__name__,
+            )
+        )
+
+
+def _throttled(stats, limiter, headers):
+    stats.throttled += 1
+    if limiter is None:
+        return
+    # Retry-After may also be an HTTP date, the API only sends seconds if anything.
+    try:
+        seconds = float(headers.get("Retry-After", 1))
+    except ValueError:
+        seconds = 1.0
+    limiter.pause(seconds)
+
+
+def _not_modified(stats, entry):
+    stats.not_modified += 1
+    stats.bytes_saved += len(entry.response.body)
+    stats.decodes_saved += 1
+    return entry.response
+
 
 try:
     import requests
 
     class SyncClient:
-        def __init__(self, headers=None):
+        """
+        Client using `requests`.
+
+        The body of the responses is decoded from raw bytes by `decoder`, which is :func:`nhlapi.props.json_decode`
+        by default, and the decoded value is wrapped with :func:`nhlapi.props.wrap`. Use :meth:`get_raw` to get the raw
+        body along with the decoded value. When `lazy` is `True`, the body is wrapped with
+        :func:`nhlapi.props.wrap_lazy` instead and only decoded when it's first accessed.
+
+        When `conditional` is `True`, the client remembers the validators of the last `conditional_maxsize` responses
+        and sends `If-None-Match` and `If-Modified-Since` headers. If the server replies with `304 Not Modified`, the
+        value decoded from the previous response is returned, the same object as before. The savings are counted in
+        :attr:`stats`.
+
+        When a `limiter` is given, every request waits for a token of the limiter with the given `priority`, see
+        :class:`nhlapi.ratelimit.RateLimiter`. The limiter is paused when the server replies with
+        `429 Too Many Requests`.
+
+        When a `metrics` sink is given, its `record` method is called after every request with the
+        :class:`nhlapi.metrics.RequestMetrics` of the request: how long it waited for the limiter, the time to the
+        first byte, the download, decode and wrap times, the size of the body and the status. See
+        :class:`nhlapi.metrics.MetricsRecorder`.
+
+        :param dict headers: headers sent with every request
+        :param decoder: function decoding a JSON document from :class:`bytes`
+        :param bool lazy: decode the body on first access
+        :param bool conditional: send conditional requests
+        :param int conditional_maxsize: maximum number of responses remembered for conditional requests
+        :param limiter: rate limiter shared with other clients
+        :param priority: priority of the requests of this client
+        :param metrics: sink receiving the metrics of every request
+        :type limiter: nhlapi.ratelimit.RateLimiter or None
+        :type priority: nhlapi.ratelimit.Priority
+        :type metrics: nhlapi.metrics.MetricsRecorder or None
+        """
+
+        def __init__(
+            self,
+            headers=None,
+            *,
+            decoder=None,
+            lazy=False,
+            conditional=False,
+            conditional_maxsize=256,
+            limiter=None,
+            priority=Priority.NORMAL,
+            metrics=None
+        ):
             self._sess = requests.Session()
             if headers:
                 self._sess.headers.update(headers)
+            self._decoder = decoder or json_decode
+            self._lazy = lazy
+            self._validators = _Validators(conditional_maxsize) if conditional else None
+            self._limiter = limiter
+            self._priority = priority
+            self.metrics = metrics
+            self.stats = ClientStats()
 
         def get(self, url, params=None):
-            resp = self._sess.get(url, params=params)
+            return self.get_raw(url, params).data
+
+        def get_raw(self, url, params=None):
+            """
+            Like `get`, but returns the raw body along with the decoded value.
+
+            :rtype: RawResponse
+            """
+            timing = _Timing()
+            entry = headers = None
+            if self._validators is not None:
+                key = _request_key(url, params)
+                entry, headers = self._validators.headers(key)
+            if self._limiter is not None:
+                self._limiter.acquire(self._priority)
+            self.stats.requests += 1
+            timing.mark_sent()
+            try:
+                # Stream the body to tell the time to the first byte from the download time.
+                resp = self._sess.get(url, params=params, headers=headers, stream=True)
+                timing.mark_headers()
+                body = resp.content
+                timing.mark_body()
+            except Exception as exc:
+                timing.report(self.metrics, url, None, error=exc)
+                raise
+            if resp.status_code == 304 and entry is not None:
+                timing.report(self.metrics, url, 304)
+                return _not_modified(self.stats, entry)
+            if resp.status_code == 429:
+                _throttled(self.stats, self._limiter, resp.headers)
+            if resp.status_code >= 400:
+                timing.report(self.metrics, url, resp.status_code, body)
             resp.raise_for_status()
-            return wrap(resp.json())
+            try:
+                response = RawResponse(body, timing.wrap_body(body, self._decoder, self._lazy))
+            except Exception as exc:
+                timing.report(self.metrics, url, resp.status_code, body, exc)
+                raise
+            timing.report(self.metrics, url, resp.status_code, body)
+            if self._validators is not None:
+                self._validators.remember(key, resp.headers, response)
+            return response
 
 
 except ImportError:
@@ -21,22 +360,150 @@ except ImportError:
 
 try:
     import aiohttp
-    import asyncio
 
     class AsyncClient:
-        def __init__(self, *, headers=None, loop=None):
+        """
+        Client using `aiohttp`. See :class:`SyncClient` for the `decoder`, `lazy`, `conditional`, `limiter` and
+        `priority` parameters.
+
+        When `coalesce` is `True`, concurrent calls with the same URL and parameters share a single request and get
+        the same decoded value. Calls that joined a request already in flight are counted in :attr:`stats`. The value
+        is the same mutable object for every one of these callers, not a copy: a caller modifying it, by applying a
+        patch to it for instance, changes it for the others. Copy it first, or pass `coalesce=False`.
+
+        When a `limit` is given, the number of requests in flight is adjusted from the latency and the overload
+        responses of the server, see :class:`nhlapi.ratelimit.AdaptiveLimit`. Give a high `concurrency` to
+        :meth:`nhlapi.endpoints.NHLAPI.get_many` and let the client find the right one.
+
+        See :class:`SyncClient` for the `metrics` sink, the queue wait of the requests includes the wait for the
+        adaptive limit. Coalesced calls do not send requests and are not reported.
+
+        :param dict headers: headers sent with every request
+        :param loop: event loop used by the session
+        :param decoder: function decoding a JSON document from :class:`bytes`
+        :param bool lazy: decode the body on first access
+        :param bool conditional: send conditional requests
+        :param int conditional_maxsize: maximum number of responses remembered for conditional requests
+        :param bool coalesce: share requests between concurrent identical calls
+        :param limiter: rate limiter shared with other clients
+        :param priority: priority of the requests of this client
+        :param limit: adaptive limit on the number of requests in flight
+        :param metrics: sink receiving the metrics of every request
+        :type limiter: nhlapi.ratelimit.RateLimiter or None
+        :type priority: nhlapi.ratelimit.Priority
+        :type limit: nhlapi.ratelimit.AdaptiveLimit or None
+        :type metrics: nhlapi.metrics.MetricsRecorder or None
+        """
+
+        def __init__(
+            self,
+            *,
+            headers=None,
+            loop=None,
+            decoder=None,
+            lazy=False,
+            conditional=False,
+            conditional_maxsize=256,
+            coalesce=True,
+            limiter=None,
+            priority=Priority.NORMAL,
+            limit=None,
+            metrics=None
+        ):
             if not loop:
                 loop = asyncio.get_event_loop()
             self._loop = loop
             self._session = aiohttp.ClientSession(headers=headers, loop=self._loop)
+            self._decoder = decoder or json_decode
+            self._lazy = lazy
+            self._validators = _Validators(conditional_maxsize) if conditional else None
+            self._inflight = {} if coalesce else None
+            self._limiter = limiter
+            self._priority = priority
+            self.limit = limit
+            self.metrics = metrics
+            self.stats = ClientStats()
 
         def __del__(self):
-            asyncio.ensure_future(self._session.close(), loop=self._loop)
+            if not self._session.closed and not self._loop.is_closed():
+                asyncio.ensure_future(self._session.close(), loop=self._loop)
+
+        async def close(self):
+            """
+            Close the underlying session.
+            """
+            await self._session.close()
 
         async def get(self, url, params=None):
-            resp = await self._session.get(url, params=params)
+            return (await self.get_raw(url, params)).data
+
+        async def get_raw(self, url, params=None):
+            """
+            Like `get`, but returns the raw body along with the decoded value.
+
+            :rtype: RawResponse
+            """
+            if self._inflight is None:
+                return await self._fetch(url, params)
+            key = _request_key(url, params)
+            fut = self._inflight.get(key)
+            if fut is None:
+                fut = asyncio.ensure_future(self._fetch(url, params), loop=self._loop)
+                self._inflight[key] = fut
+                fut.add_done_callback(lambda done: self._inflight.pop(key, None))
+            else:
+                self.stats.coalesced += 1
+            # Shield the shared request so that a cancelled caller does not cancel it for the others.
+            return await asyncio.shield(fut)
+
+        async def _fetch(self, url, params):
+            timing = _Timing()
+            if self.limit is None:
+                return await self._send(url, params, timing)
+            await self.limit.acquire()
+            try:
+                return await self._send(url, params, timing)
+            finally:
+                self.limit.release()
+
+        async def _send(self, url, params, timing):
+            entry = headers = None
+            if self._validators is not None:
+                key = _request_key(url, params)
+                entry, headers = self._validators.headers(key)
+            if self._limiter is not None:
+                await self._limiter.acquire_async(self._priority)
+            self.stats.requests += 1
+            timing.mark_sent()
+            try:
+                async with self._session.get(url, params=params, headers=headers) as resp:
+                    timing.mark_headers()
+                    body = await resp.read()
+                    timing.mark_body()
+            except Exception as exc:
+                timing.report(self.metrics, url, None, error=exc)
+                if self.limit is not None and isinstance(exc, (aiohttp.ClientConnectionError, asyncio.TimeoutError)):
+                    self.limit.record(None, True)
+                raise
+            if self.limit is not None:
+                self.limit.record(timing.done - timing.sent, resp.status == 429 or resp.status >= 500)
+            if resp.status == 304 and entry is not None:
+                timing.report(self.metrics, url, 304)
+                return _not_modified(self.stats, entry)
+            if resp.status == 429:
+                _throttled(self.stats, self._limiter, resp.headers)
+            if resp.status >= 400:
+                timing.report(self.metrics, url, resp.status, body)
             resp.raise_for_status()
-            return wrap(await resp.json())
+            try:
+                response = RawResponse(body, timing.wrap_body(body, self._decoder, self._lazy))
+            except Exception as exc:
+                timing.report(self.metrics, url, resp.status, body, exc)
+                raise
+            timing.report(self.metrics, url, resp.status, body)
+            if self._validators is not None:
+                self._validators.remember(key, resp.headers, response)
+            return response
 
 
 except ImportError:
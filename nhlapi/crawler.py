@@ -0,0 +1,215 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+from .clients import is_async_client
+from .utils import GameKind
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+class Checkpoint:
+    """
+    Remembers which games were crawled in a text file, one game id per line. Lines are appended as games complete so
+    an interrupted crawl loses nothing and the file can be shared by several processes.
+
+    :param str path: path of the checkpoint file
+    """
+
+    def __init__(self, path):
+        self._path = path
+        self._done = set()
+        if os.path.exists(path):
+            with open(path) as f:
+                self._done.update(int(line) for line in f if line.strip())
+
+    def __contains__(self, game_pk):
+        return game_pk in self._done
+
+    def __len__(self):
+        return len(self._done)
+
+    def mark(self, game_pk):
+        """
+        Record that the given game was crawled.
+
+        :param game_pk: game id
+        :type game_pk: int or nhlapi.utils.GameId
+        """
+        # The str of a GameId is its repr, the file holds plain integers.
+        game_pk = int(game_pk)
+        if game_pk in self._done:
+            return
+        self._done.add(game_pk)
+        with open(self._path, "a") as f:
+            f.write("{}\n".format(game_pk))
+
+
+class SeasonCrawler:
+    """
+    Stream the boxscore of every game of a season. The game ids are taken from the schedule of the season and the
+    boxscores are fetched concurrently, `concurrency` at a time, in chunks so that memory stays flat.
+
+    With a synchronous client, :meth:`crawl` returns an iterator::
+
+        for game_pk, boxscore in SeasonCrawler(api, Season(2017)).crawl():
+            ...
+
+    With an asynchronous client, it returns an asynchronous iterator::
+
+        async for game_pk, boxscore in SeasonCrawler(api, Season(2017)).crawl():
+            ...
+
+    If a boxscore cannot be fetched, the exception is given in its place and the game is not checkpointed, so it will
+    be retried when the crawl is resumed.
+
+    :param api: the API
+    :param season: the season to crawl
+    :param kinds: kinds of games to crawl
+    :param checkpoint: path of a checkpoint file, the games it contains are skipped, see :class:`Checkpoint`
+    :param int concurrency: maximum number of requests in flight
+    :param shard: `(index, count)` pair to only crawl the games where `game_pk % count == index`
+    :type api: nhlapi.endpoints.NHLAPI
+    :type season: nhlapi.utils.Season
+    :type kinds: list[nhlapi.utils.GameKind]
+    :type checkpoint: str or None
+    :type shard: tuple or None
+    """
+
+    def __init__(self, api, season, kinds=(GameKind.REGULAR,), *, checkpoint=None, concurrency=8, shard=None):
+        if shard is not None and not 0 <= shard[0] < shard[1]:
+            raise ValueError("shard index must be between 0 and count")
+        self._api = api
+        self._season = season
+        self._kinds = frozenset(GameKind(kind) for kind in kinds)
+        self._checkpoint = Checkpoint(checkpoint) if checkpoint else None
+        self._concurrency = concurrency
+        self._shard = shard
+
+    def _schedule(self):
+        # The season spans from the fall of its begin year to the summer of its end year, the 2020 playoffs ended in
+        # late September. Games of other seasons in the date range are filtered out by their id.
+        return self._api.schedule(start_date=date(self._season.begin, 7, 1), end_date=date(self._season.end, 10, 31))
+
+    def game_ids(self, schedule):
+        """
+        Get the ids of the games to crawl from the schedule of the season. Games of other seasons or kinds, games of
+        other shards and games already in the checkpoint are excluded.
+
+        :param schedule: response of :meth:`nhlapi.endpoints.NHLAPI.schedule`
+        :rtype: list[int]
+        """
+        game_ids = []
+        seen = set()
+        for day in schedule.dates:
+            for game in day.games:
+                pk = game.gamePk
+                if pk in seen or pk // 1000000 != self._season.begin:
+                    continue
+                seen.add(pk)
+                if pk // 10000 % 100 not in self._kinds:
+                    continue
+                if self._shard is not None and pk % self._shard[1] != self._shard[0]:
+                    continue
+                if self._checkpoint is not None and pk in self._checkpoint:
+                    continue
+                game_ids.append(pk)
+        return game_ids
+
+    def _done(self, game_pk, result):
+        if self._checkpoint is not None and not isinstance(result, Exception):
+            self._checkpoint.mark(game_pk)
+        return game_pk, result
+
+    def crawl(self):
+        """
+        Crawl the boxscores of the season.
+
+        :returns: an iterator, or an asynchronous iterator with an asynchronous client, of `(game_pk, boxscore)` pairs
+            in the order they complete
+        """
+        if is_async_client(self._api._client):
+            return _AsyncCrawl(self)
+        return self._crawl_sync()
+
+    def _crawl_sync(self):
+        game_ids = self.game_ids(self._schedule())
+        for chunk in _chunks(game_ids, self._concurrency * 4):
+            for index, result in self._api.boxscores(chunk, concurrency=self._concurrency, ordered=False):
+                yield self._done(chunk[index], result)
+
+
+class _AsyncCrawl:
+    """
+    Asynchronous iterator of :meth:`SeasonCrawler.crawl`.
+    """
+
+    def __init__(self, crawler):
+        self._crawler = crawler
+        self._chunks = None
+        self._chunk = None
+        self._pending = iter(())
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        crawler = self._crawler
+        if self._chunks is None:
+            game_ids = crawler.game_ids(await crawler._schedule())
+            self._chunks = _chunks(game_ids, crawler._concurrency * 4)
+        while True:
+            fut = next(self._pending, None)
+            if fut is not None:
+                index, result = await fut
+                return crawler._done(self._chunk[index], result)
+            self._chunk = next(self._chunks, None)
+            if self._chunk is None:
+                raise StopAsyncIteration
+            self._pending = iter(crawler._api.boxscores(self._chunk, concurrency=crawler._concurrency, ordered=False))
+
+
+def _crawl_shard(make_api, season, kinds, checkpoint, concurrency, shard, handler):
+    crawler = SeasonCrawler(make_api(), season, kinds, checkpoint=checkpoint, concurrency=concurrency, shard=shard)
+    count = 0
+    for game_pk, result in crawler.crawl():
+        handler(game_pk, result)
+        count += 1
+    return count
+
+
+def crawl_processes(
+    make_api, season, handler, kinds=(GameKind.REGULAR,), *, processes=None, checkpoint=None, concurrency=8
+):
+    """
+    Crawl a season with several processes, each crawling its own shard of the games with a :class:`SeasonCrawler`.
+    The results are given to `handler` inside the worker processes, for instance to write them to disk or to a
+    :class:`nhlapi.store.DiskStore`.
+
+    The `make_api` and `handler` functions must be picklable, which means they must be defined at the top level of a
+    module. `make_api` is called in each process and must return an API using a synchronous client.
+
+    :param make_api: function taking no argument and returning a :class:`nhlapi.endpoints.NHLAPI`
+    :param season: the season to crawl
+    :param handler: function called with `(game_pk, boxscore)` for each game
+    :param kinds: kinds of games to crawl
+    :param int processes: number of processes, the number of CPUs by default
+    :param checkpoint: path of a checkpoint file shared by the processes
+    :param int concurrency: maximum number of requests in flight in each process
+    :type season: nhlapi.utils.Season
+    :type checkpoint: str or None
+    :returns: number of games crawled
+    :rtype: int
+    """
+    processes = processes or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = [
+            executor.submit(
+                _crawl_shard, make_api, season, tuple(kinds), checkpoint, concurrency, (index, processes), handler
+            )
+            for index in range(processes)
+        ]
+        return sum(fut.result() for fut in futures)
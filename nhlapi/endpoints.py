@@ -1,4 +1,10 @@
+import inspect
+from functools import lru_cache
+from string import Formatter
 from urllib.parse import urljoin, quote
+from . import models
+from .clients import fetch_many
+from .props import prune
 from .utils import to_url_param
 
 
@@ -8,9 +14,45 @@ def _maybe(val, func=to_url_param):
     return None
 
 
+def _then(result, func):
+    """
+    Apply `func` to the result of a client, awaiting it first if the client is asynchronous.
+    """
+    if inspect.isawaitable(result):
+
+        async def chain():
+            return func(await result)
+
+        return chain()
+    return func(result)
+
+
 API_BASE_URL = "https://statsapi.web.nhl.com"
 
 
+def _absolute(url):
+    """
+    Make a URL of the API absolute. Plain paths are appended to the base URL, the others go through
+    :func:`urllib.parse.urljoin`.
+    """
+    if url[:1] == "/" and url[1:2] != "/" and "/." not in url:
+        return API_BASE_URL + url
+    return urljoin(API_BASE_URL, url)
+
+
+@lru_cache(maxsize=256)
+def _url_template(url):
+    """
+    Compile a URL given to :meth:`NHLAPI.get` into a function building the absolute URL from the positional arguments.
+    The URL is joined to the base URL once, the arguments are quoted so they cannot change how it's joined.
+    """
+    template = _absolute(url)
+    if all(field is None for _, field, _, _ in Formatter().parse(template)):
+        template = template.format()
+        return lambda args: template
+    return lambda args: template.format(*[quote(to_url_param(val), safe="") for val in args if val is not None])
+
+
 class NHLAPI:
     """
     Initialize this class with the client you wish to use. It works transparently with the synchronous and asynchronous
@@ -31,10 +73,17 @@ class NHLAPI:
         3 New York Rangers Madison Square Garden
         ...
 
+    Every endpoint accepts a `fields` parameter, a list of field names or a comma separated string, which asks the
+    API to only send these fields. When `prune_fields` is `True`, the responses are also pruned with
+    :func:`nhlapi.props.prune` right after they are decoded, in case the API ignored the parameter.
+
+    :param client: the client, see :ref:`clients`
+    :param bool prune_fields: prune the responses to the requested fields on the client side
     """
 
-    def __init__(self, client):
+    def __init__(self, client, *, prune_fields=False):
         self._client = client
+        self._prune_fields = prune_fields
 
     def get(self, url, *args, **kwargs):
         """
@@ -62,18 +111,70 @@ class NHLAPI:
         :raises: :class:`aiohttp.ClientResponseError` if an error occurs and you use :class:`AsyncClient`
         :returns: A JSON object wrapped inside an attribute access dictionary.
         """
-        url = url.format(*[quote(to_url_param(val), safe="") for val in args if val is not None])
         params = {key: to_url_param(val) for key, val in kwargs.items() if val is not None}
+        return self._client.get(_url_template(url)(args), params)
 
-        url = urljoin(API_BASE_URL, url)
+    def get_many(self, calls, *, concurrency=8, ordered=True, fields=None, model=None):
+        """
+        Call many endpoints of the API concurrently. Each call is either a URL or a `(url, params)` pair, where the
+        URL is absolute or relative like in :meth:`get` and the params are converted using :func:`to_url_param`.
 
-        return self._client.get(url, params)
+        .. code-block:: python3
 
-    def _get(self, endpoint, **params):
-        params = {key: val for key, val in params.items() if val is not None}
-        return self._client.get(API_BASE_URL + endpoint, params)
+            api.get_many(["/api/v1/teams/8", ("/api/v1/schedule", {"teamId": 8})], concurrency=4)
+
+        An error on one call does not abort the batch, the exception is returned in place of its result. See
+        :func:`nhlapi.clients.fetch_many` for the shape of the results.
+
+        :param calls: URLs or `(url, params)` pairs
+        :param int concurrency: maximum number of requests in flight
+        :param bool ordered: return the results in order or as they complete
+        :param fields: only request these fields, see :class:`NHLAPI`
+        :param model: build this model from each result, see :mod:`nhlapi.models`
+        :type fields: str or list[str]
+        :type model: type or None
+        """
+        if fields is not None:
+            fields = to_url_param(fields)
+        prepared = []
+        for call in calls:
+            if isinstance(call, str):
+                url, params = call, {}
+            else:
+                url, params = call
+            params = {key: to_url_param(val) for key, val in params.items() if val is not None}
+            if fields is not None:
+                params["fields"] = fields
+            prepared.append((_absolute(url), params))
+        return fetch_many(
+            self._client, prepared, concurrency=concurrency, ordered=ordered, transform=self._transform(fields, model)
+        )
 
-    def teams(self, id=None, *, expand=None, stats=None):
+    def _pruner(self, fields):
+        if fields is None or not self._prune_fields:
+            return None
+        fields = to_url_param(fields).split(",")
+        return lambda result: prune(result, fields)
+
+    def _transform(self, fields, model):
+        pruner = self._pruner(fields)
+        if model is None:
+            return pruner
+        if pruner is None:
+            return model.from_json
+        return lambda result: model.from_json(pruner(result))
+
+    def _get(self, endpoint, fields=None, model=None, **params):
+        params = {key: val for key, val in params.items() if val is not None}
+        if fields is not None:
+            params["fields"] = to_url_param(fields)
+        result = self._client.get(API_BASE_URL + endpoint, params)
+        transform = self._transform(fields, model)
+        if transform is not None:
+            return _then(result, transform)
+        return result
+
+    def teams(self, id=None, *, expand=None, stats=None, fields=None, model=False):
         """
         Get the list of teams. Use the expand parameter, either as a str or list of str to get more information.
 
@@ -85,40 +186,110 @@ class NHLAPI:
         :type id: int or list[int]
         :type expand: str or list[str]
         :type stats: str or list[str]
+        :param fields: only request these fields, see :class:`NHLAPI`
+        :type fields: str or list[str]
+        :param bool model: return a :class:`nhlapi.models.Teams` instead of a :class:`nhlapi.props.PropDict`
         """
-        return self._get("/api/v1/teams", teamId=_maybe(id), expand=_maybe(expand), stats=_maybe(stats))
+        return self._get(
+            "/api/v1/teams",
+            teamId=_maybe(id),
+            expand=_maybe(expand),
+            stats=_maybe(stats),
+            fields=fields,
+            model=models.Teams if model else None,
+        )
 
-    def team_stats(self, team_id):
+    def team_stats(self, team_id, *, fields=None):
         """
         Get information about the team's stats.
 
         `Docs <https://gitlab.com/dword4/nhlapi/blob/master/stats-api.md#team-stats>`__
 
         :param int team_id: team id
+        :param fields: only request these fields, see :class:`NHLAPI`
+        :type fields: str or list[str]
         """
-        return self._get("/api/v1/teams/{}/stats".format(team_id))
+        return self._get("/api/v1/teams/{}/stats".format(team_id), fields=fields)
 
-    def boxscore(self, game_id):
+    def boxscore(self, game_id, *, fields=None, model=False):
         """
         Get information about a game's boxscore.
 
         `Docs <https://gitlab.com/dword4/nhlapi/blob/master/stats-api.md#game>`__
 
         :param GameId or int game_id: game id
+        :param fields: only request these fields, see :class:`NHLAPI`
+        :type fields: str or list[str]
+        :param bool model: return a :class:`nhlapi.models.Boxscore` instead of a :class:`nhlapi.props.PropDict`
+        """
+        return self._get(
+            "/api/v1/game/{}/boxscore".format(to_url_param(game_id)),
+            fields=fields,
+            model=models.Boxscore if model else None,
+        )
+
+    def boxscores(self, game_ids, *, concurrency=8, ordered=True, fields=None, model=False):
         """
-        return self._get("/api/v1/game/{}/boxscore".format(to_url_param(game_id)))
+        Get the boxscores of many games concurrently. See :meth:`get_many` for the shape of the results.
+
+        :param game_ids: game ids
+        :param int concurrency: maximum number of requests in flight
+        :param bool ordered: return the results in order or as they complete
+        :type game_ids: list[GameId] or list[int]
+        :param fields: only request these fields, see :class:`NHLAPI`
+        :type fields: str or list[str]
+        :param bool model: return a :class:`nhlapi.models.Boxscore` instead of a :class:`nhlapi.props.PropDict`
+        """
+        urls = ["/api/v1/game/{}/boxscore".format(to_url_param(game_id)) for game_id in game_ids]
+        return self.get_many(
+            urls, concurrency=concurrency, ordered=ordered, fields=fields, model=models.Boxscore if model else None
+        )
 
-    def content(self, game_id):
+    def content(self, game_id, *, fields=None):
         """
         Get detailed media information about a game.
 
         `Docs <https://gitlab.com/dword4/nhlapi/blob/master/stats-api.md#game>`__
 
         :param GameId or int game_id: game id
+        :param fields: only request these fields, see :class:`NHLAPI`
+        :type fields: str or list[str]
+        """
+        return self._get("/api/v1/game/{}/content".format(to_url_param(game_id)), fields=fields)
+
+    def live_feed(self, game_id, *, fields=None):
+        """
+        Get the live feed of a game, with its full state and every play so far.
+
+        `Docs <https://gitlab.com/dword4/nhlapi/blob/master/stats-api.md#game>`__
+
+        :param GameId or int game_id: game id
+        :param fields: only request these fields, see :class:`NHLAPI`
+        :type fields: str or list[str]
+        """
+        return self._get("/api/v1/game/{}/feed/live".format(to_url_param(game_id)), fields=fields)
+
+    def live_feed_diff(self, game_id, start_timecode, *, fields=None):
+        """
+        Get the changes made to the live feed of a game since the given timecode, as a list of objects whose `diff`
+        item is a list of JSON Patch operations. The list is empty when nothing changed. See
+        :class:`nhlapi.live.LivePoller` to follow games with it.
+
+        `Docs <https://gitlab.com/dword4/nhlapi/blob/master/stats-api.md#game>`__
+
+        :param GameId or int game_id: game id
+        :param str start_timecode: timecode in the `yyyymmdd_hhmmss` format, such as the `metaData.timeStamp` of the
+            live feed
+        :param fields: only request these fields, see :class:`NHLAPI`
+        :type fields: str or list[str]
         """
-        return self._get("/api/v1/game/{}/content".format(to_url_param(game_id)))
+        return self._get(
+            "/api/v1/game/{}/feed/live/diffPatch".format(to_url_param(game_id)),
+            fields=fields,
+            startTimecode=start_timecode,
+        )
 
-    def divisions(self, id: int = None):
+    def divisions(self, id: int = None, *, fields=None):
         """
         Get the list of divisions
 
@@ -126,13 +297,15 @@ class NHLAPI:
 
         :param id: division id
         :type id: int or None
+        :param fields: only request these fields, see :class:`NHLAPI`
+        :type fields: str or list[str]
         """
         if id is not None:
-            return self._get("/api/v1/divisions/{}".format(id))
+            return self._get("/api/v1/divisions/{}".format(id), fields=fields)
         else:
-            return self._get("/api/v1/divisions")
+            return self._get("/api/v1/divisions", fields=fields)
 
-    def conferences(self, id=None):
+    def conferences(self, id=None, *, fields=None):
         """
         Get the list of conferences
 
@@ -140,13 +313,15 @@ class NHLAPI:
 
         :param id: conference id
         :type id: int
+        :param fields: only request these fields, see :class:`NHLAPI`
+        :type fields: str or list[str]
         """
         if id is not None:
-            return self._get("/api/v1/conferences/{}".format(id))
+            return self._get("/api/v1/conferences/{}".format(id), fields=fields)
         else:
-            return self._get("/api/v1/conferences")
+            return self._get("/api/v1/conferences", fields=fields)
 
-    def people(self, id, *, stats=None, stats_season=None):
+    def people(self, id, *, stats=None, stats_season=None, fields=None, model=False):
         """
         Get information about a player. Use the stats parameter with a string to get a specific kind of stats.
 
@@ -157,7 +332,13 @@ class NHLAPI:
         :param stats_season: specify for which season to get the stats
         :type stats: bool or str
         :type stats_season: nhlapi.utils.Season
+        :param fields: only request these fields, see :class:`NHLAPI`
+        :type fields: str or list[str]
+        :param bool model: return a :class:`nhlapi.models.People` instead of a :class:`nhlapi.props.PropDict`, not
+            available with `stats`
         """
+        if stats and model:
+            raise ValueError("cannot set both of stats and model, there is no model for stats")
         params = {}
         if stats:
             url = "/api/v1/people/{}/stats".format(id)
@@ -166,9 +347,27 @@ class NHLAPI:
                 params["season"] = stats_season.to_url_param()
         else:
             url = "/api/v1/people/{}".format(id)
-        return self._get(url, **params)
+        return self._get(url, fields=fields, model=models.People if model else None, **params)
+
+    def people_many(self, ids, *, concurrency=8, ordered=True, fields=None, model=False):
+        """
+        Get information about many players concurrently. See :meth:`get_many` for the shape of the results.
+
+        :param list[int] ids: player ids
+        :param int concurrency: maximum number of requests in flight
+        :param bool ordered: return the results in order or as they complete
+        :param fields: only request these fields, see :class:`NHLAPI`
+        :type fields: str or list[str]
+        :param bool model: return a :class:`nhlapi.models.People` instead of a :class:`nhlapi.props.PropDict`
+        """
+        urls = ["/api/v1/people/{}".format(id) for id in ids]
+        return self.get_many(
+            urls, concurrency=concurrency, ordered=ordered, fields=fields, model=models.People if model else None
+        )
 
-    def schedule(self, team_id=None, *, expand=None, date=None, start_date=None, end_date=None):
+    def schedule(
+        self, team_id=None, *, expand=None, date=None, start_date=None, end_date=None, fields=None, model=False
+    ):
         """
         Get information about the schedule. Use the date parameters to filter for a specific date.
 
@@ -183,6 +382,9 @@ class NHLAPI:
         :type date: datetime.date
         :type start_date: datetime.date
         :type end_date: datetime.date
+        :param fields: only request these fields, see :class:`NHLAPI`
+        :type fields: str or list[str]
+        :param bool model: return a :class:`nhlapi.models.Schedule` instead of a :class:`nhlapi.props.PropDict`
         """
         if date is not None and (start_date is not None or end_date is not None):
             raise ValueError("cannot set both of date and start_date/end_date")
@@ -193,9 +395,11 @@ class NHLAPI:
             date=_maybe(date),
             startDate=_maybe(start_date),
             endDate=_maybe(end_date),
+            fields=fields,
+            model=models.Schedule if model else None,
         )
 
-    def standings(self, *, expand=None, season=None, date=None):
+    def standings(self, *, expand=None, season=None, date=None, fields=None, model=False):
         """
         Get information about the standings. Use the season or date parameter to filter for a specific season or date.
 
@@ -207,7 +411,17 @@ class NHLAPI:
         :type expand: str or list[str]
         :type season: nhlapi.utils.Season
         :type date: datetime.date
+        :param fields: only request these fields, see :class:`NHLAPI`
+        :type fields: str or list[str]
+        :param bool model: return a :class:`nhlapi.models.Standings` instead of a :class:`nhlapi.props.PropDict`
         """
         if season is not None and date is not None:
             raise ValueError("pick either season or date")
-        return self._get("/api/v1/standings/byLeague", season=_maybe(season), date=_maybe(date), expand=_maybe(expand))
+        return self._get(
+            "/api/v1/standings/byLeague",
+            season=_maybe(season),
+            date=_maybe(date),
+            expand=_maybe(expand),
+            fields=fields,
+            model=models.Standings if model else None,
+        )
@@ -0,0 +1,342 @@
+import asyncio
+import inspect
+
+from .clients import is_async_client
+from .props import wrap
+
+_PLAYS = ["liveData", "plays", "allPlays"]
+
+
+class PatchError(ValueError):
+    """
+    Raised when a JSON Patch operation cannot be applied to a document.
+    """
+
+
+def _tokens(path):
+    if path == "":
+        return []
+    if not path.startswith("/"):
+        raise PatchError("invalid path: {!r}".format(path))
+    return [token.replace("~1", "/").replace("~0", "~") for token in path[1:].split("/")]
+
+
+def _index(container, token, path, append=False):
+    if append and token == "-":
+        return len(container)
+    if not token.isdigit() or (token != "0" and token.startswith("0")):
+        raise PatchError("invalid array index in {!r}".format(path))
+    index = int(token)
+    if index > len(container) or (index == len(container) and not append):
+        raise PatchError("array index out of range in {!r}".format(path))
+    return index
+
+
+def _resolve(doc, tokens, path):
+    # Walk down to the parent of the last token.
+    node = doc
+    for token in tokens[:-1]:
+        try:
+            node = node[_index(node, token, path) if isinstance(node, list) else token]
+        except (KeyError, TypeError):
+            raise PatchError("path not found: {!r}".format(path))
+    return node
+
+
+def _get(doc, path):
+    tokens = _tokens(path)
+    if not tokens:
+        return doc
+    parent = _resolve(doc, tokens, path)
+    try:
+        if isinstance(parent, list):
+            return parent[_index(parent, tokens[-1], path)]
+        return parent[tokens[-1]]
+    except (KeyError, TypeError):
+        raise PatchError("path not found: {!r}".format(path))
+
+
+def _add(doc, path, value):
+    tokens = _tokens(path)
+    if not tokens:
+        raise PatchError("cannot replace the whole document")
+    parent = _resolve(doc, tokens, path)
+    if isinstance(parent, list):
+        parent.insert(_index(parent, tokens[-1], path, append=True), value)
+    elif isinstance(parent, dict):
+        parent[tokens[-1]] = value
+    else:
+        raise PatchError("path not found: {!r}".format(path))
+
+
+def _remove(doc, path):
+    tokens = _tokens(path)
+    if not tokens:
+        raise PatchError("cannot remove the whole document")
+    parent = _resolve(doc, tokens, path)
+    try:
+        if isinstance(parent, list):
+            return parent.pop(_index(parent, tokens[-1], path))
+        return parent.pop(tokens[-1])
+    except (KeyError, TypeError, AttributeError):
+        raise PatchError("path not found: {!r}".format(path))
+
+
+def apply_patch(doc, ops):
+    """
+    Apply JSON Patch operations (RFC 6902) to a decoded JSON document, in place. The document is left half patched if
+    an operation fails.
+
+    :param doc: the document, a :class:`dict` or a wrapped document
+    :param ops: list of operations, such as `{"op": "replace", "path": "/metaData/timeStamp", "value": "..."}`
+    :raises: :class:`PatchError` if an operation cannot be applied or a `test` operation fails
+    """
+    doc = getattr(doc, "_nhlapi_inner_", doc)
+    for op in getattr(ops, "_nhlapi_inner_", ops):
+        kind = op.get("op")
+        path = op.get("path")
+        if path is None:
+            raise PatchError("operation without a path")
+        if kind == "add":
+            _add(doc, path, op["value"])
+        elif kind == "remove":
+            _remove(doc, path)
+        elif kind == "replace":
+            _remove(doc, path)
+            _add(doc, path, op["value"])
+        elif kind == "move":
+            _add(doc, path, _remove(doc, op["from"]))
+        elif kind == "copy":
+            _add(doc, path, _copy(_get(doc, op["from"])))
+        elif kind == "test":
+            if _get(doc, path) != op["value"]:
+                raise PatchError("test failed for {!r}".format(path))
+        else:
+            raise PatchError("unknown operation: {!r}".format(kind))
+
+
+def _copy(val):
+    if isinstance(val, dict):
+        return {key: _copy(item) for key, item in val.items()}
+    if isinstance(val, list):
+        return [_copy(item) for item in val]
+    return val
+
+
+def _changed_plays(ops):
+    """
+    Get the indices of the plays touched by the operations, `None` if the whole list of plays was touched, and
+    whether plays were appended with the `-` index.
+    """
+    indices = set()
+    appended = False
+    for op in ops:
+        for path in (op.get("path"), op.get("from")):
+            if path is None:
+                continue
+            tokens = _tokens(path)
+            if tokens[: len(_PLAYS)] != _PLAYS[: len(tokens)]:
+                continue
+            if len(tokens) <= len(_PLAYS):
+                return None, True
+            token = tokens[len(_PLAYS)]
+            if token == "-":
+                appended = True
+            elif token.isdigit():
+                indices.add(int(token))
+    return indices, appended
+
+
+def _plays(doc):
+    return doc.get("liveData", {}).get("plays", {}).get("allPlays", [])
+
+
+class LivePoller:
+    """
+    Follow live games with :meth:`nhlapi.endpoints.NHLAPI.live_feed_diff`. The full feed of each game is fetched once,
+    then only the changes made since its last timecode are downloaded and applied in place to a copy of it. The
+    documents returned by the client are never modified, a coalescing or caching client shares them with its other
+    callers. The subscribers are called with the plays that were added or changed::
+
+        poller = LivePoller(api, [2018020001, 2018020002])
+        poller.subscribe(lambda game_id, plays: print(game_id, [play.result.event for play in plays]))
+        await poller.run()
+
+    It only works with :class:`nhlapi.clients.AsyncClient`, one poller can follow every game of the night in a
+    single process. The client may be lazy, but it must not use :func:`nhlapi.props.compact_decode`, whose records
+    cannot be patched.
+
+    If a patch cannot be applied, the full feed is fetched again and its plays are all sent to the subscribers.
+    Games are dropped once they are final. When polling a game fails, the error is kept in :attr:`errors` and the
+    game is polled again in the next round. The error is cleared by the next successful poll of the game, or when it
+    is removed.
+
+    :param api: the API, using an asynchronous client
+    :param game_ids: games to follow
+    :param float interval: seconds between polls, the `metaData.wait` of the feeds or 10 seconds by default
+    :type api: nhlapi.endpoints.NHLAPI
+    :type game_ids: list[int] or list[nhlapi.utils.GameId]
+    :type interval: float or None
+
+    :ivar dict errors: last error raised while polling each game, for the games whose last poll failed
+    :ivar int polls: number of polls
+    :ivar int patches: number of patches applied
+    :ivar int refetches: number of full feeds fetched
+    """
+
+    def __init__(self, api, game_ids=(), *, interval=None):
+        if not is_async_client(api._client):
+            raise TypeError("LivePoller needs an asynchronous client")
+        self._api = api
+        self._interval = interval
+        self._games = {}
+        self._subscribers = []
+        self._stopped = False
+        self.errors = {}
+        self.polls = 0
+        self.patches = 0
+        self.refetches = 0
+        for game_id in game_ids:
+            self.add(game_id)
+
+    def add(self, game_id):
+        """
+        Start following a game.
+
+        :param game_id: game id
+        :type game_id: int or nhlapi.utils.GameId
+        """
+        self._games.setdefault(game_id, None)
+
+    def remove(self, game_id):
+        """
+        Stop following a game and forget its document and its error.
+
+        :param game_id: game id
+        :type game_id: int or nhlapi.utils.GameId
+        """
+        self._games.pop(game_id, None)
+        self.errors.pop(game_id, None)
+
+    @property
+    def game_ids(self):
+        """
+        The games being followed.
+
+        :rtype: list
+        """
+        return list(self._games)
+
+    def document(self, game_id):
+        """
+        Get the local live feed of a game, as patched so far.
+
+        :param game_id: game id
+        :returns: the wrapped document, `None` if it was not fetched yet
+        :rtype: nhlapi.props.PropDict or None
+        """
+        doc = self._games.get(game_id)
+        return None if doc is None else wrap(doc)
+
+    def subscribe(self, callback):
+        """
+        Call `callback(game_id, plays)` whenever plays of a game are added or changed. The plays are wrapped with
+        :func:`nhlapi.props.wrap`. The callback can be a coroutine function.
+
+        :returns: a function that unsubscribes the callback
+        """
+        self._subscribers.append(callback)
+        return lambda: self._subscribers.remove(callback)
+
+    async def _notify(self, game_id, plays):
+        if not plays:
+            return
+        plays = [wrap(play) for play in plays]
+        for callback in list(self._subscribers):
+            result = callback(game_id, plays)
+            if inspect.isawaitable(result):
+                await result
+
+    async def _fetch(self, game_id):
+        self.refetches += 1
+        doc = await self._api.live_feed(game_id)
+        # The patches are applied in place, the document returned by the client may be shared with other callers.
+        doc = _copy(getattr(doc, "_nhlapi_inner_", doc))
+        self._games[game_id] = doc
+        return list(_plays(doc))
+
+    async def poll(self, game_id):
+        """
+        Poll a game once and notify the subscribers of its changed plays.
+
+        :param game_id: game id
+        :returns: the plays that changed, not wrapped
+        :rtype: list[dict]
+        """
+        self.polls += 1
+        doc = self._games.get(game_id)
+        if doc is None:
+            plays = await self._fetch(game_id)
+        else:
+            diffs = await self._api.live_feed_diff(game_id, doc["metaData"]["timeStamp"])
+            before = len(_plays(doc))
+            indices, appended = set(), False
+            try:
+                # A lazy client decodes the diffs here, a body that is not a list is handled like a bad patch.
+                for diff in getattr(diffs, "_nhlapi_inner_", diffs):
+                    ops = diff["diff"]
+                    apply_patch(doc, ops)
+                    self.patches += 1
+                    changed, added = _changed_plays(ops)
+                    if changed is None:
+                        indices = None
+                    elif indices is not None:
+                        indices.update(changed)
+                    appended = appended or added
+            except (PatchError, KeyError, TypeError):
+                plays = await self._fetch(game_id)
+            else:
+                all_plays = _plays(doc)
+                if indices is None:
+                    plays = list(all_plays)
+                else:
+                    if appended:
+                        indices.update(range(before, len(all_plays)))
+                    plays = [all_plays[index] for index in sorted(indices) if index < len(all_plays)]
+        await self._notify(game_id, plays)
+        return plays
+
+    def _final(self, game_id):
+        doc = self._games.get(game_id)
+        return doc is not None and doc.get("gameData", {}).get("status", {}).get("abstractGameState") == "Final"
+
+    def _wait(self):
+        if self._interval is not None:
+            return self._interval
+        waits = [doc.get("metaData", {}).get("wait") for doc in self._games.values() if doc is not None]
+        waits = [wait for wait in waits if wait]
+        return min(waits) if waits else 10
+
+    async def run(self):
+        """
+        Poll every game concurrently until they are all final or :meth:`stop` is called.
+        """
+        self._stopped = False
+        while self._games and not self._stopped:
+            game_ids = list(self._games)
+            results = await asyncio.gather(*[self.poll(game_id) for game_id in game_ids], return_exceptions=True)
+            for game_id, result in zip(game_ids, results):
+                if isinstance(result, Exception):
+                    self.errors[game_id] = result
+                    continue
+                self.errors.pop(game_id, None)
+                if self._final(game_id):
+                    self.remove(game_id)
+            if self._games and not self._stopped:
+                await asyncio.sleep(self._wait())
+
+    def stop(self):
+        """
+        Stop :meth:`run` after the current round of polls.
+        """
+        self._stopped = True
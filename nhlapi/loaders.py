@@ -0,0 +1,87 @@
+import asyncio
+
+from .utils import to_url_param
+
+
+class TeamLoader:
+    """
+    Batch the team lookups made during the same event loop tick into a single :meth:`nhlapi.endpoints.NHLAPI.teams`
+    request. It only works with :class:`nhlapi.clients.AsyncClient`::
+
+        loader = TeamLoader(api)
+        habs, leafs = await asyncio.gather(loader.load(8), loader.load(10))
+
+    Lookups are grouped by their `expand` and `stats` parameters, each group sends one request with the union of
+    the ids and every caller gets its own team from the `teams` array.
+
+    :param api: the API, using an asynchronous client
+    :param int max_batch: maximum number of ids sent in one request, `None` means no limit
+    :type api: nhlapi.endpoints.NHLAPI
+    """
+
+    def __init__(self, api, *, max_batch=None):
+        if max_batch is not None and max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+        self._api = api
+        self._max_batch = max_batch
+        self._pending = {}
+        self.requests = 0
+
+    def load(self, id, *, expand=None, stats=None):
+        """
+        Get information about a team. The lookup is sent with the others made during the same event loop tick.
+
+        :param int id: team id
+        :param expand: expanded information, see API docs
+        :param stats: type of stats to show, see API docs
+        :type expand: str or list[str]
+        :type stats: str or list[str]
+        :returns: a future giving the team, or raising :class:`KeyError` if the API does not know the team
+        :rtype: asyncio.Future
+        """
+        loop = asyncio.get_event_loop()
+        if not self._pending:
+            loop.call_soon(self._dispatch)
+        group = (expand and to_url_param(expand), stats and to_url_param(stats))
+        fut = loop.create_future()
+        self._pending.setdefault(group, {}).setdefault(id, []).append(fut)
+        return fut
+
+    def load_many(self, ids, *, expand=None, stats=None):
+        """
+        Get information about many teams, see :meth:`load`.
+
+        :param list[int] ids: team ids
+        :returns: a future giving the list of teams in the same order as `ids`
+        :rtype: asyncio.Future
+        """
+        return asyncio.gather(*[self.load(id, expand=expand, stats=stats) for id in ids])
+
+    def _dispatch(self):
+        pending, self._pending = self._pending, {}
+        for (expand, stats), waiters in pending.items():
+            ids = list(waiters)
+            size = self._max_batch or len(ids)
+            for start in range(0, len(ids), size):
+                batch = {id: waiters[id] for id in ids[start : start + size]}
+                asyncio.ensure_future(self._fetch(batch, expand, stats))
+
+    async def _fetch(self, batch, expand, stats):
+        self.requests += 1
+        try:
+            result = await self._api.teams(list(batch), expand=expand, stats=stats)
+        except Exception as exc:
+            for futs in batch.values():
+                for fut in futs:
+                    if not fut.done():
+                        fut.set_exception(exc)
+            return
+        teams = {team.id: team for team in result.teams}
+        for id, futs in batch.items():
+            for fut in futs:
+                if fut.done():
+                    continue
+                if id in teams:
+                    fut.set_result(teams[id])
+                else:
+                    fut.set_exception(KeyError(id))
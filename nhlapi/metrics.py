@@ -0,0 +1,251 @@
+import bisect
+import collections
+import re
+import threading
+from collections import namedtuple
+
+RequestMetrics = namedtuple(
+    "RequestMetrics",
+    ["endpoint", "url", "status", "bytes", "queue_wait", "ttfb", "download", "decode", "wrap", "total", "error"],
+)
+RequestMetrics.__doc__ = """
+What a client reports to its metrics sink for each HTTP request. Times are in seconds.
+
+:ivar str endpoint: path of the URL with its numeric segments replaced by `{}`, see :func:`endpoint_template`
+:ivar str url: the URL
+:ivar status: HTTP status, `None` if the request failed without a response
+:ivar int bytes: size of the body
+:ivar float queue_wait: time spent waiting for the rate limiter and the concurrency limit
+:ivar float ttfb: time from sending the request to receiving the headers of the response, including the connection
+:ivar float download: time spent reading the body
+:ivar float decode: time spent decoding the body, 0 for lazy clients which decode on first access
+:ivar float wrap: time spent wrapping the decoded body
+:ivar float total: time from the call to the decoded value, including the queue wait
+:ivar str error: name of the exception class when the request failed or its body could not be decoded, else `None`
+"""
+
+#: Default upper bounds of the buckets of :class:`Histogram`, in seconds.
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_NUMERIC_SEGMENT = re.compile(r"/[0-9]+(?=/|$)")
+
+PHASES = ("queue_wait", "ttfb", "download", "decode", "wrap", "total")
+
+
+def endpoint_template(url):
+    """
+    Get the template of the endpoint of a URL, its path with the numeric segments replaced by `{}`, such as
+    `/api/v1/game/{}/boxscore`. Metrics are grouped by template.
+
+    :param str url: the URL
+    :rtype: str
+    """
+    # Slicing the path out is about twice as fast as urlsplit, this runs for every request.
+    start = url.find("//")
+    start = 0 if start < 0 else url.find("/", start + 2)
+    if start < 0:
+        return "/"
+    end = len(url)
+    for sep in "?#":
+        index = url.find(sep, start)
+        if 0 <= index < end:
+            end = index
+    return _NUMERIC_SEGMENT.sub("/{}", url[start:end])
+
+
+class Histogram:
+    """
+    A histogram counting observations in buckets, like the histograms of Prometheus. Each bucket counts the values
+    lower than or equal to its upper bound, the last bucket has no bound.
+
+    :param buckets: sorted upper bounds of the buckets
+    """
+
+    __slots__ = ["bounds", "counts", "sum", "count"]
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.bounds = tuple(buckets)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        """
+        Count a value.
+
+        :param float value: the value
+        """
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """
+        Get the cumulative count of each bucket, as Prometheus exposes them.
+
+        :returns: `(upper_bound, count)` pairs, the last bound is `inf`
+        :rtype: list[tuple]
+        """
+        result = []
+        total = 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def quantile(self, q):
+        """
+        Estimate a quantile by linear interpolation inside its bucket, like `histogram_quantile` in Prometheus.
+
+        :param float q: the quantile, between 0 and 1
+        :returns: the estimate, `None` if nothing was observed. Quantiles falling in the last bucket are reported as
+            the highest bound.
+        :rtype: float or None
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        lower = 0.0
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            if count and seen + count >= rank:
+                return lower + (bound - lower) * (rank - seen) / count
+            seen += count
+            lower = bound
+        return self.bounds[-1] if self.bounds else None
+
+
+def _escape(val):
+    return str(val).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels):
+    return ",".join('{}="{}"'.format(key, _escape(labels[key])) for key in sorted(labels))
+
+
+class MetricsRecorder:
+    """
+    A metrics sink keeping everything in memory. Give it to a client with `metrics=` and look at what it recorded::
+
+        recorder = MetricsRecorder()
+        api = NHLAPI(AsyncClient(metrics=recorder))
+        ...
+        for endpoint, stats in recorder.summary().items():
+            print(endpoint, stats["count"], stats["p99"])
+
+    It keeps a :class:`Histogram` of every phase of the requests of each endpoint, see :class:`RequestMetrics`, along
+    with the counts of each status and the bytes received. :meth:`exposition` writes them in the text format of
+    Prometheus. Recording takes a lock and a few list updates, so it can stay on in production.
+
+    :param buckets: upper bounds of the buckets of the histograms, in seconds
+    :param int keep: number of the last :class:`RequestMetrics` kept in :attr:`recent`
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, keep=0):
+        self._buckets = tuple(buckets)
+        self._histograms = {}
+        self._statuses = collections.Counter()
+        self._bytes = collections.Counter()
+        self._lock = threading.Lock()
+        self.recent = collections.deque(maxlen=keep)
+
+    def record(self, metrics):
+        """
+        Record the metrics of a request, the clients call this.
+
+        :param RequestMetrics metrics: the metrics
+        """
+        with self._lock:
+            histograms = self._histograms.get(metrics.endpoint)
+            if histograms is None:
+                histograms = self._histograms[metrics.endpoint] = [Histogram(self._buckets) for _ in PHASES]
+            for histogram, value in zip(histograms, metrics[4:10]):
+                histogram.observe(value)
+            # A body that failed to decode has a status, it's counted as a failure all the same.
+            self._statuses[metrics.endpoint, metrics.error or metrics.status] += 1
+            self._bytes[metrics.endpoint] += metrics.bytes
+            if self.recent.maxlen:
+                self.recent.append(metrics)
+
+    def endpoints(self):
+        """
+        Get the endpoints seen so far.
+
+        :rtype: list[str]
+        """
+        with self._lock:
+            return sorted(self._histograms)
+
+    def histogram(self, endpoint, phase="total"):
+        """
+        Get the histogram of a phase of the requests of an endpoint.
+
+        :param str endpoint: endpoint template
+        :param str phase: one of `queue_wait`, `ttfb`, `download`, `decode`, `wrap` and `total`
+        :raises: :class:`KeyError` if nothing was recorded for the endpoint
+        :rtype: Histogram
+        """
+        return self._histograms[endpoint][PHASES.index(phase)]
+
+    def statuses(self, endpoint):
+        """
+        Count the responses of an endpoint by status. Failed requests, including the responses whose body could not
+        be decoded, are counted by the name of their exception.
+
+        :param str endpoint: endpoint template
+        :rtype: dict
+        """
+        with self._lock:
+            return {status: count for (name, status), count in self._statuses.items() if name == endpoint}
+
+    def summary(self):
+        """
+        Summarize the requests of each endpoint: their count, the bytes received and estimates of the median, 90th
+        and 99th percentiles of their total time.
+
+        :returns: a dict of dicts with the `count`, `bytes`, `p50`, `p90` and `p99` keys, by endpoint
+        :rtype: dict
+        """
+        result = {}
+        with self._lock:
+            for endpoint, histograms in self._histograms.items():
+                total = histograms[PHASES.index("total")]
+                result[endpoint] = {
+                    "count": total.count,
+                    "bytes": self._bytes[endpoint],
+                    "p50": total.quantile(0.5),
+                    "p90": total.quantile(0.9),
+                    "p99": total.quantile(0.99),
+                }
+        return result
+
+    def exposition(self, prefix="nhlapi"):
+        """
+        Write the metrics in the text exposition format of Prometheus.
+
+        :param str prefix: prefix of the metric names
+        :rtype: str
+        """
+        lines = ["# TYPE {}_request_seconds histogram".format(prefix)]
+        with self._lock:
+            for endpoint, histograms in sorted(self._histograms.items()):
+                for phase, histogram in zip(PHASES, histograms):
+                    for bound, count in histogram.cumulative():
+                        le = "+Inf" if bound == float("inf") else repr(bound)
+                        lines.append(
+                            "{}_request_seconds_bucket{{{}}} {}".format(
+                                prefix, _labels(endpoint=endpoint, phase=phase, le=le), count
+                            )
+                        )
+                    labels = _labels(endpoint=endpoint, phase=phase)
+                    lines.append("{}_request_seconds_sum{{{}}} {!r}".format(prefix, labels, histogram.sum))
+                    lines.append("{}_request_seconds_count{{{}}} {}".format(prefix, labels, histogram.count))
+            lines.append("# TYPE {}_responses_total counter".format(prefix))
+            for (endpoint, status), count in sorted(self._statuses.items(), key=lambda item: str(item[0])):
+                lines.append(
+                    "{}_responses_total{{{}}} {}".format(prefix, _labels(endpoint=endpoint, status=status), count)
+                )
+            lines.append("# TYPE {}_response_bytes_total counter".format(prefix))
+            for endpoint, count in sorted(self._bytes.items()):
+                lines.append("{}_response_bytes_total{{{}}} {}".format(prefix, _labels(endpoint=endpoint), count))
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,264 @@
+from .utils import GameId, Season, TimeOnIce
+
+
+class Model:
+    """
+    Base class of the models. The `from_json` class method of every model is generated from its list of fields.
+    """
+
+    __slots__ = ()
+    _fields_ = ()
+
+    @classmethod
+    def from_json(cls, data):
+        """
+        Build the model from a JSON document.
+
+        :param data: A dictionary/mapping compatible with this function.
+        :type data: :class:`nhlapi.props.PropDict` or :class:`collections.abc.Mapping`
+        """
+        raise NotImplementedError
+
+    def __repr__(self):
+        return "{}({})".format(
+            type(self).__name__, ", ".join("{}={!r}".format(attr, getattr(self, attr)) for attr in self.__slots__)
+        )
+
+    def __eq__(self, other):
+        if type(self) is not type(other):
+            return NotImplemented
+        return all(getattr(self, attr) == getattr(other, attr) for attr in self.__slots__)
+
+
+def _list_of(model):
+    return lambda val: [model.from_json(item) for item in val]
+
+
+def _values_of(model):
+    return lambda val: [model.from_json(item) for item in val.values()]
+
+
+def _model(name, fields, doc):
+    """
+    Generate a model class. Each field is a `(attribute, path, converter)` tuple where the path is made of dotted keys
+    and the converter is applied to the value when it's not `None`.
+    """
+    env = {}
+    lines = [
+        "def from_json(cls, data):",
+        "    data = getattr(data, '_nhlapi_inner_', data)",
+        "    self = cls.__new__(cls)",
+    ]
+    for index, (attr, path, converter) in enumerate(fields):
+        keys = path.split(".")
+        lines.append("    val = data.get({!r})".format(keys[0]))
+        for key in keys[1:]:
+            lines.append("    if val is not None: val = val.get({!r})".format(key))
+        if converter is not None:
+            env["_convert{}".format(index)] = converter
+            lines.append("    if val is not None: val = _convert{}(val)".format(index))
+        lines.append("    self.{} = val".format(attr))
+    lines.append("    return self")
+    exec("\n".join(lines), env)
+
+    namespace = {
+        "__slots__": tuple(attr for attr, _, _ in fields),
+        "__doc__": doc,
+        "_fields_": tuple(fields),
+        "from_json": classmethod(env["from_json"]),
+    }
+    return type(name, (Model,), namespace)
+
+
+TeamRef = _model("TeamRef", [("id", "id", None), ("name", "name", None), ("link", "link", None)], "A team reference.")
+
+Person = _model(
+    "Person", [("id", "id", None), ("full_name", "fullName", None), ("link", "link", None)], "A person reference."
+)
+
+Position = _model(
+    "Position",
+    [("code", "code", None), ("name", "name", None), ("type", "type", None), ("abbreviation", "abbreviation", None)],
+    "A player position.",
+)
+
+SkaterStats = _model(
+    "SkaterStats",
+    [
+        ("time_on_ice", "timeOnIce", TimeOnIce.fromstr),
+        ("goals", "goals", None),
+        ("assists", "assists", None),
+        ("shots", "shots", None),
+        ("hits", "hits", None),
+        ("blocked", "blocked", None),
+        ("plus_minus", "plusMinus", None),
+        ("penalty_minutes", "penaltyMinutes", None),
+        ("power_play_goals", "powerPlayGoals", None),
+        ("faceoff_wins", "faceOffWins", None),
+        ("faceoff_taken", "faceoffTaken", None),
+        ("takeaways", "takeaways", None),
+        ("giveaways", "giveaways", None),
+        ("even_time_on_ice", "evenTimeOnIce", TimeOnIce.fromstr),
+        ("power_play_time_on_ice", "powerPlayTimeOnIce", TimeOnIce.fromstr),
+        ("short_handed_time_on_ice", "shortHandedTimeOnIce", TimeOnIce.fromstr),
+    ],
+    "Stats of a skater in a boxscore.",
+)
+
+GoalieStats = _model(
+    "GoalieStats",
+    [
+        ("time_on_ice", "timeOnIce", TimeOnIce.fromstr),
+        ("shots", "shots", None),
+        ("saves", "saves", None),
+        ("power_play_saves", "powerPlaySaves", None),
+        ("decision", "decision", None),
+    ],
+    "Stats of a goalie in a boxscore.",
+)
+
+BoxscorePlayer = _model(
+    "BoxscorePlayer",
+    [
+        ("person", "person", Person.from_json),
+        ("jersey_number", "jerseyNumber", None),
+        ("position", "position", Position.from_json),
+        ("skater_stats", "stats.skaterStats", SkaterStats.from_json),
+        ("goalie_stats", "stats.goalieStats", GoalieStats.from_json),
+    ],
+    "A player in a boxscore, only one of `skater_stats` and `goalie_stats` is set if the player played.",
+)
+
+BoxscoreTeam = _model(
+    "BoxscoreTeam",
+    [
+        ("team", "team", TeamRef.from_json),
+        ("goals", "teamStats.teamSkaterStats.goals", None),
+        ("shots", "teamStats.teamSkaterStats.shots", None),
+        ("pim", "teamStats.teamSkaterStats.pim", None),
+        ("players", "players", _values_of(BoxscorePlayer)),
+        ("goalies", "goalies", None),
+        ("skaters", "skaters", None),
+        ("scratches", "scratches", None),
+    ],
+    "A team in a boxscore.",
+)
+
+Boxscore = _model(
+    "Boxscore",
+    [("home", "teams.home", BoxscoreTeam.from_json), ("away", "teams.away", BoxscoreTeam.from_json)],
+    "Response of :meth:`nhlapi.endpoints.NHLAPI.boxscore`.",
+)
+
+ScheduleTeam = _model(
+    "ScheduleTeam",
+    [
+        ("team", "team", TeamRef.from_json),
+        ("score", "score", None),
+        ("wins", "leagueRecord.wins", None),
+        ("losses", "leagueRecord.losses", None),
+        ("ot", "leagueRecord.ot", None),
+    ],
+    "A team in a scheduled game.",
+)
+
+ScheduleGame = _model(
+    "ScheduleGame",
+    [
+        ("game_id", "gamePk", GameId.fromint),
+        ("season", "season", Season.fromstr),
+        ("game_date", "gameDate", None),
+        ("state", "status.abstractGameState", None),
+        ("detailed_state", "status.detailedState", None),
+        ("home", "teams.home", ScheduleTeam.from_json),
+        ("away", "teams.away", ScheduleTeam.from_json),
+        ("venue", "venue.name", None),
+    ],
+    "A game of the schedule.",
+)
+
+ScheduleDate = _model(
+    "ScheduleDate", [("date", "date", None), ("games", "games", _list_of(ScheduleGame))], "A day of the schedule."
+)
+
+Schedule = _model(
+    "Schedule",
+    [("total_games", "totalGames", None), ("dates", "dates", _list_of(ScheduleDate))],
+    "Response of :meth:`nhlapi.endpoints.NHLAPI.schedule`.",
+)
+
+TeamRecord = _model(
+    "TeamRecord",
+    [
+        ("team", "team", TeamRef.from_json),
+        ("wins", "leagueRecord.wins", None),
+        ("losses", "leagueRecord.losses", None),
+        ("ot", "leagueRecord.ot", None),
+        ("points", "points", None),
+        ("games_played", "gamesPlayed", None),
+        ("goals_scored", "goalsScored", None),
+        ("goals_against", "goalsAgainst", None),
+        ("row", "row", None),
+        ("league_rank", "leagueRank", int),
+        ("division_rank", "divisionRank", int),
+        ("streak", "streak.streakCode", None),
+    ],
+    "The record of a team in the standings.",
+)
+
+StandingsRecord = _model(
+    "StandingsRecord",
+    [("standings_type", "standingsType", None), ("team_records", "teamRecords", _list_of(TeamRecord))],
+    "A group of the standings.",
+)
+
+Standings = _model(
+    "Standings",
+    [("records", "records", _list_of(StandingsRecord))],
+    "Response of :meth:`nhlapi.endpoints.NHLAPI.standings`.",
+)
+
+Team = _model(
+    "Team",
+    [
+        ("id", "id", None),
+        ("name", "name", None),
+        ("abbreviation", "abbreviation", None),
+        ("team_name", "teamName", None),
+        ("location_name", "locationName", None),
+        ("venue", "venue.name", None),
+        ("division", "division.name", None),
+        ("conference", "conference.name", None),
+        ("first_year_of_play", "firstYearOfPlay", int),
+        ("active", "active", None),
+        ("roster", "roster.roster", _list_of(BoxscorePlayer)),
+    ],
+    "A team, its roster is set when it's expanded with `team.roster`.",
+)
+
+Teams = _model("Teams", [("teams", "teams", _list_of(Team))], "Response of :meth:`nhlapi.endpoints.NHLAPI.teams`.")
+
+PersonDetail = _model(
+    "PersonDetail",
+    [
+        ("id", "id", None),
+        ("full_name", "fullName", None),
+        ("first_name", "firstName", None),
+        ("last_name", "lastName", None),
+        ("primary_number", "primaryNumber", None),
+        ("birth_date", "birthDate", None),
+        ("nationality", "nationality", None),
+        ("height", "height", None),
+        ("weight", "weight", None),
+        ("active", "active", None),
+        ("rookie", "rookie", None),
+        ("shoots_catches", "shootsCatches", None),
+        ("current_team", "currentTeam", TeamRef.from_json),
+        ("primary_position", "primaryPosition", Position.from_json),
+    ],
+    "A player.",
+)
+
+People = _model(
+    "People", [("people", "people", _list_of(PersonDetail))], "Response of :meth:`nhlapi.endpoints.NHLAPI.people`."
+)
@@ -0,0 +1,249 @@
+from array import array
+from collections import OrderedDict
+
+from .utils import parse_toi
+
+_NO_ID = -(2 ** 63)
+_NAN = float("nan")
+
+# Name and type code of each column, category columns hold the index of their label, -1 when missing.
+SCHEMA = OrderedDict(
+    [
+        ("game_pk", "q"),
+        ("event_idx", "q"),
+        ("event", "h"),
+        ("secondary_type", "h"),
+        ("strength", "h"),
+        ("period", "b"),
+        ("period_type", "h"),
+        ("period_time", "l"),
+        ("period_time_remaining", "l"),
+        ("x", "d"),
+        ("y", "d"),
+        ("team_id", "q"),
+        ("player1_id", "q"),
+        ("player1_type", "h"),
+        ("player2_id", "q"),
+        ("player2_type", "h"),
+        ("away_goals", "h"),
+        ("home_goals", "h"),
+    ]
+)
+
+CATEGORIES = ("event", "secondary_type", "strength", "period_type", "player1_type", "player2_type")
+
+
+class PlayTable:
+    """
+    A table of the plays of many games, with a fixed set of columns stored in :class:`array.array` objects. Games are
+    appended with :meth:`append`, which grows the columns in place without copying the table::
+
+        table = PlayTable()
+        for game_pk, feed in feeds:
+            table.append(feed)
+        shots = [i for i, code in enumerate(table["event"]) if table.labels("event")[code] == "SHOT"]
+
+    The columns are:
+
+    * `game_pk`, `event_idx`: ids of the game and of the play in the game,
+    * `event`, `secondary_type`, `strength`: `result.eventTypeId`, `result.secondaryType` and
+      `result.strength.code` of the play,
+    * `period`, `period_type`: `about.period` and `about.periodType`,
+    * `period_time`, `period_time_remaining`: the clocks of the period in seconds, parsed like
+      :class:`nhlapi.utils.TimeOnIce`,
+    * `x`, `y`: the coordinates of the play on the ice,
+    * `team_id`: the team of the play,
+    * `player1_id`, `player1_type`, `player2_id`, `player2_type`: the first two players of the play and their role,
+      such as `Shooter` and `Goalie`,
+    * `away_goals`, `home_goals`: the score after the play.
+
+    The category columns hold the index of their label in :meth:`labels`, or -1 when it's missing. Missing ids are
+    the smallest 64 bit integer, missing coordinates are NaN and missing numbers are -1.
+    """
+
+    def __init__(self):
+        self._columns = OrderedDict((name, array(typecode)) for name, typecode in SCHEMA.items())
+        self._labels = {name: [] for name in CATEGORIES}
+        self._codes = {name: {} for name in CATEGORIES}
+
+    def __len__(self):
+        return len(self._columns["game_pk"])
+
+    def __getitem__(self, name):
+        return self._columns[name]
+
+    @property
+    def columns(self):
+        """
+        The columns of the table, by name.
+
+        :rtype: collections.OrderedDict
+        """
+        return self._columns
+
+    def labels(self, name):
+        """
+        Get the labels of a category column, the column holds indices into this list.
+
+        :param str name: name of the column
+        :rtype: list[str]
+        """
+        return self._labels[name]
+
+    def decode(self, name):
+        """
+        Get the labels of every row of a category column, `None` where it's missing.
+
+        :param str name: name of the column
+        :rtype: list[str]
+        """
+        labels = self._labels[name] + [None]
+        return [labels[code] for code in self._columns[name]]
+
+    def _coder(self):
+        """
+        Get a function coding the labels of a game, and the labels it saw for the first time by category. The new
+        labels are only added to the table by :meth:`append` once the game was converted.
+        """
+        known = self._codes
+        added = {name: {} for name in CATEGORIES}
+
+        def code(name, label):
+            if label is None:
+                return -1
+            found = known[name].get(label)
+            if found is None:
+                new = added[name]
+                found = new.get(label)
+                if found is None:
+                    found = new[label] = len(known[name]) + len(new)
+            return found
+
+        return code, added
+
+    def append(self, feed):
+        """
+        Append the plays of a game.
+
+        :param feed: response of :meth:`nhlapi.endpoints.NHLAPI.live_feed`, or the document of a
+            :class:`nhlapi.live.LivePoller`
+        :returns: number of plays appended
+        :rtype: int
+        """
+        feed = getattr(feed, "_nhlapi_inner_", feed)
+        game_pk = feed.get("gamePk", _NO_ID)
+        plays = feed.get("liveData", {}).get("plays", {}).get("allPlays", ())
+        rows = {name: [] for name in SCHEMA}
+        code, added = self._coder()
+        times = rows["period_time"]
+        remaining = rows["period_time_remaining"]
+        # Bind the appends of the columns once, this loop runs for every play of every game.
+        (
+            event_idx,
+            event,
+            secondary_type,
+            strength,
+            period,
+            period_type,
+            x,
+            y,
+            team_id,
+            player1_id,
+            player1_type,
+            player2_id,
+            player2_type,
+            away_goals,
+            home_goals,
+        ) = [
+            rows[name].append
+            for name in (
+                "event_idx",
+                "event",
+                "secondary_type",
+                "strength",
+                "period",
+                "period_type",
+                "x",
+                "y",
+                "team_id",
+                "player1_id",
+                "player1_type",
+                "player2_id",
+                "player2_type",
+                "away_goals",
+                "home_goals",
+            )
+        ]
+        empty = {}
+
+        for play in plays:
+            about = play.get("about", empty)
+            result = play.get("result", empty)
+            coords = play.get("coordinates", empty)
+            players = play.get("players", ())
+            goals = about.get("goals", empty)
+            event_idx(about.get("eventIdx", -1))
+            event(code("event", result.get("eventTypeId")))
+            secondary_type(code("secondary_type", result.get("secondaryType")))
+            strength(code("strength", result.get("strength", empty).get("code")))
+            period(about.get("period", -1))
+            period_type(code("period_type", about.get("periodType")))
+            times.append(about.get("periodTime"))
+            remaining.append(about.get("periodTimeRemaining"))
+            x(coords.get("x", _NAN))
+            y(coords.get("y", _NAN))
+            team_id(play.get("team", empty).get("id", _NO_ID))
+            if players:
+                player1_id(players[0].get("player", empty).get("id", _NO_ID))
+                player1_type(code("player1_type", players[0].get("playerType")))
+            else:
+                player1_id(_NO_ID)
+                player1_type(-1)
+            if len(players) > 1:
+                player2_id(players[1].get("player", empty).get("id", _NO_ID))
+                player2_type(code("player2_type", players[1].get("playerType")))
+            else:
+                player2_id(_NO_ID)
+                player2_type(-1)
+            away_goals(goals.get("away", -1))
+            home_goals(goals.get("home", -1))
+
+        count = len(times)
+        rows["game_pk"] = [game_pk] * count
+        rows["period_time"] = parse_toi(times, missing=-1)
+        rows["period_time_remaining"] = parse_toi(remaining, missing=-1)
+        # Convert every row before touching the columns, so that a bad game leaves the table as it was.
+        converted = {}
+        for name, typecode in SCHEMA.items():
+            try:
+                converted[name] = array(typecode, rows[name])
+            except (TypeError, OverflowError):
+                raise TypeError("values of column {!r} do not fit in type {!r}".format(name, typecode))
+        for name, column in self._columns.items():
+            column.extend(converted[name])
+        for name, new in added.items():
+            self._codes[name].update(new)
+            self._labels[name].extend(sorted(new, key=new.get))
+        return count
+
+    def extend(self, feeds):
+        """
+        Append the plays of many games, see :meth:`append`.
+
+        :returns: number of plays appended
+        :rtype: int
+        """
+        return sum(self.append(feed) for feed in feeds)
+
+    def to_numpy(self):
+        """
+        Copy the table into NumPy arrays, one per column.
+
+        :raises: :class:`ImportError` if NumPy is not installed
+        :rtype: :class:`collections.OrderedDict` of :class:`numpy.ndarray`
+        """
+        import numpy as np
+
+        return OrderedDict(
+            (name, np.array(column, dtype=np.dtype(column.typecode))) for name, column in self._columns.items()
+        )
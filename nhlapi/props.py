@@ -1,5 +1,11 @@
+import io
 import json
+import math
+import re
+import sys
+from array import array
 from collections import OrderedDict
+from functools import lru_cache
 
 
 class PropDict:
@@ -67,21 +73,186 @@ class PropList:
         return repr(self._nhlapi_inner_)
 
 
-_mapping_types = (dict, OrderedDict)
+class CachedPropDict(PropDict):
+    """
+    A :class:`PropDict` that keeps the wrappers of its children, so that accessing the same item twice returns the
+    same object instead of wrapping it again. This trades some memory for faster repeated access. The wrappers are
+    created lazily and the underlying mapping should not be modified once they are. Use :func:`wrap` with
+    `cached=True` to create it.
+    """
+
+    __slots__ = ["_nhlapi_cache_"]
+
+    def __init__(self, inner):
+        self._nhlapi_inner_ = inner
+        self._nhlapi_cache_ = {}
+
+    def __getitem__(self, key):
+        val = self._nhlapi_cache_.get(key, _missing)
+        if val is _missing:
+            val = self._nhlapi_inner_[key]
+            if isinstance(val, _container_types):
+                val = self._nhlapi_cache_[key] = _wrap_cached(val)
+        return val
+
+    __getattr__ = __getitem__
+
+
+class CachedPropList(PropList):
+    """
+    A :class:`PropList` that keeps the wrappers of its items, see :class:`CachedPropDict`.
+    """
+
+    __slots__ = ["_nhlapi_cache_"]
+
+    def __init__(self, inner):
+        self._nhlapi_inner_ = inner
+        self._nhlapi_cache_ = None
+
+    def _items(self):
+        items = self._nhlapi_cache_
+        if items is None:
+            items = self._nhlapi_cache_ = [_wrap_cached(val) for val in self._nhlapi_inner_]
+        return items
+
+    def __iter__(self):
+        return iter(self._items())
+
+    def __reversed__(self):
+        return reversed(self._items())
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return _wrap_cached(self._nhlapi_inner_[index])
+        return self._items()[index]
+
+
+class LazyPropDict(PropDict):
+    """
+    A :class:`PropDict` created from the raw bytes of a JSON document, which is decoded the first time the dictionary
+    is accessed. :func:`json_dump` writes the raw bytes as they are, so passing the document along without looking
+    inside it costs no decoding at all. Use :func:`wrap_lazy` to create it.
+    """
+
+    __slots__ = ["_nhlapi_raw_", "_nhlapi_decoder_"]
+
+    def __init__(self, body, decoder=None):
+        self._nhlapi_raw_ = body
+        self._nhlapi_decoder_ = decoder or json_decode
+
+    def __getattr__(self, name):
+        # The inner slot stays empty until the first access, which ends up here.
+        if name == "_nhlapi_inner_":
+            return _decode_lazy(self, _mapping_types)
+        return wrap(self._nhlapi_inner_[name])
+
+    def __repr__(self):
+        return repr(self._nhlapi_inner_)
+
+
+class LazyPropList(PropList):
+    """
+    A :class:`PropList` created from the raw bytes of a JSON array, see :class:`LazyPropDict`. Use :func:`wrap_lazy`
+    to create it.
+    """
+
+    __slots__ = ["_nhlapi_raw_", "_nhlapi_decoder_"]
+
+    def __init__(self, body, decoder=None):
+        self._nhlapi_raw_ = body
+        self._nhlapi_decoder_ = decoder or json_decode
+
+    def __getattr__(self, name):
+        if name == "_nhlapi_inner_":
+            return _decode_lazy(self, _sequence_types)
+        raise AttributeError(name)
+
+    def __repr__(self):
+        return repr(self._nhlapi_inner_)
+
+
+def _decode_lazy(obj, types):
+    inner = obj._nhlapi_decoder_(obj._nhlapi_raw_)
+    if not isinstance(inner, types):
+        raise TypeError("cannot use {} on a JSON document of type {}".format(type(obj).__name__, type(inner)))
+    obj._nhlapi_inner_ = inner
+    return inner
+
+
+class Record:
+    """
+    A read-only mapping storing its values in a tuple and sharing its keys with the other records of the same shape.
+    It's created by :func:`compact` for lists of dictionaries having the same keys and behaves like a dictionary inside
+    :class:`PropDict` and the functions of this module.
+
+    It's not a :class:`collections.abc.Mapping` on purpose: the type checks of :func:`wrap` would go through the slow
+    path of abstract base classes for every value, compact or not.
+    """
+
+    __slots__ = ["_keys", "_values"]
+
+    def __init__(self, keys, values):
+        self._keys = keys
+        self._values = values
+
+    def __getitem__(self, key):
+        return self._values[self._keys[key]]
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __eq__(self, other):
+        if isinstance(other, (dict, OrderedDict, Record)):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+
+    __hash__ = None
+
+    def get(self, key, default=None):
+        index = self._keys.get(key)
+        return default if index is None else self._values[index]
+
+    def keys(self):
+        return self._keys.keys()
+
+    def values(self):
+        return self._values
+
+    def items(self):
+        return zip(self._keys, self._values)
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+_mapping_types = (dict, OrderedDict, Record)
 _sequence_types = (list, tuple)
+_container_types = _mapping_types + _sequence_types
+_missing = object()
 _get_types = (PropDict, PropList) + _mapping_types + _sequence_types
 
 
-def wrap(val):
+def wrap(val, cached=False):
     """
     This function will wrap the given value into a :class:`PropDict` if it's a mapping, into a :class:`PropList` if it's
     a sequence or return the value if it's of any other type. This is the best way of wrapping a JSON document so that
     it can be accessed via attributes.
 
+    If `cached` is `True`, the wrappers keep the wrappers of their children, see :class:`CachedPropDict`.
+
     :param val: Value to be wrapped if necessary
+    :param bool cached: keep the wrappers of the children
     :type val: :code:`mapping` or :code:`sequence` or any
     :rtype: :class:`PropDict` or :class:`PropList` or any
     """
+    if cached:
+        return _wrap_cached(val)
     if isinstance(val, _mapping_types):
         return PropDict(val)
     if isinstance(val, _sequence_types):
@@ -89,6 +260,32 @@ def wrap(val):
     return val
 
 
+def wrap_lazy(body, decoder=None):
+    """
+    Wrap the raw bytes of a JSON object into a :class:`LazyPropDict`, or of a JSON array into a :class:`LazyPropList`,
+    which decode them on first access. Any other document is decoded right away and returned as :func:`wrap` does.
+
+    :param bytes body: the raw JSON document
+    :param decoder: function decoding a JSON document from :class:`bytes`, :func:`json_decode` by default
+    :rtype: :class:`LazyPropDict` or :class:`LazyPropList` or any
+    """
+    # lstrip returns the body itself when there is no leading whitespace, which is the usual case.
+    start = body.lstrip()[:1]
+    if start == b"{" or start == "{":
+        return LazyPropDict(body, decoder)
+    if start == b"[" or start == "[":
+        return LazyPropList(body, decoder)
+    return wrap((decoder or json_decode)(body))
+
+
+def _wrap_cached(val):
+    if isinstance(val, _mapping_types):
+        return CachedPropDict(val)
+    if isinstance(val, _sequence_types):
+        return CachedPropList(val)
+    return val
+
+
 def get(obj, key, default=None):
     """
     This function behaves like :meth:`dict.get`. If the key or index is not
@@ -134,7 +331,10 @@ def values(obj):
     :type obj: :class:`PropDict` or :class:`collections.abc.Mapping`
     :return: iterator of values
     """
-    if isinstance(obj, PropDict):
+    if isinstance(obj, CachedPropDict):
+        for key in obj._nhlapi_inner_:
+            yield obj[key]
+    elif isinstance(obj, PropDict):
         for val in obj._nhlapi_inner_.values():
             yield wrap(val)
     elif isinstance(obj, _mapping_types):
@@ -151,7 +351,10 @@ def items(obj):
     :type obj: :class:`PropDict` or :class:`collections.abc.Mapping`
     :return: iterator of tuples, first element is key, second element is value
     """
-    if isinstance(obj, PropDict):
+    if isinstance(obj, CachedPropDict):
+        for key in obj._nhlapi_inner_:
+            yield key, obj[key]
+    elif isinstance(obj, PropDict):
         for key, val in obj._nhlapi_inner_.items():
             yield key, wrap(val)
     elif isinstance(obj, _mapping_types):
@@ -160,6 +363,41 @@ def items(obj):
         raise TypeError("cannot use items() on type " + str(type(obj)))
 
 
+try:
+    import orjson
+
+    def json_decode(body):
+        """
+        Decode a JSON document from :class:`bytes` or :class:`str`. This function uses `orjson` if it's installed and
+        falls back to :func:`json.loads` otherwise. The returned value is not wrapped.
+
+        :param body: the raw JSON document
+        :type body: bytes or str
+        """
+        return orjson.loads(body)
+
+
+except ImportError:
+
+    def json_decode(body):
+        """
+        Decode a JSON document from :class:`bytes` or :class:`str`. This function uses `orjson` if it's installed and
+        falls back to :func:`json.loads` otherwise. The returned value is not wrapped.
+
+        :param body: the raw JSON document
+        :type body: bytes or str
+        """
+        if isinstance(body, (bytes, bytearray, memoryview)):
+            body = bytes(body).decode("utf-8")
+        return json.loads(body)
+
+
+def _json_default(val):
+    if isinstance(val, Record):
+        return dict(val)
+    raise TypeError("Object of type {} is not JSON serializable".format(type(val).__name__))
+
+
 def json_dump(obj, fp=None, **kwargs):
     """
     This function will dump the given object as JSON. If `fp` is not `None`, this function will write to the
@@ -170,7 +408,20 @@ def json_dump(obj, fp=None, **kwargs):
     :param kwargs: Any other argument will be passed on to :func:`json.dump` or :func:`json.dumps`.
     :type obj: :class:`PropDict` or :class:`PropList` or `any`
     :returns: If `fp` is provided, this function returns `None`. Otherwise it returns a :class:`str`.
+
+    A :class:`LazyPropDict` or :class:`LazyPropList` dumped without `kwargs` is written as the raw bytes it was created
+    from, without decoding and encoding it again. They are written as :class:`bytes` if `fp` is not a text file.
     """
+    if isinstance(obj, (LazyPropDict, LazyPropList)) and not kwargs:
+        body = obj._nhlapi_raw_
+        if fp is None:
+            return body.decode("utf-8") if isinstance(body, bytes) else body
+        if isinstance(fp, io.TextIOBase) and isinstance(body, bytes):
+            body = body.decode("utf-8")
+        fp.write(body)
+        return None
+
+    kwargs.setdefault("default", _json_default)
 
     def dump(val):
         if fp is not None:
@@ -182,3 +433,326 @@ def json_dump(obj, fp=None, **kwargs):
         return dump(obj._nhlapi_inner_)
     else:
         return dump(obj)
+
+
+_path_token = re.compile(r'\.?([^.\[\]*]+)|\[(-?\d+)\]|\["([^"]*)"\]|\.?\*|\[\*\]')
+_wildcard = object()
+
+
+def _parse_path(path):
+    steps = []
+    pos = 0
+    while pos < len(path):
+        match = _path_token.match(path, pos)
+        dotted = path[pos] == "."
+        if match is None or (dotted and pos == 0) or (not dotted and pos > 0 and path[pos] != "["):
+            raise ValueError("invalid path {!r} at position {}".format(path, pos))
+        key, index, quoted = match.groups()
+        if key is not None:
+            steps.append(key)
+        elif index is not None:
+            steps.append(int(index))
+        elif quoted is not None:
+            steps.append(quoted)
+        else:
+            steps.append(_wildcard)
+        pos = match.end()
+    return steps
+
+
+def compile_path(path, default=None):
+    """
+    Compile a path into a function that extracts the value it points to from a JSON document. The function works
+    directly on the underlying dictionaries and lists and does not create any :class:`PropDict` or :class:`PropList`,
+    so the values it returns are not wrapped.
+
+    A path is made of dotted keys, indexes between brackets and wildcards. Keys containing dots or brackets can be
+    quoted between brackets.
+
+    .. code-block:: python3
+
+        name = compile_path("teams[0].venue.name")
+        name(api.teams())  # 'Prudential Center'
+
+        names = compile_path("teams[*].venue.name")
+        names(api.teams())  # ['Prudential Center', 'Barclays Center', ...]
+
+        goals = compile_path('teams.home.players.*.stats.skaterStats.goals', default=0)
+
+    A wildcard `*` or `[*]` goes through every item of a list or every value of a dictionary. If the path contains
+    wildcards the function returns a flat list of the values. A missing key or index gives `default` when it's after
+    the last wildcard, and no value at all when it's before.
+
+    :param str path: the path
+    :param default: value returned when the path does not exist, like :func:`get`
+    :raises: :class:`ValueError` if the path is invalid
+    :rtype: function
+    """
+    segments = [[]]
+    for step in _parse_path(path):
+        if step is _wildcard:
+            segments.append([])
+        else:
+            segments[-1].append(step)
+    segments = [tuple(segment) for segment in segments]
+
+    if len(segments) == 1:
+        steps = segments[0]
+
+        def extract(obj):
+            val = getattr(obj, "_nhlapi_inner_", obj)
+            try:
+                for step in steps:
+                    val = val[step]
+            except (KeyError, IndexError, TypeError):
+                return default
+            return val
+
+        return extract
+
+    last = len(segments) - 1
+
+    def expand(val, level, out):
+        try:
+            for step in segments[level]:
+                val = val[step]
+        except (KeyError, IndexError, TypeError):
+            if level == last:
+                out.append(default)
+            return
+        if level == last:
+            out.append(val)
+            return
+        if isinstance(val, _mapping_types):
+            val = val.values()
+        elif not isinstance(val, _sequence_types):
+            return
+        for item in val:
+            expand(item, level + 1, out)
+
+    def extract_all(obj):
+        out = []
+        expand(getattr(obj, "_nhlapi_inner_", obj), 0, out)
+        return out
+
+    return extract_all
+
+
+@lru_cache(maxsize=256)
+def _compile_path_cached(path, default):
+    return compile_path(path, default)
+
+
+def extract(obj, path, default=None):
+    """
+    Extract the value at the given path of the object, see :func:`compile_path`. The most recently used paths are kept
+    compiled, but :func:`compile_path` is faster when the same path is applied to many objects.
+
+    :param obj: A list/sequence or dictionary/mapping compatible with this function.
+    :param str path: the path
+    :param default: value returned when the path does not exist, it must be hashable
+    """
+    return _compile_path_cached(path, default)(obj)
+
+
+_missing_values = {"q": -(2 ** 63), "d": math.nan, "b": -1, "O": None}
+
+
+def _infer_typecode(values):
+    typecode = None
+    for val in values:
+        if isinstance(val, bool):
+            code = "b"
+        elif isinstance(val, int):
+            code = "q"
+        elif isinstance(val, float):
+            code = "d"
+        else:
+            return "O"
+        if typecode is None or typecode == code:
+            typecode = code
+        elif {typecode, code} == {"q", "d"}:
+            typecode = "d"
+        else:
+            return "O"
+    return typecode or "O"
+
+
+def to_columns(records, fields, *, types=None, missing=None, sample=100, numpy=False):
+    """
+    Extract fields from many records into columns. Each field is a path, see :func:`compile_path`, and gives one
+    column. The type of a column is worked out from the first `sample` records unless it's given in `types`:
+
+    * booleans give an :class:`array.array` of type `b`,
+    * integers give an :class:`array.array` of type `q`,
+    * floats, or integers mixed with floats, give an :class:`array.array` of type `d`,
+    * anything else gives a :class:`list`, type `O`.
+
+    Records where the field is missing get the value given in `missing`, or else the smallest 64 bit integer for `q`,
+    NaN for `d`, -1 for `b` and `None` for `O`.
+
+    .. code-block:: python3
+
+        players = values(box.teams.home.players)
+        columns = to_columns(players, {"id": "person.id", "goals": "stats.skaterStats.goals"})
+        sum(columns["goals"])
+
+    If `numpy` is `True`, a NumPy structured array is returned instead, with one field per column. Columns of type
+    `O` become unicode strings in NumPy, where missing values are empty strings.
+
+    :param records: A list/sequence of dictionaries/mappings, or an iterable of them.
+    :param fields: paths of the fields, or a mapping of column names to paths
+    :param dict types: type codes of the columns, by column name
+    :param dict missing: values of the missing fields, by column name
+    :param int sample: number of records used to work out the types of the columns
+    :param bool numpy: return a NumPy structured array
+    :type records: :class:`PropList` or iterable
+    :type fields: list[str] or dict
+    :raises: :class:`TypeError` if a value does not fit in the type of its column
+    :raises: :class:`ImportError` if `numpy` is `True` and NumPy is not installed
+    :rtype: :class:`collections.OrderedDict` of columns or :class:`numpy.ndarray`
+    """
+    if isinstance(fields, (dict, OrderedDict)):
+        fields = list(fields.items())
+    else:
+        fields = [(path, path) for path in fields]
+    types = types or {}
+    missing = missing or {}
+    records = [getattr(record, "_nhlapi_inner_", record) for record in getattr(records, "_nhlapi_inner_", records)]
+
+    columns = OrderedDict()
+    for name, path in fields:
+        extract = compile_path(path, default=_missing)
+        vals = [extract(record) for record in records]
+        typecode = types.get(name) or _infer_typecode(val for val in vals[:sample] if val is not _missing)
+        fill = missing.get(name, _missing_values[typecode])
+        vals = [fill if val is _missing else val for val in vals]
+        if typecode == "O":
+            columns[name] = vals
+        else:
+            try:
+                columns[name] = array(typecode, vals)
+            except (TypeError, OverflowError):
+                raise TypeError("values of field {!r} do not fit in type {!r}".format(name, typecode))
+
+    if numpy:
+        return _to_structured(columns)
+    return columns
+
+
+def _to_structured(columns):
+    import numpy as np
+
+    dtypes = []
+    for name, column in columns.items():
+        if isinstance(column, array):
+            dtypes.append((name, {"q": np.int64, "d": np.float64, "b": np.int8}[column.typecode]))
+        else:
+            column[:] = ["" if val is None else str(val) for val in column]
+            dtypes.append((name, "U{}".format(max((len(val) for val in column), default=1) or 1)))
+    length = len(next(iter(columns.values()), ()))
+    result = np.empty(length, dtype=dtypes)
+    for name, column in columns.items():
+        result[name] = column
+    return result
+
+
+def prune(obj, fields):
+    """
+    Keep only the given fields of a JSON document, like the `fields` parameter of the API does on the server. A key is
+    kept at any depth if it's one of the fields, along with the keys under it that are also fields. Lists are pruned
+    item by item.
+
+    .. code-block:: python3
+
+        prune(api.schedule(), ["dates", "games", "gamePk"])
+        # {"dates": [{"games": [{"gamePk": 2018020001}, ...]}, ...]}
+
+    :param obj: A list/sequence or dictionary/mapping compatible with this function.
+    :param fields: the fields to keep, as a list or a comma separated string
+    :type obj: :class:`PropDict` or :class:`PropList` or :class:`collections.abc.Mapping` or
+               :class:`collections.abc.Sequence`
+    :type fields: list[str] or str
+    :returns: a new document, wrapped if `obj` was wrapped
+    """
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    fields = frozenset(fields)
+
+    def walk(val):
+        if isinstance(val, _mapping_types):
+            return {key: walk(item) for key, item in val.items() if key in fields}
+        if isinstance(val, _sequence_types):
+            return [walk(item) for item in val]
+        return val
+
+    if isinstance(obj, (PropDict, PropList)):
+        return wrap(walk(obj._nhlapi_inner_))
+    return walk(obj)
+
+
+# Key tables shared by the records of every document compacted by this process.
+_key_tables = {}
+_key_tables_maxsize = 4096
+
+
+def _key_table(keys):
+    table = _key_tables.get(keys)
+    if table is None:
+        table = {key: index for index, key in enumerate(keys)}
+        if len(_key_tables) < _key_tables_maxsize:
+            _key_tables[keys] = table
+    return table
+
+
+def compact(obj, *, max_length=32, tables=False):
+    """
+    Build a copy of a JSON document that takes less memory. Keys and strings of at most `max_length` characters are
+    interned with :func:`sys.intern`, so the same names and small values are stored once for every document.
+
+    If `tables` is `True`, lists of two or more dictionaries with the same keys become lists of :class:`Record`, which
+    store their values in a tuple and share a table of keys. Access through :class:`PropDict`, :class:`PropList` and
+    the functions of this module behaves exactly the same. The records are read-only.
+
+    Run :code:`PYTHONPATH=. python benchmarks/bench_compact.py` to measure the memory saved on boxscores.
+
+    :param obj: A JSON document, wrapped or not.
+    :param int max_length: maximum length of the interned strings
+    :param bool tables: turn lists of dictionaries with the same keys into records
+    :returns: a new document, wrapped if `obj` was wrapped
+    """
+    intern = sys.intern
+
+    def walk(val):
+        if isinstance(val, str):
+            return intern(val) if len(val) <= max_length else val
+        if isinstance(val, _mapping_types):
+            return {intern(key): walk(item) for key, item in val.items()}
+        if isinstance(val, _sequence_types):
+            items = [walk(item) for item in val]
+            if tables and len(items) > 1 and all(type(item) is dict for item in items):
+                keys = tuple(items[0])
+                if all(tuple(item) == keys for item in items):
+                    table = _key_table(keys)
+                    return [Record(table, tuple(item.values())) for item in items]
+            return items
+        return val
+
+    if isinstance(obj, (PropDict, PropList)):
+        return wrap(walk(obj._nhlapi_inner_))
+    return walk(obj)
+
+
+def compact_decode(body, *, max_length=32, tables=False):
+    """
+    Decode a JSON document with :func:`json_decode` and make it compact with :func:`compact`. It can be given as the
+    `decoder` of the clients.
+
+    This trades speed for memory: walking the document to intern it makes decoding about 8 times slower than
+    :func:`json_decode` (7 to 8.5 times on the boxscores of `benchmarks/bench_compact.py`), for about a third less
+    memory. Use it for documents that are kept in memory, not for documents that are read once.
+
+    :param body: the raw JSON document
+    :type body: bytes or str
+    """
+    return compact(json_decode(body), max_length=max_length, tables=tables)
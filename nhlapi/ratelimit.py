@@ -0,0 +1,424 @@
+import asyncio
+import collections
+import enum
+import heapq
+import itertools
+import math
+import os
+import struct
+import threading
+import time
+
+
+class Priority(enum.IntEnum):
+    """
+    Priority classes of :class:`RateLimiter`, lower values are served first.
+    """
+
+    LIVE = 0
+    NORMAL = 1
+    BACKFILL = 2
+
+
+def _refill(state, now, rate, burst):
+    """
+    Take a token from the bucket `state`, a `[tokens, last, until]` list updated in place.
+
+    :returns: `0` if a token was taken, else how many seconds to wait before trying again
+    """
+    tokens, last, until = state
+    if now < until:
+        return until - now
+    tokens = min(burst, tokens + (now - last) * rate)
+    state[0], state[1] = tokens, now
+    if tokens >= 1:
+        state[0] = tokens - 1
+        return 0
+    return (1 - tokens) / rate
+
+
+def _pause(state, now, seconds):
+    # The bucket starts filling up again once the pause is over.
+    state[2] = max(state[2], now + seconds)
+    state[0], state[1] = 0.0, state[2]
+
+
+class _LocalBucket:
+    def __init__(self, rate, burst, clock):
+        self._rate = rate
+        self._burst = burst
+        self._clock = clock
+        self._state = [burst, clock(), 0.0]
+
+    def take(self):
+        return _refill(self._state, self._clock(), self._rate, self._burst)
+
+    def pause(self, seconds):
+        _pause(self._state, self._clock(), seconds)
+
+
+class _FileBucket:
+    """
+    A bucket kept in a small file, updated under an exclusive `flock` so that processes sharing the file share the
+    budget. The clock must be the same for every process, which is why it defaults to the UNIX time.
+    """
+
+    _format = struct.Struct("=ddd")
+
+    def __init__(self, path, rate, burst, clock):
+        self._path = path
+        self._rate = rate
+        self._burst = burst
+        self._clock = clock
+        self._fd = None
+        self._pid = None
+
+    def _update(self, func):
+        import fcntl
+
+        # File locks belong to the open file, a forked process must open the file again to get its own lock.
+        if self._fd is None or self._pid != os.getpid():
+            self._fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o644)
+            self._pid = os.getpid()
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            data = os.pread(self._fd, self._format.size, 0)
+            now = self._clock()
+            if len(data) == self._format.size:
+                state = list(self._format.unpack(data))
+            else:
+                state = [self._burst, now, 0.0]
+            result = func(state, now)
+            os.pwrite(self._fd, self._format.pack(*state), 0)
+            return result
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def take(self):
+        return self._update(lambda state, now: _refill(state, now, self._rate, self._burst))
+
+    def pause(self, seconds):
+        self._update(lambda state, now: _pause(state, now, seconds))
+
+    def close(self):
+        if self._fd is not None and self._pid == os.getpid():
+            os.close(self._fd)
+        self._fd = None
+
+
+class _Waiter:
+    __slots__ = ["priority", "seq", "wake"]
+
+    def __init__(self, priority, seq, wake):
+        self.priority = priority
+        self.seq = seq
+        self.wake = wake
+
+    def __lt__(self, other):
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class RateLimiter:
+    """
+    A token bucket pacing the requests of one or many clients. Tokens are added at `rate` per second, up to `burst`
+    tokens, and every request takes one. Give the limiter to :class:`nhlapi.clients.SyncClient` or
+    :class:`nhlapi.clients.AsyncClient` with the priority of their requests::
+
+        limiter = RateLimiter(10)
+        live = AsyncClient(limiter=limiter, priority=Priority.LIVE)
+        backfill = AsyncClient(limiter=limiter, priority=Priority.BACKFILL)
+
+    When requests are waiting, the next token goes to the one with the lowest :class:`Priority`, then to the oldest.
+    A limiter can be used by threads and event loops at the same time.
+
+    When `path` is given, the bucket is kept in that file and every limiter using the same file, in any process of
+    the host, shares the same budget. Priorities are only enforced between the requests of a single limiter. The
+    file is locked with :func:`fcntl.flock`, so this is not available on Windows.
+
+    When the server answers `429 Too Many Requests`, the clients call :meth:`pause` with its `Retry-After` so that
+    every request waits instead of making things worse.
+
+    :param float rate: tokens added per second
+    :param float burst: maximum number of tokens, `rate` by default and at least 1
+    :param str path: path of a file used to share the bucket between processes
+    :param clock: function returning the current time in seconds, :func:`time.monotonic` by default and
+        :func:`time.time` when `path` is given
+    :type burst: float or None
+    :type path: str or None
+    """
+
+    def __init__(self, rate, burst=None, *, path=None, clock=None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst is None:
+            burst = max(1.0, rate)
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        self.rate = rate
+        self.burst = burst
+        if path is None:
+            self._bucket = _LocalBucket(rate, burst, clock or time.monotonic)
+        else:
+            self._bucket = _FileBucket(path, rate, burst, clock or time.time)
+        self._lock = threading.Lock()
+        self._waiters = []
+        self._seq = itertools.count()
+
+    def _poll(self, waiter):
+        # Only the first waiter takes tokens, the others sleep until it wakes them up.
+        with self._lock:
+            if self._waiters[0] is not waiter:
+                return None
+            delay = self._bucket.take()
+            if delay == 0:
+                heapq.heappop(self._waiters)
+                if self._waiters:
+                    self._waiters[0].wake()
+            return delay
+
+    def _remove(self, waiter):
+        with self._lock:
+            if waiter not in self._waiters:
+                return
+            first = self._waiters[0] is waiter
+            self._waiters.remove(waiter)
+            heapq.heapify(self._waiters)
+            if first and self._waiters:
+                self._waiters[0].wake()
+
+    def _enqueue(self, priority, wake):
+        waiter = _Waiter(Priority(priority), next(self._seq), wake)
+        with self._lock:
+            heapq.heappush(self._waiters, waiter)
+        return waiter
+
+    def acquire(self, priority=Priority.NORMAL):
+        """
+        Block the current thread until a token is available.
+
+        :param priority: priority of the request
+        :type priority: Priority
+        """
+        event = threading.Event()
+        waiter = self._enqueue(priority, event.set)
+        try:
+            while True:
+                event.clear()
+                delay = self._poll(waiter)
+                if delay == 0:
+                    return
+                event.wait(delay)
+        except BaseException:
+            self._remove(waiter)
+            raise
+
+    async def acquire_async(self, priority=Priority.NORMAL):
+        """
+        Wait until a token is available.
+
+        :param priority: priority of the request
+        :type priority: Priority
+        """
+        loop = asyncio.get_event_loop()
+        event = asyncio.Event()
+        waiter = self._enqueue(priority, lambda: loop.call_soon_threadsafe(event.set))
+        try:
+            while True:
+                event.clear()
+                delay = self._poll(waiter)
+                if delay == 0:
+                    return
+                try:
+                    await asyncio.wait_for(event.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+        except BaseException:
+            self._remove(waiter)
+            raise
+
+    def pause(self, seconds):
+        """
+        Stop handing out tokens for the given number of seconds and empty the bucket.
+
+        :param float seconds: how long to pause
+        """
+        # The bucket is also updated by _poll, and the flock of a shared bucket does not exclude threads sharing its
+        # file descriptor: releasing it here would drop the lock of a thread in the middle of an update.
+        with self._lock:
+            self._bucket.pause(seconds)
+
+    @property
+    def waiting(self):
+        """
+        Number of requests waiting for a token.
+
+        :rtype: int
+        """
+        return len(self._waiters)
+
+    def close(self):
+        """
+        Close the file of a shared bucket.
+        """
+        if isinstance(self._bucket, _FileBucket):
+            self._bucket.close()
+
+
+class AdaptiveLimit:
+    """
+    A limit on the number of requests in flight that adapts to the server with additive increase and multiplicative
+    decrease (AIMD), like TCP congestion control. Give it to :class:`nhlapi.clients.AsyncClient`::
+
+        limit = AdaptiveLimit(initial=8, maximum=64)
+        api = NHLAPI(AsyncClient(limit=limit))
+
+    Every response that came back in time raises the limit by `increase / limit`, so about `increase` per round of
+    requests. A `429 Too Many Requests` or `5xx` response, a connection error or a response slower than the latency
+    target multiplies the limit by `decrease`, at most once per round trip so that a burst of failures only counts
+    once. The latency target is `latency_target` seconds if given, else `tolerance` times the fastest response among
+    the last `window` ones.
+
+    :attr:`current` tells the limit and :meth:`percentiles` the recent latencies.
+
+    :param int initial: initial limit
+    :param int minimum: lowest limit
+    :param int maximum: highest limit
+    :param float increase: how much the limit grows per round of successful requests
+    :param float decrease: factor applied to the limit on overload
+    :param float latency_target: latency in seconds above which the server is considered overloaded
+    :param float tolerance: latency target relative to the fastest recent response, without `latency_target`
+    :param int window: number of latencies kept
+    :param clock: function returning the current time in seconds
+    :type latency_target: float or None
+    """
+
+    def __init__(
+        self,
+        initial=8,
+        minimum=1,
+        maximum=64,
+        *,
+        increase=1.0,
+        decrease=0.5,
+        latency_target=None,
+        tolerance=3.0,
+        window=200,
+        clock=time.monotonic
+    ):
+        if not 1 <= minimum <= initial <= maximum:
+            raise ValueError("limits must satisfy 1 <= minimum <= initial <= maximum")
+        if not 0 < decrease < 1:
+            raise ValueError("decrease must be between 0 and 1")
+        self.minimum = minimum
+        self.maximum = maximum
+        self._increase = increase
+        self._decrease = decrease
+        self._latency_target = latency_target
+        self._tolerance = tolerance
+        self._latencies = collections.deque(maxlen=window)
+        self._clock = clock
+        self._limit = float(initial)
+        self._last_decrease = None
+        self._inflight = 0
+        self._waiters = collections.deque()
+        self.increases = 0
+        self.decreases = 0
+
+    @property
+    def current(self):
+        """
+        The current limit.
+
+        :rtype: int
+        """
+        return int(self._limit)
+
+    @property
+    def inflight(self):
+        """
+        Number of requests in flight.
+
+        :rtype: int
+        """
+        return self._inflight
+
+    def percentiles(self, percents=(50, 90, 99)):
+        """
+        Get percentiles of the recent latencies, by the nearest rank method.
+
+        :param percents: the percentiles wanted, between 0 and 100
+        :returns: a dict mapping each percentile to a latency in seconds, empty if no request completed yet
+        :rtype: dict
+        """
+        latencies = sorted(self._latencies)
+        if not latencies:
+            return {}
+        result = {}
+        for percent in percents:
+            rank = math.ceil(percent * len(latencies) / 100)
+            result[percent] = latencies[min(len(latencies), max(1, rank)) - 1]
+        return result
+
+    async def acquire(self):
+        """
+        Wait until a request can be sent, :meth:`release` must be called once it's done.
+        """
+        if self._inflight < self.current and not self._waiters:
+            self._inflight += 1
+            return
+        fut = asyncio.get_event_loop().create_future()
+        self._waiters.append(fut)
+        try:
+            await fut
+        except asyncio.CancelledError:
+            # The slot may have been handed over right before the cancellation.
+            if fut.done() and not fut.cancelled():
+                self.release()
+            else:
+                self._waiters.remove(fut)
+            raise
+
+    def release(self):
+        """
+        Free the slot of a request and hand it over to the waiting requests.
+        """
+        self._inflight -= 1
+        self._wake()
+
+    def _wake(self):
+        while self._waiters and self._inflight < self.current:
+            fut = self._waiters.popleft()
+            if not fut.done():
+                self._inflight += 1
+                fut.set_result(None)
+
+    def record(self, latency, overloaded=False):
+        """
+        Adjust the limit after a request.
+
+        :param float latency: how long the request took in seconds, `None` if it failed without a response
+        :param bool overloaded: the server said it was overloaded, with a `429` or `5xx` status
+        """
+        if latency is not None:
+            self._latencies.append(latency)
+            if not overloaded:
+                target = self._latency_target
+                if target is None:
+                    target = self._tolerance * min(self._latencies)
+                overloaded = latency > target
+        if overloaded:
+            now = self._clock()
+            # Requests sent before the last decrease saw the old limit, their failures must not decrease it again.
+            if self._last_decrease is None or now - self._last_decrease >= self._round_trip():
+                self._limit = max(self.minimum, self._limit * self._decrease)
+                self._last_decrease = now
+                self.decreases += 1
+        else:
+            self._limit = min(self.maximum, self._limit + self._increase / self._limit)
+            self.increases += 1
+            self._wake()
+
+    def _round_trip(self):
+        if not self._latencies:
+            return 0.0
+        return sorted(self._latencies)[len(self._latencies) // 2]
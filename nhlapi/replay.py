@@ -0,0 +1,286 @@
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import zlib
+
+from .cache import make_key
+from .clients import RawResponse, is_async_client
+from .props import json_decode, json_dump, wrap, wrap_lazy
+
+# An archive is the magic, the records one after the other, a hash table indexing them and a footer locating the table:
+#
+#   magic | key length, flags, body length, key, body | ... | (hash, offset) * slots | table offset, slots, count, magic
+#
+# Empty slots have a zero offset, records start after the magic so none is at offset zero.
+_MAGIC = b"NHLREC01"
+_FOOTER_MAGIC = b"NHLIDX01"
+_RECORD = struct.Struct("<IIQ")
+_SLOT = struct.Struct("<QQ")
+_FOOTER = struct.Struct("<QQQ8s")
+_COMPRESSED = 1
+
+
+def _hash(key):
+    # The builtin hash of str is salted for each process, the archive needs a stable one. blake2b would be faster but it
+    # is missing before Python 3.6.
+    return int.from_bytes(hashlib.sha1(key).digest()[:8], "little")
+
+
+def _scan(buf, start, end):
+    """
+    Read the records between `start` and `end`, stopping at the first truncated one.
+
+    :returns: the `{key: offset}` of the records, the last one wins, and the end of the last complete record
+    """
+    offsets = {}
+    pos = start
+    while pos + _RECORD.size <= end:
+        key_len, _, body_len = _RECORD.unpack_from(buf, pos)
+        stop = pos + _RECORD.size + key_len + body_len
+        if stop > end:
+            break
+        offsets[bytes(buf[pos + _RECORD.size : pos + _RECORD.size + key_len])] = pos
+        pos = stop
+    return offsets, pos
+
+
+def _read_index(buf):
+    """
+    Find the hash table of an archive.
+
+    :returns: `(table offset, slots, count)`, `None` if the archive was not closed and has no table
+    """
+    if len(buf) < len(_MAGIC) or bytes(buf[: len(_MAGIC)]) != _MAGIC:
+        raise ValueError("not a replay archive")
+    if len(buf) < len(_MAGIC) + _FOOTER.size:
+        return None
+    table, slots, count, magic = _FOOTER.unpack_from(buf, len(buf) - _FOOTER.size)
+    if magic != _FOOTER_MAGIC or table + slots * _SLOT.size + _FOOTER.size != len(buf):
+        return None
+    return table, slots, count
+
+
+class RecordingClient:
+    """
+    Wrap a client to save every response it gets into a replay archive, see :class:`ReplayClient`. It works the same way
+    with :class:`nhlapi.clients.SyncClient` and :class:`nhlapi.clients.AsyncClient`::
+
+        recorder = RecordingClient(SyncClient(), "season.nhlrec")
+        api = NHLAPI(recorder)
+        api.schedule(season=Season(2017))
+        recorder.close()
+
+    Requests are keyed by their normalized URL, see :func:`nhlapi.cache.make_key`, and a request made twice keeps its
+    last response. Only successful responses are saved, errors are raised as usual and not recorded. When the client
+    has a `get_raw` method, the raw body is saved as received, otherwise the decoded value is serialized again.
+
+    :meth:`close` writes the index of the archive. The records of an archive that was not closed, because the process
+    was killed for instance, are still read by :class:`ReplayClient` and `append`, up to the last complete record.
+
+    :param client: the client to wrap
+    :param str path: path of the archive
+    :param bool append: keep the records of an existing archive, else it's overwritten
+    :param int level: zlib compression level of the bodies, 0 saves them as is so they are not decompressed again
+    """
+
+    def __init__(self, client, path, *, append=False, level=0):
+        self._client = client
+        self._get_raw = getattr(client, "get_raw", None)
+        self._level = level
+        self._lock = threading.Lock()
+        self._offsets = {}
+        if append and os.path.exists(path):
+            self._file = open(path, "r+b")
+            with mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                index = _read_index(buf)
+                end = index[0] if index else len(buf)
+                self._offsets, end = _scan(buf, len(_MAGIC), end)
+            self._file.truncate(end)
+            self._file.seek(end)
+        else:
+            self._file = open(path, "wb")
+            self._file.write(_MAGIC)
+        if is_async_client(client):
+            self.get = self._get_async
+        else:
+            self.get = self._get_sync
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def _record(self, url, params, body, value):
+        key = make_key(url, params).encode("utf-8")
+        if body is None:
+            body = json_dump(value, separators=(",", ":")).encode("utf-8")
+        flags = 0
+        if self._level:
+            body = zlib.compress(body, self._level)
+            flags |= _COMPRESSED
+        with self._lock:
+            if self._file.closed:
+                raise ValueError("the recorder is closed")
+            self._offsets[key] = self._file.tell()
+            self._file.write(_RECORD.pack(len(key), flags, len(body)) + key + body)
+
+    def _get_sync(self, url, params=None):
+        if self._get_raw is not None:
+            body, value = self._get_raw(url, params)
+        else:
+            body, value = None, self._client.get(url, params)
+        self._record(url, params, body, value)
+        return value
+
+    async def _get_async(self, url, params=None):
+        if self._get_raw is not None:
+            body, value = await self._get_raw(url, params)
+        else:
+            body, value = None, await self._client.get(url, params)
+        self._record(url, params, body, value)
+        return value
+
+    def close(self):
+        """
+        Write the index and close the archive. The wrapped client is not closed.
+        """
+        with self._lock:
+            if self._file.closed:
+                return
+            # Keep the table at most half full so that probes stay short.
+            slots = 1
+            while slots < 2 * len(self._offsets):
+                slots *= 2
+            table = bytearray(slots * _SLOT.size)
+            mask = slots - 1
+            for key, offset in self._offsets.items():
+                digest = _hash(key)
+                slot = digest & mask
+                while _SLOT.unpack_from(table, slot * _SLOT.size)[1]:
+                    slot = (slot + 1) & mask
+                _SLOT.pack_into(table, slot * _SLOT.size, digest, offset)
+            start = self._file.tell()
+            self._file.write(table)
+            self._file.write(_FOOTER.pack(start, slots, len(self._offsets), _FOOTER_MAGIC))
+            self._file.close()
+
+
+class ReplayClient:
+    """
+    A client serving the responses saved by :class:`RecordingClient` without touching the network. It can be given to
+    :class:`nhlapi.endpoints.NHLAPI` in place of :class:`nhlapi.clients.SyncClient`, or of
+    :class:`nhlapi.clients.AsyncClient` when `asynchronous` is `True`::
+
+        api = NHLAPI(ReplayClient("season.nhlrec"))
+
+    The archive is memory mapped and its index is a hash table, so a lookup reads a couple of pages no matter how many
+    responses were recorded and the operating system shares the pages between the processes replaying the same
+    archive. An archive that was not closed is indexed in memory when it's opened.
+
+    Requests missing from the archive raise :class:`KeyError`. Like the other clients, `get_raw` returns a
+    :class:`nhlapi.clients.RawResponse` with the raw body along with the decoded value.
+
+    See :class:`nhlapi.clients.SyncClient` for the `decoder` and `lazy` parameters.
+
+    :param str path: path of the archive
+    :param bool asynchronous: make `get` and `get_raw` coroutine functions
+    :param decoder: function decoding a JSON document from :class:`bytes`
+    :param bool lazy: decode the body on first access
+
+    :ivar int hits: number of requests served
+    :ivar int misses: number of requests missing from the archive
+    """
+
+    def __init__(self, path, *, asynchronous=False, decoder=None, lazy=False):
+        self._decoder = decoder or json_decode
+        self._lazy = lazy
+        with open(path, "rb") as fp:
+            self._buf = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        index = _read_index(self._buf)
+        if index is None:
+            self._offsets, _ = _scan(self._buf, len(_MAGIC), len(self._buf))
+            self._table = self._slots = 0
+            self._count = len(self._offsets)
+        else:
+            self._offsets = None
+            self._table, self._slots, self._count = index
+        self.hits = 0
+        self.misses = 0
+        if asynchronous:
+            self.get = self._get_async
+            self.get_raw = self._get_raw_async
+        else:
+            self.get = self._get_sync
+            self.get_raw = self._get_raw_sync
+
+    def __len__(self):
+        return self._count
+
+    def _find(self, key):
+        if self._offsets is not None:
+            return self._offsets.get(key)
+        buf = self._buf
+        digest = _hash(key)
+        mask = self._slots - 1
+        slot = digest & mask
+        while True:
+            stored, offset = _SLOT.unpack_from(buf, self._table + slot * _SLOT.size)
+            if not offset:
+                return None
+            if stored == digest:
+                key_len = _RECORD.unpack_from(buf, offset)[0]
+                start = offset + _RECORD.size
+                if key_len == len(key) and buf[start : start + key_len] == key:
+                    return offset
+            slot = (slot + 1) & mask
+
+    def _lookup(self, url, params):
+        key = make_key(url, params)
+        offset = self._find(key.encode("utf-8"))
+        if offset is None:
+            self.misses += 1
+            raise KeyError(key)
+        self.hits += 1
+        key_len, flags, body_len = _RECORD.unpack_from(self._buf, offset)
+        start = offset + _RECORD.size + key_len
+        body = self._buf[start : start + body_len]
+        if flags & _COMPRESSED:
+            body = zlib.decompress(body)
+        if self._lazy:
+            return RawResponse(body, wrap_lazy(body, self._decoder))
+        return RawResponse(body, wrap(self._decoder(body)))
+
+    def _get_sync(self, url, params=None):
+        return self._lookup(url, params).data
+
+    def _get_raw_sync(self, url, params=None):
+        return self._lookup(url, params)
+
+    async def _get_async(self, url, params=None):
+        return self._lookup(url, params).data
+
+    async def _get_raw_async(self, url, params=None):
+        return self._lookup(url, params)
+
+    def keys(self):
+        """
+        Get the keys of the recorded requests, see :func:`nhlapi.cache.make_key`.
+
+        :rtype: list[str]
+        """
+        if self._offsets is not None:
+            offsets = self._offsets.values()
+        else:
+            table = self._buf[self._table : self._table + self._slots * _SLOT.size]
+            offsets = [offset for _, offset in _SLOT.iter_unpack(table)]
+        keys = []
+        for offset in sorted(offset for offset in offsets if offset):
+            key_len = _RECORD.unpack_from(self._buf, offset)[0]
+            keys.append(self._buf[offset + _RECORD.size : offset + _RECORD.size + key_len].decode("utf-8"))
+        return keys
+
+    def close(self):
+        """
+        Unmap the archive.
+        """
+        self._buf.close()
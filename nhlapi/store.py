@@ -0,0 +1,199 @@
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import date, datetime
+from urllib.parse import urlsplit
+
+from .cache import endpoint_family, family_ttl
+from .props import json_decode, json_dump, wrap, wrap_lazy
+
+# Endpoint families whose payload never changes once the game is final.
+_GAME_FAMILIES = frozenset(["game/boxscore", "game/content", "game/feed/live", "game/linescore"])
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    expires REAL
+);
+CREATE TABLE IF NOT EXISTS final_games (
+    game_pk INTEGER PRIMARY KEY
+);
+"""
+
+
+def _game_pk(key):
+    for seg in urlsplit(key).path.split("/"):
+        if seg.isdigit() and len(seg) == 10:
+            return int(seg)
+    return None
+
+
+def _final_game_pks(family, value):
+    # Only look inside the payloads that tell if games are final, lazy payloads are not decoded for nothing.
+    if family not in ("schedule", "game/feed/live"):
+        return
+    payload = getattr(value, "_nhlapi_inner_", value)
+    if family == "schedule":
+        for day in payload.get("dates", ()):
+            for game in day.get("games", ()):
+                if game.get("status", {}).get("abstractGameState") == "Final":
+                    yield game["gamePk"]
+    elif family == "game/feed/live":
+        if payload.get("gameData", {}).get("status", {}).get("abstractGameState") == "Final":
+            yield payload["gamePk"]
+
+
+class DiskStore:
+    """
+    A persistent store of responses backed by a SQLite database. The responses are kept as compressed JSON keyed by the
+    normalized URL, see :func:`nhlapi.cache.make_key`. It has the same `lookup` and `store` methods as
+    :class:`nhlapi.cache.ResponseCache` so it can be given to :class:`nhlapi.cache.CachedClient`::
+
+        api = NHLAPI(CachedClient(SyncClient(), DiskStore("nhlapi.sqlite3")))
+
+    Game payloads (boxscore, content, live feed and linescore) are kept forever once the game is final. A game is known
+    to be final when a schedule or live feed payload saying so went through the store, when :meth:`mark_final` was
+    called with its id or when its season is over. Every other payload expires after its time to live.
+
+    The database uses write-ahead logging so it can be shared by several processes on the same host.
+
+    :param str path: path of the database file
+    :param ttl: default time to live in seconds, `None` means entries never expire
+    :param dict ttls: time to live in seconds for each endpoint family, see :func:`nhlapi.cache.family_ttl`
+    :param int level: zlib compression level
+    :param decoder: function decoding a JSON document from :class:`bytes`, :func:`nhlapi.props.json_decode` by default
+    :param bool lazy: decode the stored responses on first access, see :func:`nhlapi.props.wrap_lazy`
+    :param float timeout: how long to wait in seconds for another process to release a lock
+    :param clock: function returning the current UNIX time in seconds
+    :type ttl: float or None
+    """
+
+    def __init__(self, path, ttl=300, ttls=None, level=6, decoder=None, lazy=False, timeout=30.0, clock=time.time):
+        self._path = path
+        self._ttl = ttl
+        self._ttls = dict(ttls or {})
+        self._level = level
+        self._decoder = decoder or json_decode
+        self._lazy = lazy
+        self._timeout = timeout
+        self._clock = clock
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+        with self._connection() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connection(self):
+        # SQLite connections cannot be shared between threads or forked processes.
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self._path, timeout=self._timeout)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def close(self):
+        """
+        Close the database connection of the current thread.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def lookup(self, key):
+        """
+        Get the response stored for the given key.
+
+        :param str key: cache key given by :func:`nhlapi.cache.make_key`
+        :raises: :class:`KeyError` if the key is missing or expired
+        """
+        row = self._connection().execute("SELECT body, expires FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None or (row[1] is not None and row[1] <= self._clock()):
+            self.misses += 1
+            raise KeyError(key)
+        self.hits += 1
+        body = zlib.decompress(row[0])
+        if self._lazy:
+            return wrap_lazy(body, self._decoder)
+        return wrap(self._decoder(body))
+
+    def store(self, key, value, body=None):
+        """
+        Store the response for the given key. Its expiration is given by :meth:`expiry`.
+
+        :param str key: cache key given by :func:`nhlapi.cache.make_key`
+        :param value: decoded response
+        :param bytes body: raw response, `value` is serialized again if it's not given
+        """
+        family = endpoint_family(key)
+        finals = [(pk,) for pk in _final_game_pks(family, value)]
+        if body is None:
+            body = json_dump(value, separators=(",", ":")).encode("utf-8")
+        body = zlib.compress(body, self._level)
+        with self._connection() as conn:
+            if finals:
+                conn.executemany("INSERT OR IGNORE INTO final_games (game_pk) VALUES (?)", finals)
+            expires = self.expiry(key)
+            if expires is None or expires > self._clock():
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, body, expires) VALUES (?, ?, ?)", (key, body, expires)
+                )
+
+    def expiry(self, key):
+        """
+        Get the UNIX time at which the response for the given key expires.
+
+        :param str key: cache key given by :func:`nhlapi.cache.make_key`
+        :returns: `None` if the response never expires
+        :rtype: float or None
+        """
+        if endpoint_family(key) in _GAME_FAMILIES:
+            game_pk = _game_pk(key)
+            if game_pk is not None and self.is_final(game_pk):
+                return None
+        ttl = family_ttl(self._ttls, key, self._ttl)
+        if ttl is None:
+            return None
+        return self._clock() + ttl
+
+    def is_final(self, game_pk):
+        """
+        Check if the game with the given id is known to be final.
+
+        :param int game_pk: game id, as given by the `gamePk` fields of the API
+        :rtype: bool
+        """
+        # The season is over after October of its end year, even the 2020 playoffs were done by then.
+        season_end = date(game_pk // 1000000 + 1, 10, 31)
+        if datetime.fromtimestamp(self._clock()).date() > season_end:
+            return True
+        row = self._connection().execute("SELECT 1 FROM final_games WHERE game_pk = ?", (game_pk,)).fetchone()
+        return row is not None
+
+    def mark_final(self, game_pk):
+        """
+        Record that the game with the given id is final, so that its payloads are kept forever.
+
+        :param game_pk: game id
+        :type game_pk: int or nhlapi.utils.GameId
+        """
+        game_pk = int(game_pk)
+        with self._connection() as conn:
+            conn.execute("INSERT OR IGNORE INTO final_games (game_pk) VALUES (?)", (game_pk,))
+
+    def purge(self):
+        """
+        Delete the expired responses from the database.
+
+        :returns: number of deleted responses
+        :rtype: int
+        """
+        with self._connection() as conn:
+            cur = conn.execute("DELETE FROM responses WHERE expires IS NOT NULL AND expires <= ?", (self._clock(),))
+            return cur.rowcount
@@ -1,6 +1,9 @@
 import enum
+import re
 from abc import ABCMeta, abstractmethod
+from array import array
 from datetime import date, datetime
+from operator import itemgetter
 
 
 class IUrlParam(metaclass=ABCMeta):
@@ -8,6 +11,8 @@ class IUrlParam(metaclass=ABCMeta):
     Implement this interface to be compatible with :func:`to_url_param`.
     """
 
+    __slots__ = ()
+
     @abstractmethod
     def to_url_param(self):
         """
@@ -31,18 +36,53 @@ def to_url_param(val):
         * If `val` is a :class:`str` it will be returned.
         * Any other type will raise a :class:`TypeError`.
     """
-    if isinstance(val, IUrlParam):
-        return val.to_url_param()
-    if isinstance(val, (date, datetime)):
-        return val.strftime("%Y-%m-%d")
-    if isinstance(val, (list, tuple)):
-        return ",".join(map(to_url_param, val))
-    if isinstance(val, int):
-        return str(val)
-    if isinstance(val, str):
-        return val
+    try:
+        encode = _encoders[type(val)]
+    except KeyError:
+        encode = _encoder(type(val))
+    return encode(val)
+
+
+def _encode_date(val):
+    return "%04d-%02d-%02d" % (val.year, val.month, val.day)
+
+
+def _encode_list(val):
+    return ",".join(map(to_url_param, val))
+
+
+def _encode_str(val):
+    return val
+
+
+def _encoder(cls):
+    # Resolve the encoder of a type by the rules of to_url_param, the result is remembered so the next values of the
+    # same type skip the isinstance checks. The ABC check comes first so that subclasses implementing IUrlParam, such
+    # as GameKind, win over their builtin base.
+    if issubclass(cls, IUrlParam):
+        encode = cls.to_url_param
+    elif issubclass(cls, date):
+        encode = _encode_date
+    elif issubclass(cls, (list, tuple)):
+        encode = _encode_list
+    elif issubclass(cls, int):
+        encode = str
+    elif issubclass(cls, str):
+        encode = _encode_str
     else:
-        raise TypeError("Cannot convert '{}' to url param".format(type(val)))
+        raise TypeError("Cannot convert '{}' to url param".format(cls))
+    _encoders[cls] = encode
+    return encode
+
+
+_encoders = {
+    str: _encode_str,
+    int: str,
+    list: _encode_list,
+    tuple: _encode_list,
+    date: _encode_date,
+    datetime: _encode_date,
+}
 
 
 class Year(IUrlParam):
@@ -58,6 +98,20 @@ class Year(IUrlParam):
         return "{:04}".format(self.year)
 
 
+class GameKind(enum.IntEnum):
+    PRESEASON = 1
+    REGULAR = 2
+    PLAYOFFS = 3
+    ALLSTARS = 4
+
+    def to_url_param(self):
+        return "{:02}".format(self.value)
+
+
+IUrlParam.register(GameKind)
+_encoders[GameKind] = {kind: kind.to_url_param() for kind in GameKind}.__getitem__
+
+
 class Season(IUrlParam):
     """
     This class is meant to facilitate the usage of seasons within the API.
@@ -67,33 +121,93 @@ class Season(IUrlParam):
     This way you can refer to the 2017-2018 season with `Season(begin=2017)`
     or `Season(end=2018)` which makes it less error prone. The endpoints
     always know which format to use.
+
+    Seasons are immutable, hashable and ordered. They are interned, so `Season(begin=2017) is Season(end=2018)`.
     """
 
-    def __init__(self, begin=None, end=None):
+    __slots__ = ("_begin", "_param")
+    _interned = {}
+
+    def __new__(cls, begin=None, end=None):
         if begin is None and end is None:
             raise ValueError("need at least one of begin or end")
         elif begin is None:
-            self._begin = end - 1
-            self._end = end
-        elif end is None:
-            self._begin = begin
-            self._end = begin + 1
-        else:
-            if begin + 1 != end:
-                raise ValueError("begin is not 1 year less than end")
+            begin = end - 1
+        elif end is not None and begin + 1 != end:
+            raise ValueError("begin is not 1 year less than end")
+        try:
+            return cls._interned[begin]
+        except KeyError:
+            self = object.__new__(cls)
             self._begin = begin
-            self._end = end
+            self._param = "{}{}".format(begin, begin + 1)
+            return cls._interned.setdefault(begin, self)
 
     @classmethod
     def fromstr(cls, s):
-        assert len(s) == 8
+        """
+        Parse a season in the format used by the API, such as "20172018".
+
+        :raises: :class:`ValueError` if the string is not in this format
+        """
+        if len(s) != 8 or not s.isdigit():
+            raise ValueError("season must be in the YYYYYYYY format")
         return Season(begin=int(s[:4]), end=int(s[4:]))
 
+    def __reduce__(self):
+        return Season, (self._begin,)
+
     def __repr__(self):
         return "Season({:04}-{:04})".format(self.begin, self.end)
 
+    def __hash__(self):
+        return hash(self._begin)
+
+    def __eq__(self, other):
+        if not isinstance(other, Season):
+            return NotImplemented
+        return self._begin == other._begin
+
+    def __ne__(self, other):
+        if not isinstance(other, Season):
+            return NotImplemented
+        return self._begin != other._begin
+
+    def __lt__(self, other):
+        if not isinstance(other, Season):
+            return NotImplemented
+        return self._begin < other._begin
+
+    def __le__(self, other):
+        if not isinstance(other, Season):
+            return NotImplemented
+        return self._begin <= other._begin
+
+    def __gt__(self, other):
+        if not isinstance(other, Season):
+            return NotImplemented
+        return self._begin > other._begin
+
+    def __ge__(self, other):
+        if not isinstance(other, Season):
+            return NotImplemented
+        return self._begin >= other._begin
+
     def to_url_param(self):
-        return "{}{}".format(self.begin, self.end)
+        return self._param
+
+    def game_ids(self, kind, count):
+        """
+        Enumerate the ids of the games of the given kind in this season, numbered from 1 to `count`. Playoff game
+        numbers encode the round, series and game instead of counting games, see :class:`GameId`.
+
+        :param kind: kind of games
+        :param int count: number of games
+        :type kind: GameKind
+        :rtype: list[GameId]
+        """
+        base = self._begin * 1000000 + GameKind(kind) * 10000
+        return [GameId.fromint(code) for code in range(base + 1, base + count + 1)]
 
     @property
     def begin(self):
@@ -107,26 +221,17 @@ class Season(IUrlParam):
         """
         :rtype: int
         """
-        return self._end
-
+        return self._begin + 1
 
-class GameKind(enum.IntEnum):
-    PRESEASON = 1
-    REGULAR = 2
-    PLAYOFFS = 3
-    ALLSTARS = 4
 
-    def to_url_param(self):
-        return "{:02}".format(self.value)
-
-
-IUrlParam.register(GameKind)
-
-
-class GameId(IUrlParam):
+class GameId(int, IUrlParam):
     """
     Create a new GameId with the given info.
 
+    Game ids are the integer SSSSKKNNNN used by the API, where SSSS is the begin year of the season, KK the kind and
+    NNNN the number, so they are immutable, hashable, ordered by season, kind and number, and equal to the `gamePk`
+    fields of the API. They are interned, so creating the same id twice gives the same object.
+
     :param season: NHL Season
     :param number: game number
     :param kind: kind of game
@@ -135,42 +240,120 @@ class GameId(IUrlParam):
     :type kind: GameKind
     """
 
-    def __init__(self, season, number, kind=GameKind.REGULAR):
-        self._season = season
-        self._number = number
-        self._kind = kind
+    # Subclasses of int cannot have slots, the URL parameters are kept by code instead.
+    __slots__ = ()
+    _interned = {}
+    _params = {}
+
+    def __new__(cls, season, number, kind=GameKind.REGULAR):
+        if not 0 <= number < 10000:
+            raise ValueError("game number must be between 0 and 9999")
+        return cls.fromint(season.begin * 1000000 + GameKind(kind) * 10000 + number)
+
+    @classmethod
+    def fromint(cls, code):
+        """
+        Get the game id with the given SSSSKKNNNN encoding, such as the `gamePk` fields of the API.
+
+        :param int code: encoded game id
+        :raises: :class:`ValueError` if the kind of game is unknown
+        """
+        try:
+            return cls._interned[code]
+        except KeyError:
+            code = int(code)
+            GameKind(code // 10000 % 100)
+            self = int.__new__(cls, code)
+            cls._params.setdefault(code, "{:010}".format(code))
+            return cls._interned.setdefault(code, self)
 
     @classmethod
     def fromstr(cls, s):
-        assert len(s) == 8
-        return GameId(season=Season(begin=int(s[:4])), number=int(s[4:6]), kind=GameKind(int(s[6:])))
+        """
+        Parse a game id in the format used by the API, such as "2017021000".
+
+        :raises: :class:`ValueError` if the string is not in this format
+        """
+        if len(s) != 10 or not s.isdigit():
+            raise ValueError("game id must be in the SSSSKKNNNN format")
+        return cls.fromint(int(s))
+
+    def __reduce__(self):
+        return GameId.fromint, (int(self),)
 
     def __repr__(self):
-        return "Game({}, {}, {})".format(self._season, self._kind, self._number)
+        return "Game({}, {}, {})".format(self.season, self.kind, self.number)
+
+    __str__ = __repr__
 
     def to_url_param(self):
-        return "{:04}{:02}{:04}".format(self._season.begin, self._kind, self._number)
+        return self._params[self]
 
     @property
     def season(self):
         """
         :rtype: Season
         """
-        return self._season
+        return Season(begin=self // 1000000)
 
     @property
     def number(self):
         """
         :rtype: int
         """
-        return self._number
+        return self % 10000
 
     @property
     def kind(self):
         """
         :rtype: GameKind
         """
-        return self._kind
+        return GameKind(self // 10000 % 100)
+
+
+_kind_digits = itemgetter(slice(4, 6))
+_KIND_DIGITS = frozenset("{:02}".format(kind) for kind in GameKind)
+
+
+def parse_game_ids(strings, *, numpy=False):
+    """
+    Parse many game ids in the SSSSKKNNNN format into a compact array of their integer encoding, use
+    :meth:`GameId.fromint` to get the ids back. The array takes 8 bytes per id. Without NumPy this is about as fast as
+    calling :meth:`GameId.fromstr` for each string, with NumPy it's about 3 times faster.
+
+    :param strings: iterable of game id strings
+    :param bool numpy: return a NumPy array, parsed with integer arithmetic on the bytes of the strings
+    :raises: :class:`ValueError` if a string is not a valid game id
+    :raises: :class:`ImportError` if `numpy` is `True` and NumPy is not installed
+    :rtype: :class:`array.array` of type `q` or :class:`numpy.ndarray`
+    """
+    strings = strings if isinstance(strings, (list, tuple)) else list(strings)
+    if numpy:
+        import numpy as np
+
+        if not strings:
+            return np.zeros(0, dtype=np.int64)
+        try:
+            raw = np.array(strings, dtype=bytes)
+        except UnicodeEncodeError:
+            raise ValueError("game id must be in the SSSSKKNNNN format")
+        if raw.dtype.itemsize != 10:
+            raise ValueError("game id must be in the SSSSKKNNNN format")
+        # Shorter strings are padded with zeros, which are not digits.
+        digits = raw.view(np.uint8).reshape(len(raw), 10) - np.uint8(ord("0"))
+        if (digits > 9).any():
+            raise ValueError("game id must be in the SSSSKKNNNN format")
+        kinds = digits[:, 4] * np.uint8(10) + digits[:, 5]
+        if not ((kinds >= GameKind.PRESEASON) & (kinds <= GameKind.ALLSTARS)).all():
+            raise ValueError("unknown kind of game")
+        return digits.astype(np.int64) @ (10 ** np.arange(9, -1, -1, dtype=np.int64))
+
+    # Validate and convert with builtins mapped over the whole list, a Python loop would be several times slower.
+    if strings and (set(map(len, strings)) != {10} or not "".join(strings).isdigit()):
+        raise ValueError("game id must be in the SSSSKKNNNN format")
+    if not set(map(_kind_digits, strings)) <= _KIND_DIGITS:
+        raise ValueError("unknown kind of game")
+    return array("q", map(int, strings))
 
 
 class TimeOnIce:
@@ -188,6 +371,8 @@ class TimeOnIce:
         mins, secs = divmod(self._seconds, 60)
         return "{:02}:{:02}".format(mins, secs)
 
+    __str__ = str
+
     def __repr__(self):
         return "TimeOnIce({})".format(str(self))
 
@@ -197,3 +382,133 @@ class TimeOnIce:
     @property
     def seconds(self):
         return self._seconds
+
+
+# Seconds of the minutes and seconds parts of the time on ice strings, looking them up is faster than calling int() and
+# validates them at the same time. Longer minutes are parsed with _TOI_DIGITS.
+_TOI_MINUTES = {"{:0{}}".format(mins, width): mins * 60 for width in (1, 2) for mins in range(10 ** width)}
+_TOI_SECONDS = {"{:02}".format(secs): secs for secs in range(100)}
+_TOI_DIGITS = re.compile(r"[0-9]+\Z")
+
+
+def parse_toi(strings, *, missing=0, numpy=False):
+    """
+    Parse many time on ice strings in the "MM:SS" format into a compact array of seconds. This is much faster than
+    calling :meth:`TimeOnIce.fromstr` for each string. The minutes are one or more ASCII digits and the seconds exactly
+    two, with nothing around them, the same format is accepted with or without `numpy`.
+
+    :param strings: iterable of "MM:SS" strings, `None` or empty strings are missing values
+    :param int missing: number of seconds given to missing values
+    :param bool numpy: return a NumPy array, parsed with integer arithmetic on the bytes of the strings
+    :raises: :class:`ValueError` if a string is not in the "MM:SS" format
+    :raises: :class:`ImportError` if `numpy` is `True` and NumPy is not installed
+    :rtype: :class:`array.array` of type `l` or :class:`numpy.ndarray`
+    """
+    if numpy:
+        return _parse_toi_numpy(strings, missing)
+
+    seconds = array("l")
+    append = seconds.append
+    minutes_of = _TOI_MINUTES.get
+    seconds_of = _TOI_SECONDS.get
+    for s in strings:
+        if not s:
+            append(missing)
+            continue
+        mins, _, secs = s.partition(":")
+        minutes = minutes_of(mins)
+        secs = seconds_of(secs)
+        if minutes is None or secs is None:
+            if secs is None or _TOI_DIGITS.match(mins) is None:
+                raise ValueError("time on ice must be in the MM:SS format")
+            minutes = int(mins) * 60
+        append(minutes + secs)
+    return seconds
+
+
+def _parse_toi_numpy(strings, missing):
+    import numpy as np
+
+    strings = list(strings)
+    if not strings:
+        return np.zeros(0, dtype=np.int64)
+    if None in strings:
+        strings = [s or "" for s in strings]
+    try:
+        raw = np.array(strings, dtype=bytes)
+    except UnicodeEncodeError:
+        raise ValueError("time on ice must be in the MM:SS format")
+    # Each string is a row of bytes padded with zeros, the seconds are the last two digits before the padding.
+    chars = raw.view(np.uint8).reshape(len(raw), raw.dtype.itemsize)
+    digits = chars.astype(np.int64) - ord("0")
+    length = np.count_nonzero(chars, axis=1)
+    present = length > 0
+    colon = length - 3
+    cols = np.arange(chars.shape[1])
+    expected = np.where(cols == colon[:, None], chars == ord(":"), (digits >= 0) & (digits <= 9))
+    if not ((cols >= length[:, None]) | expected).all(axis=1)[present].all() or (length[present] < 4).any():
+        raise ValueError("time on ice must be in the MM:SS format")
+    if chars.shape[1] < 4:
+        # Every value is missing, no string was long enough to hold one.
+        return np.full(len(raw), missing, dtype=np.int64)
+    mins = np.zeros(len(raw), dtype=np.int64)
+    for col in range(chars.shape[1] - 3):
+        mins = np.where(col < colon, mins * 10 + digits[:, col], mins)
+    rows = np.arange(len(raw))
+    tens = np.maximum(colon + 1, 0)
+    secs = digits[rows, tens] * 10 + digits[rows, tens + 1]
+    return np.where(present, mins * 60 + secs, missing)
+
+
+def toi_total(seconds):
+    """
+    Sum an array of seconds given by :func:`parse_toi`.
+
+    :rtype: TimeOnIce
+    """
+    return TimeOnIce(int(_sum(seconds)))
+
+
+def toi_mean(seconds):
+    """
+    Average an array of seconds given by :func:`parse_toi`.
+
+    :returns: the mean in seconds, or NaN if the array is empty
+    :rtype: float
+    """
+    if len(seconds) == 0:
+        return float("nan")
+    return float(_sum(seconds)) / len(seconds)
+
+
+def _sum(seconds):
+    # The builtin sum iterates over a NumPy array in Python, about a hundred times slower than its sum method.
+    if hasattr(seconds, "dtype"):
+        return seconds.sum()
+    return sum(seconds)
+
+
+def toi_by_key(keys, seconds):
+    """
+    Sum an array of seconds given by :func:`parse_toi` by key, for instance by player id.
+
+    .. code-block:: python3
+
+        totals = toi_by_key(player_ids, parse_toi(times))
+        totals[8471214]  # seconds played by this player
+
+    :param keys: iterable of keys, of the same length as `seconds`
+    :param seconds: array of seconds
+    :rtype: dict
+    """
+    if hasattr(seconds, "dtype") and hasattr(keys, "dtype"):
+        import numpy as np
+
+        uniques, inverse = np.unique(keys, return_inverse=True)
+        totals = np.bincount(inverse, weights=seconds, minlength=len(uniques)).astype(np.int64)
+        return dict(zip(uniques.tolist(), totals.tolist()))
+
+    totals = {}
+    for key, secs in zip(keys, seconds):
+        totals[key] = totals.get(key, 0) + secs
+    return totals
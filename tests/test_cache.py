@@ -0,0 +1,106 @@
+import asyncio
+
+from nhlapi.cache import CachedClient, ResponseCache, endpoint_family, make_key
+from nhlapi.endpoints import NHLAPI
+from nhlapi.props import wrap
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingClient:
+    def __init__(self):
+        self.calls = 0
+
+    def get(self, url, params=None):
+        self.calls += 1
+        return wrap({"url": url, "params": params})
+
+
+class AsyncCountingClient:
+    def __init__(self):
+        self.calls = 0
+
+    async def get(self, url, params=None):
+        self.calls += 1
+        return wrap({"url": url, "params": params})
+
+
+def test_make_key_normalized():
+    a = make_key("https://STATSAPI.web.nhl.com/api/v1/teams/", {"teamId": "8", "expand": "team.roster"})
+    b = make_key("https://statsapi.web.nhl.com/api/v1/teams?expand=team.roster", {"teamId": "8"})
+    assert a == b
+
+
+def test_endpoint_family():
+    assert endpoint_family(make_key("https://statsapi.web.nhl.com/api/v1/divisions/1")) == "divisions"
+    assert endpoint_family(make_key("https://statsapi.web.nhl.com/api/v1/game/2017020001/boxscore")) == "game/boxscore"
+
+
+def test_ttl_per_family():
+    cache = ResponseCache(ttl=10, ttls={"standings": 300, "divisions": None})
+    assert cache.ttl_for(make_key("https://statsapi.web.nhl.com/api/v1/standings/byLeague")) == 300
+    assert cache.ttl_for(make_key("https://statsapi.web.nhl.com/api/v1/divisions/1")) is None
+    assert cache.ttl_for(make_key("https://statsapi.web.nhl.com/api/v1/teams")) == 10
+
+
+def test_cache_expires():
+    clock = FakeClock()
+    mock = CountingClient()
+    api = NHLAPI(CachedClient(mock, ResponseCache(ttls={"standings": 300}, clock=clock)))
+    api.standings()
+    api.standings()
+    assert mock.calls == 1
+    clock.now = 301
+    api.standings()
+    assert mock.calls == 2
+
+
+def test_cache_lru_eviction():
+    cache = ResponseCache(maxsize=2)
+    mock = CountingClient()
+    api = NHLAPI(CachedClient(mock, cache))
+    api.divisions(1)
+    api.divisions(2)
+    api.divisions(1)
+    api.divisions(3)
+    assert len(cache) == 2
+    assert cache.evictions == 1
+    api.divisions(1)
+    assert mock.calls == 3
+    api.divisions(2)
+    assert mock.calls == 4
+
+
+def test_cache_counters():
+    cache = ResponseCache()
+    api = NHLAPI(CachedClient(CountingClient(), cache))
+    first = api.teams(8, expand="team.roster")
+    second = api.teams(8, expand="team.roster")
+    assert first is second
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+def test_cache_async():
+    mock = AsyncCountingClient()
+    cache = ResponseCache()
+    api = NHLAPI(CachedClient(mock, cache))
+
+    async def run():
+        await api.teams()
+        return await api.teams()
+
+    loop = asyncio.new_event_loop()
+    try:
+        result = loop.run_until_complete(run())
+    finally:
+        loop.close()
+    assert result.url == "https://statsapi.web.nhl.com/api/v1/teams"
+    assert mock.calls == 1
+    assert cache.hits == 1
@@ -0,0 +1,325 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+BODY = json.dumps({"records": [{"team": {"id": 8, "name": "Montréal Canadiens"}}]}).encode("utf-8")
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.hits += 1
+        if self.path.startswith("/unavailable"):
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path.startswith("/throttled"):
+            self.send_response(429)
+            self.send_header("Retry-After", "7")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path.startswith("/list"):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", "6")
+            self.end_headers()
+            self.wfile.write(b"[1, 2]")
+            return
+        if self.path.startswith("/invalid"):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", "7")
+            self.end_headers()
+            self.wfile.write(b'{"a": [')
+            return
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.send_header("ETag", '"v1"')
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = HTTPServer(("127.0.0.1", 0), Handler)
+    httpd.hits = 0
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def url_of(server):
+    return "http://127.0.0.1:{}/api/v1/standings/byLeague".format(server.server_port)
+
+
+def test_sync_conditional(server):
+    clients = pytest.importorskip("nhlapi.clients")
+    pytest.importorskip("requests")
+    client = clients.SyncClient(conditional=True)
+    first = client.get(url_of(server))
+    second = client.get(url_of(server))
+    assert first is second
+    assert server.hits == 2
+    assert client.stats.not_modified == 1
+    assert client.stats.bytes_saved == len(BODY)
+    assert client.stats.decodes_saved == 1
+
+
+def test_sync_unconditional(server):
+    clients = pytest.importorskip("nhlapi.clients")
+    pytest.importorskip("requests")
+    client = clients.SyncClient()
+    assert client.get(url_of(server)).records[0].team.id == 8
+    client.get(url_of(server))
+    assert client.stats.not_modified == 0
+
+
+def test_async_conditional(server):
+    clients = pytest.importorskip("nhlapi.clients")
+    pytest.importorskip("aiohttp")
+    loop = asyncio.new_event_loop()
+
+    async def run():
+        client = clients.AsyncClient(loop=loop, conditional=True)
+        try:
+            first = await client.get(url_of(server))
+            second = await client.get(url_of(server))
+        finally:
+            await client.close()
+        return client, first, second
+
+    try:
+        client, first, second = loop.run_until_complete(run())
+    finally:
+        loop.close()
+    assert first is second
+    assert client.stats.not_modified == 1
+    assert client.stats.bytes_saved == len(BODY)
+
+
+def test_async_coalesce(server):
+    clients = pytest.importorskip("nhlapi.clients")
+    pytest.importorskip("aiohttp")
+    loop = asyncio.new_event_loop()
+
+    async def run():
+        client = clients.AsyncClient(loop=loop)
+        try:
+            results = await asyncio.gather(*[client.get(url_of(server), {"season": "20182019"}) for _ in range(50)])
+        finally:
+            await client.close()
+        return client, results
+
+    try:
+        client, results = loop.run_until_complete(run())
+    finally:
+        loop.close()
+    assert server.hits == 1
+    assert client.stats.requests == 1
+    assert client.stats.coalesced == 49
+    assert all(result is results[0] for result in results)
+
+
+def test_sync_get_raw_decoder(server):
+    clients = pytest.importorskip("nhlapi.clients")
+    pytest.importorskip("requests")
+    bodies = []
+
+    def decoder(body):
+        bodies.append(body)
+        return json.loads(body.decode("utf-8"))
+
+    client = clients.SyncClient(decoder=decoder)
+    response = client.get_raw(url_of(server))
+    assert response.body == BODY
+    assert response.data.records[0].team.name == "Montréal Canadiens"
+    assert bodies == [BODY]
+
+
+def test_sync_lazy(server):
+    clients = pytest.importorskip("nhlapi.clients")
+    pytest.importorskip("requests")
+    from nhlapi.props import LazyPropDict, json_dump
+
+    data = clients.SyncClient(lazy=True).get(url_of(server))
+    assert isinstance(data, LazyPropDict)
+    assert json_dump(data) == BODY.decode("utf-8")
+    assert data.records[0].team.id == 8
+    data = clients.SyncClient(lazy=True).get("http://127.0.0.1:{}/list".format(server.server_port))
+    assert list(data) == [1, 2]
+
+
+def test_sync_limiter(server):
+    clients = pytest.importorskip("nhlapi.clients")
+    requests = pytest.importorskip("requests")
+    from nhlapi.ratelimit import Priority, RateLimiter
+
+    paused = []
+    limiter = RateLimiter(1000)
+    limiter.pause = paused.append
+    client = clients.SyncClient(limiter=limiter, priority=Priority.BACKFILL)
+    client.get(url_of(server))
+    with pytest.raises(requests.HTTPError):
+        client.get("http://127.0.0.1:{}/throttled".format(server.server_port))
+    assert paused == [7.0]
+    assert client.stats.throttled == 1
+    assert client.stats.requests == 2
+
+
+def test_async_limiter(server):
+    clients = pytest.importorskip("nhlapi.clients")
+    aiohttp = pytest.importorskip("aiohttp")
+    from nhlapi.ratelimit import RateLimiter
+
+    limiter = RateLimiter(1000, burst=1)
+    loop = asyncio.new_event_loop()
+
+    async def run():
+        client = clients.AsyncClient(loop=loop, limiter=limiter, coalesce=False)
+        try:
+            await asyncio.gather(*[client.get(url_of(server)) for _ in range(5)])
+            with pytest.raises(aiohttp.ClientResponseError):
+                await client.get("http://127.0.0.1:{}/throttled".format(server.server_port))
+        finally:
+            await client.close()
+        return client
+
+    try:
+        client = loop.run_until_complete(run())
+    finally:
+        loop.close()
+    assert server.hits == 6
+    assert client.stats.throttled == 1
+    assert limiter._bucket.take() > 6
+
+
+def test_async_adaptive_limit(server):
+    clients = pytest.importorskip("nhlapi.clients")
+    aiohttp = pytest.importorskip("aiohttp")
+    from nhlapi.ratelimit import AdaptiveLimit
+
+    limit = AdaptiveLimit(initial=4, latency_target=5.0)
+    loop = asyncio.new_event_loop()
+
+    async def run():
+        client = clients.AsyncClient(loop=loop, limit=limit, coalesce=False)
+        try:
+            await asyncio.gather(*[client.get(url_of(server)) for _ in range(8)])
+            grown = limit.current
+            with pytest.raises(aiohttp.ClientResponseError):
+                await client.get("http://127.0.0.1:{}/unavailable".format(server.server_port))
+        finally:
+            await client.close()
+        return grown
+
+    try:
+        grown = loop.run_until_complete(run())
+    finally:
+        loop.close()
+    assert grown == 5
+    assert limit.current == 2
+    assert limit.inflight == 0
+    assert set(limit.percentiles()) == {50, 90, 99}
+
+
+def test_sync_metrics(server):
+    clients = pytest.importorskip("nhlapi.clients")
+    requests = pytest.importorskip("requests")
+    from nhlapi.metrics import MetricsRecorder
+
+    recorder = MetricsRecorder(keep=10)
+    client = clients.SyncClient(conditional=True, metrics=recorder)
+    client.get(url_of(server))
+    client.get(url_of(server))
+    with pytest.raises(requests.HTTPError):
+        client.get("http://127.0.0.1:{}/unavailable/503".format(server.server_port))
+    first, second, failed = recorder.recent
+    assert first.endpoint == "/api/v1/standings/byLeague"
+    assert (first.status, first.bytes, first.error) == (200, len(BODY), None)
+    assert first.decode > 0 and first.wrap > 0
+    assert first.total >= first.queue_wait + first.ttfb + first.download + first.decode + first.wrap
+    assert (second.status, second.bytes, second.decode) == (304, 0, 0)
+    assert (failed.endpoint, failed.status) == ("/unavailable/{}", 503)
+    assert recorder.statuses("/api/v1/standings/byLeague") == {200: 1, 304: 1}
+
+
+def test_sync_metrics_invalid_body(server):
+    clients = pytest.importorskip("nhlapi.clients")
+    pytest.importorskip("requests")
+    from nhlapi.metrics import MetricsRecorder
+
+    recorder = MetricsRecorder(keep=10)
+    client = clients.SyncClient(metrics=recorder)
+    with pytest.raises(ValueError):
+        client.get("http://127.0.0.1:{}/invalid".format(server.server_port))
+    (failed,) = recorder.recent
+    assert (failed.endpoint, failed.status, failed.bytes) == ("/invalid", 200, 7)
+    assert failed.error == "JSONDecodeError"
+    assert failed.decode > 0
+
+
+def test_async_metrics(server):
+    clients = pytest.importorskip("nhlapi.clients")
+    aiohttp = pytest.importorskip("aiohttp")
+    from nhlapi.metrics import MetricsRecorder
+
+    recorder = MetricsRecorder()
+    loop = asyncio.new_event_loop()
+
+    async def run():
+        client = clients.AsyncClient(loop=loop, lazy=True, metrics=recorder)
+        try:
+            await asyncio.gather(*[client.get(url_of(server)) for _ in range(3)])
+            with pytest.raises(aiohttp.ClientError):
+                await client.get("http://127.0.0.1:1/api/v1/teams")
+        finally:
+            await client.close()
+
+    try:
+        loop.run_until_complete(run())
+    finally:
+        loop.close()
+    # The three calls were coalesced into one request.
+    assert recorder.histogram("/api/v1/standings/byLeague").count == 1
+    assert recorder.histogram("/api/v1/standings/byLeague", "decode").sum == 0
+    assert recorder.summary()["/api/v1/standings/byLeague"]["bytes"] == len(BODY)
+    assert list(recorder.statuses("/api/v1/teams").values()) == [1]
+
+
+def test_async_metrics_invalid_body(server):
+    clients = pytest.importorskip("nhlapi.clients")
+    pytest.importorskip("aiohttp")
+    from nhlapi.metrics import MetricsRecorder
+
+    recorder = MetricsRecorder(keep=10)
+    loop = asyncio.new_event_loop()
+
+    async def run():
+        client = clients.AsyncClient(loop=loop, metrics=recorder)
+        try:
+            with pytest.raises(ValueError):
+                await client.get("http://127.0.0.1:{}/invalid".format(server.server_port))
+        finally:
+            await client.close()
+
+    try:
+        loop.run_until_complete(run())
+    finally:
+        loop.close()
+    (failed,) = recorder.recent
+    assert (failed.endpoint, failed.status, failed.error) == ("/invalid", 200, "JSONDecodeError")
+    assert recorder.statuses("/invalid") == {"JSONDecodeError": 1}
@@ -0,0 +1,98 @@
+import asyncio
+
+from nhlapi.crawler import Checkpoint, SeasonCrawler, crawl_processes
+from nhlapi.endpoints import NHLAPI
+from nhlapi.props import wrap
+from nhlapi.utils import GameId, GameKind, Season
+
+GAMES = [2017010001, 2017020001, 2017020002, 2017020003, 2017030111, 2018010001]
+
+
+def respond(url, params):
+    if url.endswith("/schedule"):
+        return wrap({"dates": [{"games": [{"gamePk": pk} for pk in GAMES]}]})
+    pk = int(url.split("/")[-2])
+    if pk == 2017020002:
+        raise ValueError("boom")
+    return wrap({"gamePk": pk})
+
+
+class Client:
+    def __init__(self):
+        self.urls = []
+
+    def get(self, url, params=None):
+        self.urls.append(url)
+        return respond(url, params)
+
+
+class AsyncClient:
+    async def get(self, url, params=None):
+        return respond(url, params)
+
+
+def make_api():
+    return NHLAPI(Client())
+
+
+def handle(game_pk, result):
+    pass
+
+
+def test_crawl_sync():
+    mock = Client()
+    crawler = SeasonCrawler(NHLAPI(mock), Season(2017), [GameKind.REGULAR, GameKind.PLAYOFFS], concurrency=1)
+    results = dict(crawler.crawl())
+
+    assert mock.urls[0] == "https://statsapi.web.nhl.com/api/v1/schedule"
+    assert set(results) == {2017020001, 2017020002, 2017020003, 2017030111}
+    assert results[2017020001].gamePk == 2017020001
+    assert isinstance(results[2017020002], ValueError)
+
+
+def test_crawl_async():
+    crawler = SeasonCrawler(NHLAPI(AsyncClient()), Season(2017))
+
+    async def run():
+        results = {}
+        async for game_pk, result in crawler.crawl():
+            results[game_pk] = result
+        return results
+
+    loop = asyncio.new_event_loop()
+    try:
+        results = loop.run_until_complete(run())
+    finally:
+        loop.close()
+    assert set(results) == {2017020001, 2017020002, 2017020003}
+
+
+def test_crawl_resume(tmp_path):
+    path = str(tmp_path / "checkpoint")
+    list(SeasonCrawler(NHLAPI(Client()), Season(2017), checkpoint=path).crawl())
+    assert len(Checkpoint(path)) == 2
+
+    mock = Client()
+    results = dict(SeasonCrawler(NHLAPI(mock), Season(2017), checkpoint=path).crawl())
+    assert list(results) == [2017020002]
+
+
+def test_checkpoint_game_id(tmp_path):
+    path = str(tmp_path / "checkpoint")
+    game_id = GameId(Season(2018), 2, GameKind.PLAYOFFS)
+    Checkpoint(path).mark(game_id)
+    checkpoint = Checkpoint(path)
+    assert game_id in checkpoint
+    assert int(game_id) in checkpoint
+    assert len(checkpoint) == 1
+
+
+def test_crawl_shard():
+    crawler = SeasonCrawler(NHLAPI(Client()), Season(2017), shard=(1, 2))
+    assert set(dict(crawler.crawl())) == {2017020001, 2017020003}
+
+
+def test_crawl_processes(tmp_path):
+    path = str(tmp_path / "checkpoint")
+    assert crawl_processes(make_api, Season(2017), handle, processes=2, checkpoint=path) == 3
+    assert len(Checkpoint(path)) == 2
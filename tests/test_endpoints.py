@@ -1,7 +1,9 @@
+import asyncio
 from datetime import date
 
 import pytest
 from nhlapi.endpoints import NHLAPI
+from nhlapi.props import json_dump, wrap
 from nhlapi.utils import Season
 
 
@@ -22,6 +24,20 @@ def test_teams():
     assert mock.params["stats"] == "single"
 
 
+def test_get_template():
+    mock = MockClient()
+    api = NHLAPI(mock)
+    api.get("/api/v1/teams/{0}/{1}", "a/b", Season(2017), expand=["x", "y"])
+    assert mock.url == "https://statsapi.web.nhl.com/api/v1/teams/a%2Fb/20172018"
+    assert mock.params == {"expand": "x,y"}
+    api.get("/api/v1/people/{0}", 1)
+    assert mock.url == "https://statsapi.web.nhl.com/api/v1/people/1"
+    api.get("api/v1/teams/../divisions")
+    assert mock.url == "https://statsapi.web.nhl.com/api/v1/divisions"
+    api.get("https://records.nhl.com/site/api/{{x}}")
+    assert mock.url == "https://records.nhl.com/site/api/{x}"
+
+
 def test_teams_stats():
     mock = MockClient()
     api = NHLAPI(mock)
@@ -80,6 +96,14 @@ def test_people_stats():
     assert mock.params["season"] == "20172018"
 
 
+def test_people_stats_model():
+    mock = MockClient()
+    api = NHLAPI(mock)
+    with pytest.raises(ValueError):
+        api.people(5000, stats="single", model=True)
+    assert not hasattr(mock, "url")
+
+
 def test_schedule_date():
     mock = MockClient()
     api = NHLAPI(mock)
@@ -133,3 +157,105 @@ def test_standings_bad_args():
     api = NHLAPI(mock)
     with pytest.raises(ValueError):
         api.standings(date=date.today(), season=Season(end=2018))
+
+
+class BatchClient:
+    def __init__(self):
+        self.urls = []
+
+    def get(self, url, params=None):
+        self.urls.append(url)
+        if url.endswith("/2017020002/boxscore"):
+            raise ValueError("boom")
+        return url
+
+
+class AsyncBatchClient:
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+
+    async def get(self, url, params=None):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0)
+        self.active -= 1
+        return url, params
+
+
+def test_boxscores_ordered():
+    mock = BatchClient()
+    api = NHLAPI(mock)
+    results = api.boxscores([2017020001, 2017020002, 2017020003], concurrency=2)
+
+    assert results[0] == "https://statsapi.web.nhl.com/api/v1/game/2017020001/boxscore"
+    assert isinstance(results[1], ValueError)
+    assert results[2] == "https://statsapi.web.nhl.com/api/v1/game/2017020003/boxscore"
+
+
+def test_people_many_as_completed():
+    mock = BatchClient()
+    api = NHLAPI(mock)
+    results = dict(api.people_many([1, 2, 3], ordered=False))
+
+    assert results[2] == "https://statsapi.web.nhl.com/api/v1/people/3"
+    assert len(results) == 3
+
+
+def test_get_many_async():
+    mock = AsyncBatchClient()
+    api = NHLAPI(mock)
+    calls = [("/api/v1/teams", {"teamId": [1, 2]})] + ["/api/v1/people/{}".format(i) for i in range(10)]
+    loop = asyncio.new_event_loop()
+    try:
+        results = loop.run_until_complete(api.get_many(calls, concurrency=3))
+    finally:
+        loop.close()
+
+    assert results[0] == ("https://statsapi.web.nhl.com/api/v1/teams", {"teamId": "1,2"})
+    assert results[10][0] == "https://statsapi.web.nhl.com/api/v1/people/9"
+    assert mock.peak == 3
+
+
+def test_get_many_async_as_completed():
+    api = NHLAPI(AsyncBatchClient())
+
+    async def run():
+        return [await fut for fut in api.get_many(["/api/v1/people/1", "/api/v1/people/2"], ordered=False)]
+
+    loop = asyncio.new_event_loop()
+    try:
+        results = dict(loop.run_until_complete(run()))
+    finally:
+        loop.close()
+
+    assert results[1] == ("https://statsapi.web.nhl.com/api/v1/people/2", {})
+
+
+class PayloadClient:
+    def get(self, url, params=None):
+        self.params = params
+        return wrap({"copyright": "NHL", "dates": [{"date": "2018-10-03", "games": [{"gamePk": 1, "teams": {}}]}]})
+
+
+def test_fields_param():
+    mock = MockClient()
+    api = NHLAPI(mock)
+    api.schedule(date=date(2018, 10, 3), fields=["dates", "games", "gamePk"])
+    assert mock.params["fields"] == "dates,games,gamePk"
+    api.boxscore(2017020001, fields="teams")
+    assert mock.params == {"fields": "teams"}
+
+
+def test_fields_prune():
+    api = NHLAPI(PayloadClient(), prune_fields=True)
+    result = api.schedule(fields=["dates", "games", "gamePk"])
+    assert json_dump(result) == '{"dates": [{"games": [{"gamePk": 1}]}]}'
+
+    results = api.boxscores([2017020001], fields="dates")
+    assert json_dump(results[0]) == '{"dates": [{}]}'
+
+
+def test_fields_no_prune():
+    api = NHLAPI(PayloadClient())
+    assert "copyright" in api.schedule(fields=["dates"])
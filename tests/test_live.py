@@ -0,0 +1,286 @@
+import asyncio
+import copy
+
+import pytest
+from nhlapi.endpoints import NHLAPI
+from nhlapi.live import LivePoller, PatchError, apply_patch
+from nhlapi.props import LazyPropList, json_dump, wrap, wrap_lazy
+
+
+def test_apply_patch():
+    doc = {"a": {"b": [1, 2, 3]}, "c~d/e": 1}
+    apply_patch(
+        doc,
+        [
+            {"op": "add", "path": "/a/b/-", "value": 4},
+            {"op": "add", "path": "/a/b/0", "value": 0},
+            {"op": "replace", "path": "/c~0d~1e", "value": 2},
+            {"op": "remove", "path": "/a/b/1"},
+            {"op": "copy", "from": "/a/b", "path": "/f"},
+            {"op": "move", "from": "/a/b/0", "path": "/g"},
+            {"op": "test", "path": "/f", "value": [0, 2, 3, 4]},
+        ],
+    )
+    assert doc == {"a": {"b": [2, 3, 4]}, "c~d/e": 2, "f": [0, 2, 3, 4], "g": 0}
+
+
+@pytest.mark.parametrize(
+    "op",
+    [
+        {"op": "replace", "path": "/missing", "value": 1},
+        {"op": "add", "path": "/a/b/9", "value": 1},
+        {"op": "add", "path": "/a/b/01", "value": 1},
+        {"op": "remove", "path": "/a/x/y"},
+        {"op": "test", "path": "/a/b/0", "value": 2},
+        {"op": "add", "path": "a", "value": 1},
+        {"op": "frobnicate", "path": "/a"},
+    ],
+)
+def test_apply_patch_errors(op):
+    with pytest.raises(PatchError):
+        apply_patch(wrap({"a": {"b": [1]}}), [op])
+
+
+def play(index, event="Shot"):
+    return {"about": {"eventIdx": index, "period": 1}, "result": {"event": event}}
+
+
+FEED = {
+    "gamePk": 2018020001,
+    "metaData": {"wait": 10, "timeStamp": "20181003_230000"},
+    "gameData": {"status": {"abstractGameState": "Live"}},
+    "liveData": {"plays": {"allPlays": [play(0), play(1)]}},
+}
+
+DIFFS = {
+    "20181003_230000": [
+        {
+            "diff": [
+                {"op": "replace", "path": "/metaData/timeStamp", "value": "20181003_230010"},
+                {"op": "add", "path": "/liveData/plays/allPlays/2", "value": play(2, "Goal")},
+                {"op": "replace", "path": "/liveData/plays/allPlays/1/result/event", "value": "Blocked Shot"},
+            ]
+        }
+    ],
+    "20181003_230010": [],
+    "20181003_230020": [{"diff": [{"op": "remove", "path": "/liveData/plays/allPlays/7"}]}],
+    "20181003_230030": [
+        {
+            "diff": [
+                {"op": "replace", "path": "/metaData/timeStamp", "value": "20181003_230040"},
+                {"op": "add", "path": "/liveData/plays/allPlays/-", "value": play(3, "Game End")},
+                {"op": "replace", "path": "/gameData/status/abstractGameState", "value": "Final"},
+            ]
+        }
+    ],
+}
+
+
+class FeedClient:
+    def __init__(self):
+        self.feed = copy.deepcopy(FEED)
+        self.urls = []
+
+    async def get(self, url, params=None):
+        self.urls.append(url)
+        if url.endswith("/feed/live"):
+            return wrap(copy.deepcopy(self.feed))
+        return wrap(copy.deepcopy(DIFFS[params["startTimecode"]]))
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def test_live_feed_urls():
+    client = FeedClient()
+    api = NHLAPI(client)
+    run(api.live_feed(2018020001))
+    run(api.live_feed_diff(2018020001, "20181003_230000"))
+    assert client.urls == [
+        "https://statsapi.web.nhl.com/api/v1/game/2018020001/feed/live",
+        "https://statsapi.web.nhl.com/api/v1/game/2018020001/feed/live/diffPatch",
+    ]
+
+
+def test_live_feed_diff_fields():
+    class ParamsClient(FeedClient):
+        async def get(self, url, params=None):
+            self.params = params
+            return await super().get(url, params)
+
+    client = ParamsClient()
+    run(NHLAPI(client).live_feed_diff(2018020001, "20181003_230000", fields=["diff"]))
+    assert client.params == {"fields": "diff", "startTimecode": "20181003_230000"}
+
+
+def test_poller():
+    client = FeedClient()
+    poller = LivePoller(NHLAPI(client), [2018020001])
+    received = []
+    poller.subscribe(lambda game_id, plays: received.append([p.result.event for p in plays]))
+
+    async def poll():
+        await poller.poll(2018020001)
+        await poller.poll(2018020001)
+        await poller.poll(2018020001)
+
+    run(poll())
+    assert received == [["Shot", "Shot"], ["Blocked Shot", "Goal"]]
+    assert poller.document(2018020001).metaData.timeStamp == "20181003_230010"
+    assert len(poller.document(2018020001).liveData.plays.allPlays) == 3
+    assert poller.refetches == 1
+    assert poller.patches == 1
+
+
+def test_poller_lazy_client():
+    class LazyClient(FeedClient):
+        # Like a client created with lazy=True, the diffs are a JSON array.
+        async def get(self, url, params=None):
+            doc = await super().get(url, params)
+            return wrap_lazy(json_dump(doc).encode("utf-8"))
+
+    poller = LivePoller(NHLAPI(LazyClient()), [2018020001])
+    received = []
+    poller.subscribe(lambda game_id, plays: received.append([p.result.event for p in plays]))
+
+    async def poll():
+        for _ in range(3):
+            await poller.poll(2018020001)
+
+    run(poll())
+    assert received == [["Shot", "Shot"], ["Blocked Shot", "Goal"]]
+    assert poller.document(2018020001).metaData.timeStamp == "20181003_230010"
+    assert (poller.refetches, poller.patches) == (1, 1)
+
+
+def test_poller_lazy_not_a_list():
+    class ObjectClient(FeedClient):
+        async def get(self, url, params=None):
+            if params:
+                # A lazy list whose body turns out to be an object fails when it's decoded.
+                return LazyPropList(b'{"message": "unavailable"}')
+            return await super().get(url, params)
+
+    poller = LivePoller(NHLAPI(ObjectClient()), [2018020001])
+
+    async def poll():
+        await poller.poll(2018020001)
+        await poller.poll(2018020001)
+
+    run(poll())
+    assert poller.refetches == 2
+
+
+def test_poller_shared_document():
+    class SharedClient(FeedClient):
+        # Like a coalescing client, every caller of the live feed gets the same document.
+        def __init__(self):
+            super().__init__()
+            self.shared = wrap(copy.deepcopy(self.feed))
+
+        async def get(self, url, params=None):
+            if url.endswith("/feed/live"):
+                return self.shared
+            return await super().get(url, params)
+
+    client = SharedClient()
+    poller = LivePoller(NHLAPI(client), [2018020001])
+
+    async def poll():
+        await poller.poll(2018020001)
+        await poller.poll(2018020001)
+
+    run(poll())
+    assert poller.document(2018020001).metaData.timeStamp == "20181003_230010"
+    assert client.shared.metaData.timeStamp == "20181003_230000"
+    assert len(client.shared.liveData.plays.allPlays) == 2
+
+
+def test_poller_refetch_and_final():
+    client = FeedClient()
+    client.feed["metaData"]["timeStamp"] = "20181003_230020"
+    poller = LivePoller(NHLAPI(client), [2018020001], interval=0)
+    received = []
+
+    async def subscriber(game_id, plays):
+        received.append((game_id, len(plays)))
+
+    poller.subscribe(subscriber)
+
+    async def poll():
+        await poller.poll(2018020001)
+        # The patch removes a play that does not exist, the feed is fetched again.
+        client.feed["metaData"]["timeStamp"] = "20181003_230030"
+        await poller.poll(2018020001)
+        await poller.run()
+
+    run(poll())
+    assert poller.refetches == 2
+    assert received == [(2018020001, 2), (2018020001, 2), (2018020001, 1)]
+    assert poller.game_ids == []
+
+
+def test_poller_errors():
+    class FailingClient(FeedClient):
+        async def get(self, url, params=None):
+            if params:
+                raise ValueError("boom")
+            return await super().get(url, params)
+
+    poller = LivePoller(NHLAPI(FailingClient()), [2018020001], interval=0)
+
+    async def poll():
+        await poller.poll(2018020001)
+        loop = asyncio.get_event_loop()
+        loop.call_later(0.01, poller.stop)
+        await poller.run()
+
+    run(poll())
+    assert isinstance(poller.errors[2018020001], ValueError)
+    assert poller.game_ids == [2018020001]
+
+
+def test_poller_errors_cleared():
+    class FlakyClient(FeedClient):
+        def __init__(self):
+            super().__init__()
+            self.diffs = 0
+            self.errors = []
+
+        async def get(self, url, params=None):
+            if params:
+                self.diffs += 1
+                self.errors.append(dict(poller.errors))
+                if self.diffs == 1:
+                    raise ValueError("boom")
+                poller.stop()
+            return await super().get(url, params)
+
+    client = FlakyClient()
+    poller = LivePoller(NHLAPI(client), [2018020001], interval=0)
+
+    async def poll():
+        await poller.poll(2018020001)
+        await poller.run()
+
+    run(poll())
+    # The first poll of the diffs fails, the second one succeeds and clears the error.
+    assert [list(errors) for errors in client.errors] == [[], [2018020001]]
+    assert poller.errors == {}
+    poller.errors[2018020001] = ValueError("boom")
+    poller.remove(2018020001)
+    assert poller.errors == {}
+
+
+def test_poller_sync_client():
+    class SyncClient:
+        def get(self, url, params=None):
+            pass
+
+    with pytest.raises(TypeError):
+        LivePoller(NHLAPI(SyncClient()))
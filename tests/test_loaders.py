@@ -0,0 +1,74 @@
+import asyncio
+
+from nhlapi.endpoints import NHLAPI
+from nhlapi.loaders import TeamLoader
+from nhlapi.props import wrap
+
+
+class TeamsClient:
+    def __init__(self):
+        self.params = []
+
+    async def get(self, url, params=None):
+        self.params.append(params)
+        ids = [int(id) for id in params["teamId"].split(",") if int(id) < 100]
+        return wrap({"teams": [{"id": id, "name": "Team {}".format(id), "expand": params.get("expand")} for id in ids]})
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def test_loader_batches():
+    mock = TeamsClient()
+    loader = TeamLoader(NHLAPI(mock))
+
+    async def main():
+        return await asyncio.gather(loader.load(8), loader.load(10), loader.load(8), loader.load_many([1, 2]))
+
+    habs, leafs, habs_again, others = run(main())
+    assert habs.name == "Team 8"
+    assert leafs.name == "Team 10"
+    assert habs_again is habs
+    assert [team.id for team in others] == [1, 2]
+    assert mock.params == [{"teamId": "8,10,1,2"}]
+    assert loader.requests == 1
+
+
+def test_loader_groups_by_params():
+    mock = TeamsClient()
+    loader = TeamLoader(NHLAPI(mock))
+
+    async def main():
+        return await asyncio.gather(loader.load(8, expand=["team.roster"]), loader.load(10))
+
+    habs, leafs = run(main())
+    assert habs.expand == "team.roster"
+    assert leafs.expand is None
+    assert len(mock.params) == 2
+
+
+def test_loader_max_batch():
+    mock = TeamsClient()
+    loader = TeamLoader(NHLAPI(mock), max_batch=2)
+
+    async def main():
+        return await loader.load_many([1, 2, 3, 4, 5])
+
+    run(main())
+    assert [params["teamId"] for params in mock.params] == ["1,2", "3,4", "5"]
+
+
+def test_loader_missing_team():
+    loader = TeamLoader(NHLAPI(TeamsClient()))
+
+    async def main():
+        return await asyncio.gather(loader.load(8), loader.load(999), return_exceptions=True)
+
+    habs, missing = run(main())
+    assert habs.id == 8
+    assert isinstance(missing, KeyError)
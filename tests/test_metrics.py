@@ -0,0 +1,73 @@
+import pytest
+from nhlapi.metrics import Histogram, MetricsRecorder, RequestMetrics, endpoint_template
+
+
+def metrics(endpoint="/api/v1/game/{}/boxscore", status=200, total=0.02, error=None):
+    return RequestMetrics(endpoint, "", status, 100, 0.001, 0.01, 0.005, 0.002, 0.001, total, error)
+
+
+@pytest.mark.parametrize(
+    "url, template",
+    [
+        ("https://statsapi.web.nhl.com/api/v1/game/2018020001/boxscore", "/api/v1/game/{}/boxscore"),
+        ("https://statsapi.web.nhl.com/api/v1/teams?expand=team.roster", "/api/v1/teams"),
+        ("/api/v1/people/8471675/stats", "/api/v1/people/{}/stats"),
+        ("http://127.0.0.1:8080/api/v1/game/2018020001#x", "/api/v1/game/{}"),
+        ("https://statsapi.web.nhl.com", "/"),
+    ],
+)
+def test_endpoint_template(url, template):
+    assert endpoint_template(url) == template
+
+
+def test_histogram():
+    hist = Histogram([1, 2, 4])
+    for value in [0.5, 1, 1.5, 3, 3, 10]:
+        hist.observe(value)
+    assert hist.cumulative() == [(1, 2), (2, 3), (4, 5), (float("inf"), 6)]
+    assert hist.count == 6
+    assert hist.sum == 19
+    assert hist.quantile(0.5) == 2
+    assert hist.quantile(0.25) == pytest.approx(0.75)
+    assert hist.quantile(1) == 4
+    assert Histogram().quantile(0.5) is None
+
+
+def test_recorder():
+    recorder = MetricsRecorder(buckets=[0.01, 0.1])
+    recorder.record(metrics())
+    recorder.record(metrics(total=0.05))
+    recorder.record(metrics("/api/v1/teams", status=None, error="ClientConnectorError"))
+    assert recorder.endpoints() == ["/api/v1/game/{}/boxscore", "/api/v1/teams"]
+    assert recorder.histogram("/api/v1/game/{}/boxscore", "ttfb").sum == pytest.approx(0.02)
+    assert recorder.statuses("/api/v1/teams") == {"ClientConnectorError": 1}
+    summary = recorder.summary()["/api/v1/game/{}/boxscore"]
+    assert summary["count"] == 2
+    assert summary["bytes"] == 200
+    assert 0.01 < summary["p50"] <= 0.1
+    assert len(recorder.recent) == 0
+    with pytest.raises(KeyError):
+        recorder.histogram("/api/v1/people/{}")
+
+
+def test_exposition():
+    recorder = MetricsRecorder(buckets=[0.01, 0.1])
+    recorder.record(metrics())
+    text = recorder.exposition()
+    lines = text.splitlines()
+    assert "# TYPE nhlapi_request_seconds histogram" in lines
+    assert 'nhlapi_request_seconds_bucket{endpoint="/api/v1/game/{}/boxscore",le="0.1",phase="total"} 1' in lines
+    assert 'nhlapi_request_seconds_bucket{endpoint="/api/v1/game/{}/boxscore",le="+Inf",phase="total"} 1' in lines
+    assert 'nhlapi_request_seconds_count{endpoint="/api/v1/game/{}/boxscore",phase="ttfb"} 1' in lines
+    assert 'nhlapi_responses_total{endpoint="/api/v1/game/{}/boxscore",status="200"} 1' in lines
+    assert 'nhlapi_response_bytes_total{endpoint="/api/v1/game/{}/boxscore"} 100' in lines
+
+
+def test_decode_failure():
+    recorder = MetricsRecorder()
+    recorder.record(metrics())
+    recorder.record(metrics(error="JSONDecodeError"))
+    assert recorder.statuses("/api/v1/game/{}/boxscore") == {200: 1, "JSONDecodeError": 1}
+    lines = recorder.exposition().splitlines()
+    assert 'nhlapi_responses_total{endpoint="/api/v1/game/{}/boxscore",status="200"} 1' in lines
+    assert 'nhlapi_responses_total{endpoint="/api/v1/game/{}/boxscore",status="JSONDecodeError"} 1' in lines
@@ -0,0 +1,170 @@
+import asyncio
+import json
+
+from nhlapi import models
+from nhlapi.endpoints import NHLAPI
+from nhlapi.props import wrap, wrap_lazy
+from nhlapi.utils import GameKind
+
+boxscore = {
+    "copyright": "NHL",
+    "teams": {
+        "home": {
+            "team": {"id": 8, "name": "Montréal Canadiens", "link": "/api/v1/teams/8"},
+            "teamStats": {"teamSkaterStats": {"goals": 3, "pim": 4, "shots": 31}},
+            "players": {
+                "ID8471679": {
+                    "person": {"id": 8471679, "fullName": "Carey Price", "link": "/api/v1/people/8471679"},
+                    "jerseyNumber": "31",
+                    "position": {"code": "G", "name": "Goalie", "type": "Goalie", "abbreviation": "G"},
+                    "stats": {"goalieStats": {"timeOnIce": "60:00", "shots": 30, "saves": 28, "decision": "W"}},
+                },
+                "ID8474025": {
+                    "person": {"id": 8474025, "fullName": "Jeff Petry", "link": "/api/v1/people/8474025"},
+                    "jerseyNumber": "26",
+                    "position": {"code": "D", "name": "Defenseman", "type": "Defenseman", "abbreviation": "D"},
+                    "stats": {"skaterStats": {"timeOnIce": "24:12", "goals": 1, "evenTimeOnIce": "20:01"}},
+                },
+                "ID8480000": {
+                    "person": {"id": 8480000, "fullName": "Scratched", "link": "/api/v1/people/8480000"},
+                    "position": {"code": "N/A"},
+                    "stats": {},
+                },
+            },
+            "goalies": [8471679],
+            "skaters": [8474025],
+            "scratches": [8480000],
+        },
+        "away": {"team": {"id": 10, "name": "Toronto Maple Leafs"}, "players": {}},
+    },
+}
+
+schedule = {
+    "totalGames": 1,
+    "dates": [
+        {
+            "date": "2018-10-03",
+            "games": [
+                {
+                    "gamePk": 2018020001,
+                    "season": "20182019",
+                    "gameDate": "2018-10-03T23:00:00Z",
+                    "status": {"abstractGameState": "Final", "detailedState": "Final"},
+                    "teams": {
+                        "away": {"score": 2, "team": {"id": 8}, "leagueRecord": {"wins": 0, "losses": 1, "ot": 0}},
+                        "home": {"score": 3, "team": {"id": 10}, "leagueRecord": {"wins": 1, "losses": 0, "ot": 0}},
+                    },
+                    "venue": {"name": "Scotiabank Arena"},
+                }
+            ],
+        }
+    ],
+}
+
+standings = {
+    "records": [
+        {
+            "standingsType": "regularSeason",
+            "teamRecords": [
+                {
+                    "team": {"id": 8, "name": "Montréal Canadiens"},
+                    "leagueRecord": {"wins": 44, "losses": 30, "ot": 8},
+                    "points": 96,
+                    "leagueRank": "16",
+                    "divisionRank": "5",
+                    "streak": {"streakCode": "W1"},
+                }
+            ],
+        }
+    ]
+}
+
+
+def test_boxscore():
+    box = models.Boxscore.from_json(wrap(boxscore))
+    home = box.home
+
+    assert home.team == models.TeamRef.from_json({"id": 8, "name": "Montréal Canadiens", "link": "/api/v1/teams/8"})
+    assert (home.goals, home.shots, home.pim) == (3, 31, 4)
+    assert home.goalies == [8471679]
+
+    goalie, skater, scratched = home.players
+    assert goalie.person.full_name == "Carey Price"
+    assert goalie.skater_stats is None
+    assert goalie.goalie_stats.time_on_ice.seconds == 3600
+    assert goalie.goalie_stats.power_play_saves is None
+    assert skater.position.code == "D"
+    assert skater.skater_stats.time_on_ice.seconds == 24 * 60 + 12
+    assert skater.skater_stats.even_time_on_ice.seconds == 20 * 60 + 1
+    assert skater.skater_stats.power_play_time_on_ice is None
+    assert scratched.skater_stats is None and scratched.goalie_stats is None
+
+    assert box.away.team.link is None
+    assert box.away.players == []
+    assert box.away.goals is None
+
+
+def test_schedule():
+    sched = models.Schedule.from_json(wrap_lazy(json.dumps(schedule).encode("utf-8")))
+    game = sched.dates[0].games[0]
+
+    assert sched.total_games == 1
+    assert game.game_id.to_url_param() == "2018020001"
+    assert game.game_id.kind == GameKind.REGULAR
+    assert game.season.begin == 2018
+    assert game.state == "Final"
+    assert game.home.team.id == 10
+    assert (game.home.wins, game.home.losses, game.home.ot) == (1, 0, 0)
+    assert game.venue == "Scotiabank Arena"
+
+
+def test_standings():
+    record = models.Standings.from_json(standings).records[0].team_records[0]
+
+    assert record.league_rank == 16
+    assert record.division_rank == 5
+    assert record.streak == "W1"
+    assert record.games_played is None
+
+
+def test_slots():
+    team = models.TeamRef.from_json({"id": 8})
+    assert not hasattr(team, "__dict__")
+    assert repr(team) == "TeamRef(id=8, name=None, link=None)"
+    assert team != models.Person.from_json({"id": 8})
+
+
+class ModelClient:
+    def get(self, url, params=None):
+        self.params = params
+        return wrap(boxscore)
+
+
+class AsyncModelClient:
+    async def get(self, url, params=None):
+        return wrap(standings)
+
+
+def test_endpoint_model():
+    mock = ModelClient()
+    api = NHLAPI(mock, prune_fields=True)
+
+    assert isinstance(api.boxscore(2018020001, model=True), models.Boxscore)
+    box = api.boxscore(2018020001, fields=["teams", "away", "team", "id"], model=True)
+    assert box.away.team.id == 10
+    assert box.home is None
+    assert mock.params == {"fields": "teams,away,team,id"}
+
+    results = api.boxscores([2018020001, 2018020002], model=True)
+    assert all(isinstance(box, models.Boxscore) for box in results)
+
+
+def test_endpoint_model_async():
+    api = NHLAPI(AsyncModelClient())
+    loop = asyncio.new_event_loop()
+    try:
+        result = loop.run_until_complete(api.standings(model=True))
+    finally:
+        loop.close()
+
+    assert result.records[0].standings_type == "regularSeason"
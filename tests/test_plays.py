@@ -0,0 +1,92 @@
+import math
+
+import pytest
+from nhlapi.plays import CATEGORIES, SCHEMA, PlayTable
+from nhlapi.props import wrap
+
+
+def feed(game_pk, plays):
+    return {"gamePk": game_pk, "liveData": {"plays": {"allPlays": plays}}}
+
+
+SHOT = {
+    "players": [
+        {"player": {"id": 8474025, "fullName": "Jeff Petry"}, "playerType": "Shooter"},
+        {"player": {"id": 8471679, "fullName": "Carey Price"}, "playerType": "Goalie"},
+    ],
+    "result": {"event": "Shot", "eventTypeId": "SHOT", "secondaryType": "Wrist Shot"},
+    "about": {
+        "eventIdx": 4,
+        "period": 1,
+        "periodType": "REGULAR",
+        "periodTime": "01:05",
+        "periodTimeRemaining": "18:55",
+        "goals": {"away": 0, "home": 0},
+    },
+    "coordinates": {"x": -55.0, "y": 6.0},
+    "team": {"id": 8},
+}
+GOAL = {
+    "players": [{"player": {"id": 8474025}, "playerType": "Scorer"}],
+    "result": {"eventTypeId": "GOAL", "secondaryType": "Slap Shot", "strength": {"code": "PPG"}},
+    "about": {
+        "eventIdx": 7,
+        "period": 2,
+        "periodType": "REGULAR",
+        "periodTime": "12:00",
+        "goals": {"away": 0, "home": 1},
+    },
+    "coordinates": {"x": 80, "y": -2},
+    "team": {"id": 8},
+}
+START = {"result": {"eventTypeId": "PERIOD_START"}, "about": {"eventIdx": 0, "period": 1}, "coordinates": {}}
+
+
+def test_append():
+    table = PlayTable()
+    assert table.append(wrap(feed(2018020001, [START, SHOT]))) == 2
+    assert table.extend([feed(2018020002, [GOAL, SHOT]), feed(2018020003, [])]) == 2
+    assert len(table) == 4
+    assert list(table.columns) == list(SCHEMA)
+    assert list(table["game_pk"]) == [2018020001, 2018020001, 2018020002, 2018020002]
+    assert table.decode("event") == ["PERIOD_START", "SHOT", "GOAL", "SHOT"]
+    assert table.labels("event") == ["PERIOD_START", "SHOT", "GOAL"]
+    assert table.decode("strength") == [None, None, "PPG", None]
+    assert list(table["period_time"]) == [-1, 65, 720, 65]
+    assert list(table["period_time_remaining"]) == [-1, 1135, -1, 1135]
+    assert math.isnan(table["x"][0])
+    assert list(table["x"])[1:] == [-55.0, 80.0, -55.0]
+    assert list(table["player2_id"])[1:3] == [8471679, -(2 ** 63)]
+    assert table.decode("player1_type") == [None, "Shooter", "Scorer", "Shooter"]
+    assert list(table["home_goals"]) == [-1, 0, 1, 0]
+
+
+def test_append_bad_game():
+    table = PlayTable()
+    table.append(feed(1, [SHOT]))
+    bad = dict(SHOT, about=dict(SHOT["about"], period="first"))
+    with pytest.raises(TypeError):
+        table.append(feed(2, [SHOT, bad]))
+    assert len(table) == 1
+    assert all(len(column) == 1 for column in table.columns.values())
+    # The labels of the rejected game are not kept either.
+    labels = {name: list(table.labels(name)) for name in CATEGORIES}
+    with pytest.raises(TypeError):
+        table.append(feed(3, [GOAL, dict(bad, result={"eventTypeId": "FACEOFF"})]))
+    assert {name: table.labels(name) for name in CATEGORIES} == labels
+    table.append(feed(4, [GOAL]))
+    assert table.labels("event") == ["SHOT", "GOAL"]
+    assert table.decode("event") == ["SHOT", "GOAL"]
+
+
+def test_to_numpy():
+    np = pytest.importorskip("numpy")
+    table = PlayTable()
+    assert len(table.to_numpy()["x"]) == 0
+    table.append(feed(2018020001, [SHOT, GOAL]))
+    arrays = table.to_numpy()
+    assert arrays["period_time"].tolist() == [65, 720]
+    assert arrays["x"].dtype == np.float64
+    assert arrays["event"].dtype == np.int16
+    table.append(feed(2018020002, [SHOT]))
+    assert len(arrays["game_pk"]) == 2
@@ -1,4 +1,11 @@
-from nhlapi.props import PropDict, PropList, wrap, get, keys, values, items
+import io
+import json
+import math
+
+import pytest
+from nhlapi.props import CachedPropDict, CachedPropList, PropDict, PropList, wrap, get, keys, values, items
+from nhlapi.props import LazyPropDict, LazyPropList, Record, compact, compact_decode, compile_path, extract, json_dump
+from nhlapi.props import prune, to_columns, wrap_lazy
 
 d = {"name": "abcdef", "info": {"age": 28, "height": 180}, "qualities": ["nice", "funny"]}
 a = [1, dict(), []]
@@ -101,3 +108,175 @@ def test_list_reversed():
     assert vals[2] == 1
     assert isinstance(vals[1], PropDict)
     assert isinstance(vals[0], PropList)
+
+
+def test_cached_wrap():
+    c = wrap({"info": {"age": 28}, "players": [{"id": 1}, {"id": 2}], "name": "abcdef"}, cached=True)
+    assert isinstance(c, CachedPropDict)
+    assert isinstance(c, PropDict)
+    assert c.info is c["info"]
+    assert c.info.age == 28
+    assert c.name == "abcdef"
+    assert isinstance(c.players, CachedPropList)
+    assert list(c.players)[1] is c.players[1]
+    assert list(reversed(c.players))[0].id == 2
+    assert len(c.players[:1]) == 1
+
+
+def test_cached_values_items():
+    c = wrap({"info": {"age": 28}}, cached=True)
+    assert list(values(c))[0] is c.info
+    assert dict(items(c))["info"] is c.info
+    assert get(c, "missing") is None
+
+
+def test_compile_path():
+    doc = wrap({"teams": [{"id": 1, "venue": {"name": "A"}}, {"id": 2, "venue": {}}], "a.b": {"c": [1, 2, 3]}})
+    assert compile_path("teams[0].venue.name")(doc) == "A"
+    assert compile_path("teams[-1].id")(doc) == 2
+    assert compile_path("teams[5].id", default=0)(doc) == 0
+    assert compile_path('["a.b"].c[1]')(doc) == 2
+    assert compile_path("teams[*].venue.name", default="?")(doc) == ["A", "?"]
+    assert compile_path("teams[*].id")(doc._nhlapi_inner_) == [1, 2]
+    assert compile_path("missing[*].id")(doc) == []
+    assert isinstance(compile_path("teams[0]")(doc), dict)
+
+
+def test_compile_path_dict_wildcard():
+    doc = {"players": {"ID1": {"goals": 1}, "ID2": {"goals": 2}}}
+    assert sorted(compile_path("players.*.goals")(doc)) == [1, 2]
+    assert extract(doc, "players.ID2.goals") == 2
+
+
+def test_compile_path_invalid():
+    with pytest.raises(ValueError):
+        compile_path("teams..id")
+
+
+players = wrap(
+    [
+        {"person": {"id": 1, "fullName": "A"}, "stats": {"goals": 2, "toi": 10.5, "captain": True}},
+        {"person": {"id": 2, "fullName": "Bee"}, "stats": {"goals": 0, "toi": 12}},
+        {"person": {"id": 3}, "stats": {}},
+    ]
+)
+
+
+def test_to_columns():
+    fields = {"id": "person.id", "goals": "stats.goals", "toi": "stats.toi", "name": "person.fullName"}
+    cols = to_columns(players, fields)
+    assert list(cols) == ["id", "goals", "toi", "name"]
+    assert cols["id"].typecode == "q"
+    assert list(cols["id"]) == [1, 2, 3]
+    assert cols["goals"][2] == -(2 ** 63)
+    assert cols["toi"].typecode == "d"
+    assert math.isnan(cols["toi"][2])
+    assert cols["name"] == ["A", "Bee", None]
+
+
+def test_to_columns_types_missing():
+    cols = to_columns(players, ["stats.captain", "stats.goals"], types={"stats.goals": "d"}, missing={"stats.goals": 0})
+    assert list(cols["stats.captain"]) == [1, -1, -1]
+    assert list(cols["stats.goals"]) == [2.0, 0.0, 0.0]
+
+
+def test_to_columns_bad_type():
+    with pytest.raises(TypeError):
+        to_columns(players, ["person.fullName"], types={"person.fullName": "q"})
+    with pytest.raises(TypeError):
+        to_columns([{"id": 1}, {"id": 2 ** 63}], ["id"])
+
+
+def test_to_columns_numpy():
+    np = pytest.importorskip("numpy")
+    table = to_columns(players, {"id": "person.id", "goals": "stats.goals", "name": "person.fullName"}, numpy=True)
+    assert table.dtype["id"] == np.int64
+    assert table["name"].tolist() == ["A", "Bee", ""]
+    assert table[table["goals"] >= 0]["goals"].sum() == 2
+
+
+def test_lazy_dict():
+    decoded = []
+
+    def decoder(body):
+        decoded.append(body)
+        return json.loads(body.decode("utf-8"))
+
+    lazy = wrap_lazy(b'{"teams": [{"id": 8}]}', decoder)
+    assert isinstance(lazy, LazyPropDict)
+    assert json_dump(lazy) == '{"teams": [{"id": 8}]}'
+    out = io.BytesIO()
+    json_dump(lazy, out)
+    assert out.getvalue() == b'{"teams": [{"id": 8}]}'
+    assert decoded == []
+
+    assert lazy.teams[0].id == 8
+    assert "teams" in lazy
+    assert list(keys(lazy)) == ["teams"]
+    assert len(decoded) == 1
+    assert json_dump(lazy, indent=None, separators=(",", ":")) == '{"teams":[{"id":8}]}'
+
+
+def test_lazy_dict_not_object():
+    with pytest.raises(TypeError):
+        len(LazyPropDict(b"[1, 2]"))
+    with pytest.raises(TypeError):
+        len(LazyPropList(b'{"a": 1}'))
+
+
+def test_lazy_list():
+    decoded = []
+
+    def decoder(body):
+        decoded.append(body)
+        return json.loads(body.decode("utf-8"))
+
+    lazy = wrap_lazy(b' [{"diff": [{"op": "remove", "path": "/a"}]}, 2]', decoder)
+    assert isinstance(lazy, LazyPropList)
+    assert json_dump(lazy) == ' [{"diff": [{"op": "remove", "path": "/a"}]}, 2]'
+    assert decoded == []
+
+    assert len(lazy) == 2
+    assert lazy[0].diff[0].op == "remove"
+    assert list(lazy)[1] == 2
+    assert getattr(lazy, "_nhlapi_inner_")[1] == 2
+    assert len(decoded) == 1
+    with pytest.raises(AttributeError):
+        lazy.diff
+    # Other documents are decoded right away.
+    assert wrap_lazy(b"null") is None
+    assert wrap_lazy('"text"') == "text"
+
+
+def test_prune():
+    doc = {"teams": [{"id": 1, "name": "A", "venue": {"id": 5, "name": "V"}}], "copyright": "NHL"}
+    assert prune(doc, "teams,id") == {"teams": [{"id": 1}]}
+    pruned = prune(wrap(doc), ["teams", "venue", "name"])
+    assert isinstance(pruned, PropDict)
+    assert json_dump(pruned) == '{"teams": [{"name": "A", "venue": {"name": "V"}}]}'
+
+
+def test_compact_interns():
+    doc = json.loads('[{"fullName": "abcdef"}, {"fullName": "abcdef", "x": "' + "z" * 40 + '"}]')
+    small = compact(doc)
+    assert small == doc
+    assert small[0]["fullName"] is small[1]["fullName"]
+    assert next(iter(small[0])) is next(iter(small[1]))
+
+
+def test_compact_tables():
+    doc = {"players": [{"id": 1, "name": "A", "stats": {"g": 1}}, {"id": 2, "name": "B", "stats": {"g": 0}}]}
+    small = compact(wrap(doc), tables=True)
+    assert isinstance(small, PropDict)
+    assert isinstance(small.players._nhlapi_inner_[0], Record)
+    assert small.players[1].name == "B"
+    assert small.players[0].stats.g == 1
+    assert "id" in small.players[0]
+    assert dict(items(small.players[0]))["id"] == 1
+    assert compile_path("players[*].id")(small) == [1, 2]
+    assert json.loads(json_dump(small)) == doc
+    assert to_columns(small.players, ["id"])["id"].tolist() == [1, 2]
+
+
+def test_compact_decode():
+    assert compact_decode(b'{"a": [{"b": 1}, {"b": 2}]}', tables=True)["a"][1]["b"] == 2
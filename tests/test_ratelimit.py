@@ -0,0 +1,267 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from nhlapi.ratelimit import AdaptiveLimit, Priority, RateLimiter
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_bucket():
+    clock = Clock()
+    limiter = RateLimiter(2, burst=3, clock=clock)
+    assert [limiter._bucket.take() for _ in range(4)] == [0, 0, 0, 0.5]
+    clock.now += 0.5
+    assert limiter._bucket.take() == 0
+    clock.now += 10
+    assert [limiter._bucket.take() for _ in range(4)] == [0, 0, 0, 0.5]
+
+
+def test_pause():
+    clock = Clock()
+    limiter = RateLimiter(10, clock=clock)
+    limiter.pause(2)
+    assert limiter._bucket.take() == 2
+    clock.now += 2
+    assert limiter._bucket.take() == 0.1
+
+
+def test_bad_args():
+    with pytest.raises(ValueError):
+        RateLimiter(0)
+    with pytest.raises(ValueError):
+        RateLimiter(1, burst=0.5)
+
+
+def test_shared(tmp_path):
+    clock = Clock()
+    path = str(tmp_path / "bucket")
+    first = RateLimiter(1, burst=2, path=path, clock=clock)
+    second = RateLimiter(1, burst=2, path=path, clock=clock)
+    try:
+        assert first._bucket.take() == 0
+        assert second._bucket.take() == 0
+        assert first._bucket.take() == 1
+        second.pause(5)
+        assert first._bucket.take() == 5
+    finally:
+        first.close()
+        second.close()
+
+
+class ExclusiveBucket:
+    """
+    Wraps a bucket and records how many threads are inside it at once.
+    """
+
+    def __init__(self, bucket):
+        self._bucket = bucket
+        self._guard = threading.Lock()
+        self.active = 0
+        self.overlaps = 0
+
+    def _enter(self, func, *args):
+        with self._guard:
+            self.active += 1
+            self.overlaps += self.active > 1
+        try:
+            # Give the other threads a chance to step in.
+            time.sleep(0.0005)
+            return func(*args)
+        finally:
+            with self._guard:
+                self.active -= 1
+
+    def take(self):
+        return self._enter(self._bucket.take)
+
+    def pause(self, seconds):
+        return self._enter(self._bucket.pause, seconds)
+
+
+@pytest.mark.parametrize("shared", [False, True])
+def test_pause_while_acquiring(tmp_path, shared):
+    limiter = RateLimiter(2000, burst=1, path=str(tmp_path / "bucket") if shared else None)
+    bucket = limiter._bucket = ExclusiveBucket(limiter._bucket)
+    errors = []
+
+    def acquire():
+        try:
+            for _ in range(20):
+                limiter.acquire()
+        except Exception as exc:
+            errors.append(exc)
+
+    def pause():
+        for _ in range(20):
+            limiter.pause(0.0001)
+
+    threads = [threading.Thread(target=acquire) for _ in range(4)] + [threading.Thread(target=pause)]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+    finally:
+        limiter.close()
+    assert not errors
+    assert bucket.overlaps == 0
+
+
+def test_acquire_threads():
+    limiter = RateLimiter(200, burst=1)
+    order = []
+    limiter.acquire()
+
+    def worker(index):
+        limiter.acquire()
+        order.append(index)
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert sorted(order) == list(range(5))
+    assert limiter.waiting == 0
+
+
+def test_acquire_priority():
+    limiter = RateLimiter(100, burst=1)
+    order = []
+
+    async def request(name, priority):
+        await limiter.acquire_async(priority)
+        order.append(name)
+
+    async def run():
+        await limiter.acquire_async()
+        backfill = [asyncio.ensure_future(request("backfill", Priority.BACKFILL)) for _ in range(3)]
+        await asyncio.sleep(0)
+        live = asyncio.ensure_future(request("live", Priority.LIVE))
+        await asyncio.gather(live, *backfill)
+
+    loop = asyncio.new_event_loop()
+    try:
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(run())
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+
+    # The first backfill request may already hold the head of the queue, the live one goes before the others.
+    assert order.index("live") <= 1
+    assert limiter.waiting == 0
+
+
+def test_acquire_cancel():
+    limiter = RateLimiter(1, burst=1)
+
+    async def run():
+        await limiter.acquire_async()
+        waiting = asyncio.ensure_future(limiter.acquire_async())
+        await asyncio.sleep(0.01)
+        assert limiter.waiting == 1
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+
+    loop = asyncio.new_event_loop()
+    try:
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(run())
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+    assert limiter.waiting == 0
+
+
+def test_adaptive_aimd():
+    clock = Clock()
+    limit = AdaptiveLimit(initial=4, minimum=2, maximum=6, clock=clock)
+    for _ in range(5):
+        limit.record(0.1)
+    assert limit.current == 5
+    limit.record(0.1, overloaded=True)
+    assert limit.current == 2
+    limit.record(None, overloaded=True)
+    assert limit.decreases == 1
+    clock.now += 0.1
+    limit.record(None, overloaded=True)
+    assert limit.decreases == 2
+    assert limit.current == 2
+    for _ in range(100):
+        limit.record(0.1)
+    assert limit.current == 6
+
+
+def test_adaptive_latency():
+    limit = AdaptiveLimit(initial=8, clock=Clock())
+    limit.record(0.1)
+    limit.record(0.25)
+    assert limit.current == 8
+    limit.record(0.5)
+    assert limit.current == 4
+
+    limit = AdaptiveLimit(initial=8, latency_target=1.0, clock=Clock())
+    limit.record(0.01)
+    limit.record(0.9)
+    assert limit.decreases == 0
+
+
+def test_adaptive_percentiles():
+    limit = AdaptiveLimit(latency_target=10, window=100)
+    assert limit.percentiles() == {}
+    for latency in range(1, 201):
+        limit.record(latency / 100)
+    assert limit.percentiles() == {50: 1.5, 90: 1.9, 99: 1.99}
+    assert limit.percentiles([0, 100]) == {0: 1.01, 100: 2.0}
+
+
+def test_adaptive_bad_args():
+    with pytest.raises(ValueError):
+        AdaptiveLimit(initial=8, maximum=4)
+    with pytest.raises(ValueError):
+        AdaptiveLimit(decrease=1)
+
+
+def test_adaptive_acquire():
+    limit = AdaptiveLimit(initial=2, latency_target=1.0)
+    peak = []
+
+    async def request(delay):
+        await limit.acquire()
+        try:
+            peak.append(limit.inflight)
+            await asyncio.sleep(delay)
+        finally:
+            limit.release()
+
+    async def run():
+        await asyncio.gather(*[request(0.001) for _ in range(10)])
+        await limit.acquire()
+        await limit.acquire()
+        waiting = asyncio.ensure_future(limit.acquire())
+        await asyncio.sleep(0)
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        limit.release()
+        limit.release()
+
+    loop = asyncio.new_event_loop()
+    try:
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(run())
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+    assert max(peak) == 2
+    assert limit.inflight == 0
@@ -0,0 +1,111 @@
+import asyncio
+import json
+import os
+
+import pytest
+from nhlapi.clients import RawResponse, is_async_client
+from nhlapi.endpoints import NHLAPI
+from nhlapi.props import wrap
+from nhlapi.replay import RecordingClient, ReplayClient
+
+
+class FakeClient:
+    def __init__(self):
+        self.calls = 0
+
+    def get_raw(self, url, params=None):
+        self.calls += 1
+        body = json.dumps({"url": url, "params": params, "call": self.calls}).encode("utf-8")
+        return RawResponse(body, wrap(json.loads(body.decode("utf-8"))))
+
+    def get(self, url, params=None):
+        return self.get_raw(url, params).data
+
+
+class AsyncFakeClient:
+    async def get(self, url, params=None):
+        return wrap({"url": url, "params": params})
+
+
+def record(path, **kwargs):
+    recorder = RecordingClient(FakeClient(), str(path), **kwargs)
+    api = NHLAPI(recorder)
+    for team_id in range(1, 32):
+        api.teams(team_id)
+    api.standings(season="20172018")
+    api.teams(8)
+    return recorder
+
+
+@pytest.mark.parametrize("level", [0, 6])
+def test_record_replay(tmpdir, level):
+    path = tmpdir.join("archive.nhlrec")
+    record(path, level=level).close()
+    replay = ReplayClient(str(path))
+    api = NHLAPI(replay)
+    assert len(replay) == 32
+    assert api.teams(1).call == 1
+    # The last response of a request made twice is kept.
+    assert api.teams(8).call == 33
+    assert api.standings(season="20172018").params.season == "20172018"
+    # Parameters are normalized like the cache keys.
+    assert replay.get("https://statsapi.web.nhl.com/api/v1/standings/byLeague/?season=20172018").call == 32
+    with pytest.raises(KeyError):
+        api.teams(99)
+    assert (replay.hits, replay.misses) == (4, 1)
+    assert replay.keys()[0] == "https://statsapi.web.nhl.com/api/v1/teams?teamId=1"
+    body, data = replay.get_raw("https://statsapi.web.nhl.com/api/v1/teams", {"teamId": 2})
+    assert json.loads(body.decode("utf-8")) == data._nhlapi_inner_
+    replay.close()
+
+
+def test_unclosed_archive(tmpdir):
+    path = tmpdir.join("archive.nhlrec")
+    recorder = record(path)
+    recorder._file.flush()
+    # Simulate a crash in the middle of a record.
+    with open(str(path), "ab") as fp:
+        fp.write(b"\x10\x00")
+    replay = ReplayClient(str(path), lazy=True)
+    assert len(replay) == 32
+    assert replay.get("https://statsapi.web.nhl.com/api/v1/teams?teamId=8").call == 33
+    replay.close()
+    recorder.close()
+
+
+def test_append(tmpdir):
+    path = tmpdir.join("archive.nhlrec")
+    record(path).close()
+    recorder = RecordingClient(FakeClient(), str(path), append=True)
+    assert len(recorder) == 32
+    NHLAPI(recorder).divisions()
+    recorder.close()
+    replay = ReplayClient(str(path))
+    assert len(replay) == 33
+    assert replay.get("https://statsapi.web.nhl.com/api/v1/divisions").call == 1
+    assert replay.get("https://statsapi.web.nhl.com/api/v1/teams?teamId=8").call == 33
+    replay.close()
+
+
+def test_not_an_archive(tmpdir):
+    path = tmpdir.join("archive.nhlrec")
+    path.write_binary(b"not an archive")
+    with pytest.raises(ValueError):
+        ReplayClient(str(path))
+    assert os.path.getsize(str(path)) == 14
+
+
+def test_async(tmpdir):
+    path = str(tmpdir.join("archive.nhlrec"))
+    recorder = RecordingClient(AsyncFakeClient(), path)
+    assert is_async_client(recorder)
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(NHLAPI(recorder).teams(8))
+        recorder.close()
+        replay = ReplayClient(path, asynchronous=True)
+        assert is_async_client(replay)
+        assert loop.run_until_complete(NHLAPI(replay).teams(8)).params.teamId == "8"
+        replay.close()
+    finally:
+        loop.close()
@@ -0,0 +1,99 @@
+from datetime import datetime
+
+import pytest
+
+from nhlapi.cache import CachedClient, make_key
+from nhlapi.endpoints import NHLAPI
+from nhlapi.props import wrap
+from nhlapi.store import DiskStore
+from nhlapi.utils import GameId, Season
+
+NOW = datetime(2018, 12, 1).timestamp()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = NOW
+
+    def __call__(self):
+        return self.now
+
+
+class CountingClient:
+    def __init__(self):
+        self.calls = 0
+
+    def get(self, url, params=None):
+        self.calls += 1
+        if url.endswith("/schedule"):
+            return wrap({"dates": [{"games": [{"gamePk": 2018020001, "status": {"abstractGameState": "Final"}}]}]})
+        return wrap({"url": url, "teams": {"home": {"goals": 3}}})
+
+
+def test_store_roundtrip(tmp_path):
+    store = DiskStore(str(tmp_path / "store.sqlite3"))
+    key = make_key("https://statsapi.web.nhl.com/api/v1/teams")
+    store.store(key, wrap({"teams": [{"id": 8, "name": "Montréal Canadiens"}]}))
+    assert store.lookup(key).teams[0].name == "Montréal Canadiens"
+    assert store.hits == 1
+
+
+def test_store_survives_restart(tmp_path):
+    path = str(tmp_path / "store.sqlite3")
+    clock = FakeClock()
+    mock = CountingClient()
+    api = NHLAPI(CachedClient(mock, DiskStore(path, clock=clock)))
+    api.schedule()
+    api.boxscore(2018020001)
+
+    api = NHLAPI(CachedClient(mock, DiskStore(path, clock=clock)))
+    assert api.boxscore(2018020001).teams.home.goals == 3
+    assert mock.calls == 2
+
+
+def test_store_final_game_forever(tmp_path):
+    clock = FakeClock()
+    mock = CountingClient()
+    store = DiskStore(str(tmp_path / "store.sqlite3"), ttl=60, clock=clock)
+    api = NHLAPI(CachedClient(mock, store))
+    store.mark_final(GameId(Season(2018), 2))
+    api.boxscore(2018020002)
+    api.boxscore(2018020003)
+    clock.now += 3600
+    api.boxscore(2018020002)
+    assert mock.calls == 2
+    api.boxscore(2018020003)
+    assert mock.calls == 3
+
+
+def test_store_past_season_is_final(tmp_path):
+    store = DiskStore(str(tmp_path / "store.sqlite3"), clock=FakeClock())
+    assert store.is_final(2016020001)
+    assert not store.is_final(2018020500)
+
+
+def test_store_ttl_expires(tmp_path):
+    clock = FakeClock()
+    store = DiskStore(str(tmp_path / "store.sqlite3"), ttls={"standings": 60}, clock=clock)
+    key = make_key("https://statsapi.web.nhl.com/api/v1/standings/byLeague")
+    store.store(key, wrap({"records": []}))
+    store.lookup(key)
+    clock.now += 61
+    with pytest.raises(KeyError):
+        store.lookup(key)
+    assert store.purge() == 1
+
+
+class RawClient:
+    def get_raw(self, url, params=None):
+        return b'{"raw":true}', wrap({"raw": False})
+
+    def get(self, url, params=None):
+        return self.get_raw(url, params)[1]
+
+
+def test_store_keeps_raw_body(tmp_path):
+    store = DiskStore(str(tmp_path / "store.sqlite3"))
+    api = NHLAPI(CachedClient(RawClient(), store))
+    assert api.teams().raw is False
+    assert store.lookup(make_key("https://statsapi.web.nhl.com/api/v1/teams")).raw is True
@@ -1,5 +1,9 @@
+import pickle
+from datetime import date, datetime
+
 import pytest
-from nhlapi.utils import GameId, GameKind, IUrlParam, Season
+from nhlapi.utils import GameId, GameKind, IUrlParam, Season, TimeOnIce, parse_toi, toi_by_key, toi_mean, toi_total
+from nhlapi.utils import Year, parse_game_ids, to_url_param
 
 
 def test_season_begin():
@@ -30,3 +34,141 @@ def test_game_code():
     assert isinstance(x, IUrlParam)
     assert x.to_url_param() == "2017021000"
     assert x.kind == GameKind.REGULAR
+
+
+def test_season_value():
+    assert Season(begin=2017) is Season(end=2018)
+    assert Season(2017) == Season(2017, 2018)
+    assert sorted([Season(2018), Season(2016)]) == [Season(2016), Season(2018)]
+    assert {Season(2017): 1}[Season(end=2018)] == 1
+    assert pickle.loads(pickle.dumps(Season(2017))) is Season(2017)
+    assert Season.fromstr("20172018") is Season(2017)
+    with pytest.raises(ValueError):
+        Season.fromstr("2017")
+    with pytest.raises(AttributeError):
+        Season(2017).foo = 1
+
+
+def test_game_id_value():
+    x = GameId.fromstr("2017021000")
+    assert x is GameId(Season(2017), 1000)
+    assert int(x) == 2017021000
+    assert x.season is Season(2017)
+    assert x.number == 1000
+    assert GameId.fromint(2017030111).kind == GameKind.PLAYOFFS
+    assert GameId(Season(2017), 5) < GameId(Season(2017), 1, GameKind.PLAYOFFS) < GameId(Season(2018), 1)
+    assert pickle.loads(pickle.dumps(x)) is x
+    # Game ids are the integers of the API, they can be looked up with the gamePk fields.
+    assert x == 2017021000
+    assert {x: "game"}[2017021000] == "game"
+    assert str(x) == repr(x)
+    with pytest.raises(ValueError):
+        GameId.fromstr("20170210")
+    with pytest.raises(ValueError):
+        GameId.fromint(2017091000)
+    with pytest.raises(ValueError):
+        GameId(Season(2017), 10000)
+
+
+def test_season_game_ids():
+    ids = Season(2018).game_ids(GameKind.REGULAR, 1271)
+    assert len(ids) == 1271
+    assert ids[0].to_url_param() == "2018020001"
+    assert ids[-1].to_url_param() == "2018021271"
+    assert Season(2018).game_ids(GameKind.PRESEASON, 0) == []
+
+
+def test_parse_game_ids():
+    codes = parse_game_ids(["2017021000", "2018030111"])
+    assert list(codes) == [2017021000, 2018030111]
+    assert GameId.fromint(codes[1]).kind == GameKind.PLAYOFFS
+    with pytest.raises(ValueError):
+        parse_game_ids(["201702100"])
+    with pytest.raises(ValueError):
+        parse_game_ids(["2017091000"])
+
+
+def test_parse_game_ids_numpy():
+    pytest.importorskip("numpy")
+    assert parse_game_ids(["2017021000", "2018030111"], numpy=True).tolist() == [2017021000, 2018030111]
+    assert len(parse_game_ids([], numpy=True)) == 0
+    with pytest.raises(ValueError):
+        parse_game_ids(["20170210001"], numpy=True)
+    with pytest.raises(ValueError):
+        parse_game_ids(["2017001000"], numpy=True)
+
+
+def test_toi_str():
+    assert str(TimeOnIce(125)) == "02:05"
+
+
+def test_parse_toi():
+    seconds = parse_toi(["12:34", "0:05", None, "100:00"])
+    assert list(seconds) == [754, 5, 0, 6000]
+    assert toi_total(seconds).seconds == 6759
+    assert toi_mean(parse_toi(["1:00", "2:00"])) == 90.0
+    with pytest.raises(ValueError):
+        parse_toi(["1234"])
+
+
+def test_toi_by_key():
+    assert toi_by_key([8, 10, 8], parse_toi(["1:00", "2:00", "0:30"])) == {8: 90, 10: 120}
+
+
+def test_parse_toi_numpy():
+    np = pytest.importorskip("numpy")
+    seconds = parse_toi(["12:34", "", "1:01"], numpy=True, missing=-1)
+    assert seconds.tolist() == [754, -1, 61]
+    totals = toi_by_key(np.array([8, 10, 8]), parse_toi(["1:00", "2:00", "0:30"], numpy=True))
+    assert totals == {8: 90, 10: 120}
+    assert parse_toi(["100:00", "0:05", None, "12:34"], numpy=True).tolist() == [6000, 5, 0, 754]
+    assert parse_toi([None, ""], numpy=True, missing=-1).tolist() == [-1, -1]
+    empty = parse_toi([], numpy=True)
+    assert empty.shape == (0,) and empty.dtype == np.int64
+
+
+@pytest.mark.parametrize("numpy", [False, True])
+@pytest.mark.parametrize(
+    "bad", ["1234", "12:3", "1:2:3", "a1:00", ":30", "12:3x", "é:00", " 5:03", "5:03 ", "+5:03", "1_0:00", "٣:00"]
+)
+def test_parse_toi_malformed(bad, numpy):
+    if numpy:
+        pytest.importorskip("numpy")
+    with pytest.raises(ValueError):
+        parse_toi(["12:00", bad], numpy=numpy)
+
+
+@pytest.mark.parametrize("numpy", [False, True])
+def test_parse_toi_same_format(numpy):
+    if numpy:
+        pytest.importorskip("numpy")
+    strings = ["0:00", "05:03", "5:03", "100:00", "1234:59", "12:99", None, ""]
+    assert list(parse_toi(strings, numpy=numpy, missing=-1)) == [0, 303, 303, 6000, 74099, 819, -1, -1]
+
+
+def test_toi_total_numpy():
+    np = pytest.importorskip("numpy")
+    seconds = parse_toi(["1:00", "2:00", "0:30"], numpy=True)
+    assert toi_total(seconds).seconds == 210
+    assert isinstance(toi_total(seconds).seconds, int)
+    assert toi_mean(seconds) == 70.0
+    assert np.isnan(toi_mean(seconds[:0]))
+
+
+def test_to_url_param():
+    class Code(str):
+        pass
+
+    assert to_url_param("abc") == "abc"
+    assert to_url_param(Code("abc")) == "abc"
+    assert to_url_param(8) == "8"
+    assert to_url_param(True) == "True"
+    assert to_url_param(GameKind.PLAYOFFS) == "03"
+    assert to_url_param(date(2018, 10, 3)) == "2018-10-03"
+    assert to_url_param(datetime(2018, 10, 3, 19, 30)) == "2018-10-03"
+    assert to_url_param([1, (Year(999), Season(2017))]) == "1,0999,20172018"
+    assert to_url_param(GameId(Season(2017), 1)) == "2017020001"
+    with pytest.raises(TypeError):
+        to_url_param(1.5)
+    with pytest.raises(TypeError):
+        to_url_param(None)